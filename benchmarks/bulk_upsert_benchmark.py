@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Soronkénti vs. batch adatbázis írás benchmark (DATABASE_URL adatbázison).
+Futtatás: python -m benchmarks.bulk_upsert_benchmark [--teams 12] [--rounds 33]
+
+Ideiglenes csapatokhoz egy teljes szezon tabelláját írja meg kétszer: egyszer a
+soronkénti create_or_update_standing, egyszer a fordulónkénti bulk_upsert_standings
+úttal, és kiírja a sor/másodperc értékeket (első írás és felülírás külön).
+A futás végén az ideiglenes adatok törlődnek.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from database.database import get_db_session
+from database.models import Standing, Team
+from database.db_operations import bulk_upsert_standings, create_or_update_standing
+
+BENCHMARK_PREFIX = "__benchmark__"
+
+
+def _round_rows(team_ids: List[int], round_num: int, offset: int) -> List[Dict]:
+    return [{
+        "team_id": team_id, "position": position, "matches_played": round_num, "wins": round_num + offset,
+        "draws": 0, "losses": 0, "goals_for": round_num, "goals_against": 0,
+        "goal_difference": round_num, "points": 3 * round_num,
+    } for position, team_id in enumerate(team_ids, start=1)]
+
+
+def per_row(season: str, team_ids: List[int], rounds: int, offset: int):
+    for round_num in range(1, rounds + 1):
+        for row in _round_rows(team_ids, round_num, offset):
+            create_or_update_standing(season=season, round_num=round_num, **row)
+
+
+def bulk(season: str, team_ids: List[int], rounds: int, offset: int):
+    for round_num in range(1, rounds + 1):
+        bulk_upsert_standings(season, round_num, _round_rows(team_ids, round_num, offset))
+
+
+def _measure(write: Callable, season: str, team_ids: List[int], rounds: int, offset: int) -> float:
+    start = time.perf_counter()
+    write(season, team_ids, rounds, offset)
+    return len(team_ids) * rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soronkénti vs. batch írás benchmark')
+    parser.add_argument('--teams', type=int, default=12, help='Csapatok száma')
+    parser.add_argument('--rounds', type=int, default=33, help='Fordulók száma')
+    args = parser.parse_args()
+
+    with get_db_session() as session:
+        teams = [Team(name=f"{BENCHMARK_PREFIX}{i}") for i in range(args.teams)]
+        session.add_all(teams)
+        session.flush()
+        team_ids = [team.team_id for team in teams]
+
+    try:
+        print(f"{args.teams} csapat x {args.rounds} forduló = {args.teams * args.rounds} sor")
+        print(f"{'út':<10} {'insert sor/s':>14} {'update sor/s':>14}")
+        for name, write in (("soronként", per_row), ("batch", bulk)):
+            season = f"{BENCHMARK_PREFIX}{name}"
+            inserted = _measure(write, season, team_ids, args.rounds, offset=0)
+            updated = _measure(write, season, team_ids, args.rounds, offset=1)
+            print(f"{name:<10} {inserted:>14.0f} {updated:>14.0f}")
+    finally:
+        with get_db_session() as session:
+            session.query(Standing).filter(Standing.team_id.in_(team_ids)).delete(synchronize_session=False)
+            session.query(Team).filter(Team.team_id.in_(team_ids)).delete(synchronize_session=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Keresési indexek hatása a gyakori lekérdezésekre (EXPLAIN ANALYZE, DATABASE_URL adatbázison).
+Futtatás: python -m benchmarks.explain_indexes [--teams 2000] [--players 200000] [--matches 100000]
+
+Egy ideiglenes sémában (bench_explain) generate_series-szel szintetikus adatot tölt,
+majd a gyakori lekérdezéseket (csapat / játékos név szerint, meccs duplikáció
+ellenőrzés, forduló tabella, meccs eseményei) lefuttatja az indexek nélkül és a
+0003_lookup_indexes / 0005_name_key_indexes migrációk indexeivel is. A mért terv és
+végrehajtási idő kerül kiírásra; a séma a futás végén törlődik.
+"""
+
+import argparse
+import re
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from database.database import engine
+from database.identity import NAME_KEY_SQL
+
+SCHEMA = "bench_explain"
+
+SETUP = [
+    """CREATE TABLE teams AS
+       SELECT g AS team_id, 'Csapat ' || g AS name FROM generate_series(1, :teams) g""",
+    """CREATE TABLE players AS
+       SELECT g AS player_id, 'Játékos ' || g AS name FROM generate_series(1, :players) g""",
+    """CREATE TABLE matches AS
+       SELECT g AS match_id, '2025/26'::varchar AS season, (g % 33) + 1 AS round,
+              DATE '2025-07-01' + (g % 300) AS date,
+              (g % :teams) + 1 AS home_team_id, ((g * 7) % :teams) + 1 AS away_team_id
+       FROM generate_series(1, :matches) g""",
+    """CREATE TABLE match_events AS
+       SELECT g AS event_id, (g % :matches) + 1 AS match_id, (g % :players) + 1 AS player_id
+       FROM generate_series(1, :matches * 10) g""",
+    """CREATE TABLE standings AS
+       SELECT g AS id, '2025/26'::varchar AS season, (g % 33) + 1 AS round, (g % :teams) + 1 AS team_id
+       FROM generate_series(1, :matches) g""",
+]
+
+INDEXES = [
+    f"CREATE INDEX ON teams ({NAME_KEY_SQL.format(column='name')})",
+    f"CREATE INDEX ON players ({NAME_KEY_SQL.format(column='name')})",
+    "CREATE INDEX ON matches (season, round, home_team_id, away_team_id, date)",
+    "CREATE INDEX ON match_events (match_id)",
+    "CREATE INDEX ON standings (season, round, team_id)",
+]
+
+QUERIES: List[Tuple[str, str]] = [
+    ("csapat név szerint", f"SELECT team_id FROM teams WHERE {NAME_KEY_SQL.format(column='name')} = 'CSAPAT 42'"),
+    ("játékos név szerint",
+     f"SELECT player_id FROM players WHERE {NAME_KEY_SQL.format(column='name')} = 'JÁTÉKOS 4242'"),
+    ("meccs duplikáció", "SELECT match_id FROM matches WHERE season = '2025/26' AND round = 5 "
+                         "AND home_team_id = 5 AND away_team_id = 29 AND date = DATE '2025-07-05'"),
+    ("forduló tabella", "SELECT * FROM standings WHERE season = '2025/26' AND round = 7"),
+    ("meccs eseményei", "SELECT * FROM match_events WHERE match_id = 4242"),
+]
+
+TABLES = "teams, players, matches, match_events, standings"
+
+EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+
+
+def explain(conn, sql: str) -> Tuple[str, float]:
+    plan = [row[0] for row in conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))]
+    timing = next(float(m.group(1)) for line in plan if (m := EXECUTION_TIME.search(line)))
+    return plan[0].split("  (")[0].strip(), timing
+
+
+def measure(conn) -> List[Tuple[str, float]]:
+    return [explain(conn, sql) for _, sql in QUERIES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keresési indexek EXPLAIN ANALYZE összehasonlítása')
+    parser.add_argument('--teams', type=int, default=2000, help='Csapatok száma')
+    parser.add_argument('--players', type=int, default=200000, help='Játékosok száma')
+    parser.add_argument('--matches', type=int, default=100000, help='Meccsek száma (eseményből 10x)')
+    args = parser.parse_args()
+    params = {"teams": args.teams, "players": args.players, "matches": args.matches}
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+            for statement in SETUP:
+                conn.execute(text(statement), params)
+            conn.execute(text(f"ANALYZE {TABLES}"))
+            before = measure(conn)
+            for statement in INDEXES:
+                conn.execute(text(statement))
+            conn.execute(text(f"ANALYZE {TABLES}"))
+            after = measure(conn)
+
+        print(f"{'lekérdezés':<22} {'index nélkül':>14} {'indexszel':>12}  terv (index nélkül -> indexszel)")
+        for (label, _), (plan_before, ms_before), (plan_after, ms_after) in zip(QUERIES, before, after):
+            print(f"{label:<22} {ms_before:>11.3f} ms {ms_after:>9.3f} ms  {plan_before} -> {plan_after}")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
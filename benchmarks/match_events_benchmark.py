@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Meccsesemény kinyerés benchmark az archivált meccs oldalakon.
+Futtatás: python -m benchmarks.match_events_benchmark [--limit 100] [--backend lxml] [--repeat 5]
+
+Az egy bejárásos kinyerőt (scrapers.match_events) veti össze a korábbi,
+játékosonként kétszer bejáró, `in style` láncos megoldással (itt újraimplementálva
+viszonyítási alapként). A HTML feldolgozás ideje nem számít bele, csak a kinyerés.
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from scrapers.html_parser import BACKENDS, HTML_PARSER, parse_html
+from scrapers.page_archive import PageArchive
+from scrapers.match_events import extract_match_events
+
+
+def _legacy_minutes(cards_td, is_starter: bool) -> int:
+    if not cards_td:
+        return 90 if is_starter else 0
+    swaps = []
+    for span in cards_td.find_all("span"):
+        if "event_swap.png" in span.get("style", ""):
+            minute = ''.join(filter(str.isdigit, span.get_text(strip=True).replace("'", "")))
+            if minute:
+                swaps.append(int(minute))
+    if not swaps:
+        return 90 if is_starter else 0
+    return min(swaps) if is_starter else 90 - min(swaps)
+
+
+def _legacy_row(row, team_side: str, is_starter: bool, events: List, player_stats: dict):
+    name_td = row.find("td", class_="match_players_name")
+    links = name_td.find_all("a") if name_td else []
+    if not links:
+        return
+    player_name = links[0].get_text(strip=True)
+    cards_td = row.find("td", class_="match_players_cards")
+    stats = {"minutes_played": _legacy_minutes(cards_td, is_starter),
+             "goals": 0, "own_goals": 0, "yellow_cards": 0, "red_cards": 0}
+    if cards_td:
+        for span in cards_td.find_all("span"):
+            style = span.get("style", "")
+            minute = ''.join(filter(str.isdigit, span.get_text(strip=True).replace("'", "")))
+            if not minute:
+                continue
+            if "event_goal.png" in style or "event_penalty_goal.png" in style:
+                stats["goals"] += 1
+                events.append((minute, player_name, "goal", team_side))
+            elif "event_own_goal.png" in style:
+                stats["own_goals"] += 1
+                events.append((minute, player_name, "own_goal", team_side))
+            elif "event_yellowcard.png" in style:
+                stats["yellow_cards"] += 1
+                events.append((minute, player_name, "yellow_card", team_side))
+            elif "event_redcard.png" in style:
+                stats["red_cards"] += 1
+                events.append((minute, player_name, "red_card", team_side))
+            elif "event_swap.png" in style:
+                events.append((minute, player_name, "substitution", team_side))
+    player_stats[player_name] = stats
+
+
+def legacy_extract(match_teams_div):
+    events, player_stats = [], {"home": {}, "away": {}}
+    for div_id, team_side in (("left_team", "home"), ("right_team", "away")):
+        team_div = match_teams_div.find("div", id=div_id)
+        if not team_div:
+            continue
+        main_table = team_div.find("table")
+        if main_table:
+            for row in main_table.find_all("tr", class_="template-tr-selectable"):
+                _legacy_row(row, team_side, True, events, player_stats[team_side])
+        replacement_table = team_div.find("table", class_="replacement")
+        if replacement_table:
+            for row in replacement_table.find_all("tr", class_="template-tr-selectable"):
+                _legacy_row(row, team_side, False, events, player_stats[team_side])
+    return events, player_stats
+
+
+def _run(divs: List, extract: Callable, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for div in divs:
+            extract(div)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Meccsesemény kinyerés benchmark')
+    parser.add_argument('--limit', type=int, default=100, help='Meccs oldalak száma')
+    parser.add_argument('--backend', default=HTML_PARSER, choices=BACKENDS)
+    parser.add_argument('--repeat', type=int, default=5, help='Ismétlések száma')
+    args = parser.parse_args()
+
+    archive = PageArchive()
+    urls = archive.urls("%adatbank.mlsz.hu/match/%")[:args.limit]
+    divs = []
+    for url in urls:
+        soup = parse_html(archive.latest(url).decode('utf-8', errors='replace'), args.backend)
+        div = soup.find("div", class_="match_teams_players")
+        if div:
+            divs.append(div)
+    if not divs:
+        print("Nincs archivált meccs oldal")
+        return
+
+    stoppage_events = sum(1 for div in divs for e in extract_match_events(div)[0] if e["added_time"])
+    total_events = sum(len(extract_match_events(div)[0]) for div in divs)
+
+    runs = args.repeat * len(divs)
+    legacy = _run(divs, legacy_extract, args.repeat)
+    single_pass = _run(divs, extract_match_events, args.repeat)
+
+    print(f"Meccs oldalak: {len(divs)} ({args.backend}), események: {total_events}, "
+          f"ebből ráadásban: {stoppage_events}")
+    print(f"{'kinyerő':<12} {'ms/meccs':>10}")
+    print(f"{'korábbi':<12} {legacy / runs * 1000:>10.2f}")
+    print(f"{'egy bejárás':<12} {single_pass / runs * 1000:>10.2f}")
+    if single_pass:
+        print(f"Gyorsulás: {legacy / single_pass:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+HTML parser backend benchmark az archivált oldalakon.
+Futtatás: python -m benchmarks.parser_benchmark [--limit 50] [--backends html.parser lxml selectolax]
+
+Oldaltípusonként és backendenként méri a feldolgozás + kinyerés idejét és a
+csúcs memóriahasználatot (tracemalloc, azaz a Python heap foglalásai), valamint
+hogy hány oldalon tér el a kinyert adat az alapértelmezett html.parser kimenetétől.
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from scrapers.html_parser import BACKENDS, parse_html
+from scrapers.page_archive import PageArchive
+from scrapers.match_scraper import MatchAndMatchEventScraper
+from scrapers.standing_scraper import StandingScraper
+from scrapers.nso_scraper import NSOArticleScraper
+
+
+def build_page_types() -> Dict[str, tuple]:
+    """Oldaltípus -> (archív URL minta, kinyerő függvény)"""
+    match_scraper = MatchAndMatchEventScraper()
+    standing_scraper = StandingScraper()
+    nso_scraper = NSOArticleScraper()
+
+    def extract_round(soup):
+        return match_scraper._parse_round_listing(soup), standing_scraper._parse_round_table(soup, 1)
+
+    def extract_match(soup):
+        return match_scraper._parse_match_details(soup)
+
+    def extract_team(soup):
+        tbody = soup.find("tbody", id="teamPlayers")
+        return [row.get_text(strip=True) for row in tbody.find_all("tr")] if tbody else []
+
+    def extract_player(soup):
+        label = soup.find("td", string="Születési idő")
+        value = label.find_next_sibling("td") if label else None
+        return value.get_text(strip=True) if value else None
+
+    def extract_article(soup):
+        return nso_scraper._parse_article(soup, "")["text"]
+
+    return {
+        "round": ("%adatbank.mlsz.hu/league/%", extract_round),
+        "match": ("%adatbank.mlsz.hu/match/%", extract_match),
+        "team": ("%adatbank.mlsz.hu/club/%", extract_team),
+        "player": ("%adatbank.mlsz.hu/player/%", extract_player),
+        "article": ("%nemzetisport.hu/%/labdarugo-nb-i/%", extract_article),
+    }
+
+
+def _run(pages: List[str], backend: str, extract: Callable) -> float:
+    start = time.perf_counter()
+    for html in pages:
+        extract(parse_html(html, backend))
+    return time.perf_counter() - start
+
+
+def _differences(pages: List[str], backend: str, extract: Callable) -> int:
+    """Azon oldalak száma, ahol a kinyert adat eltér a html.parser kimenetétől"""
+    return sum(extract(parse_html(html, backend)) != extract(parse_html(html, "html.parser")) for html in pages)
+
+
+def _peak_memory(pages: List[str], backend: str, extract: Callable) -> int:
+    peak = 0
+    for html in pages:
+        tracemalloc.start()
+        extract(parse_html(html, backend))
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML parser backend benchmark')
+    parser.add_argument('--limit', type=int, default=50, help='Oldalak száma oldaltípusonként')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    archive = PageArchive()
+
+    print(f"{'oldaltípus':<10} {'backend':<12} {'oldal':>6} {'ms/oldal':>10} {'csúcs KiB':>10} {'eltérés':>8}")
+    for page_type, (pattern, extract) in build_page_types().items():
+        urls = archive.urls(pattern)[:args.limit]
+        pages = [archive.latest(url).decode('utf-8', errors='replace') for url in urls]
+        if not pages:
+            print(f"{page_type:<10} nincs archivált oldal")
+            continue
+
+        for backend in args.backends:
+            try:
+                extract(parse_html(pages[0], backend))  # bemelegítés
+            except ImportError as e:
+                print(f"{page_type:<10} {backend:<12} kihagyva: {e}")
+                continue
+
+            elapsed = _run(pages, backend, extract)
+            peak = _peak_memory(pages, backend, extract)
+            differences = _differences(pages, backend, extract)
+            print(f"{page_type:<10} {backend:<12} {len(pages):>6} "
+                  f"{elapsed / len(pages) * 1000:>10.2f} {peak / 1024:>10.1f} {differences:>8}")
+
+
+if __name__ == "__main__":
+    main()
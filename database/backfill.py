@@ -0,0 +1,275 @@
+import csv
+import io
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import text
+from .database import session_scope
+from .db_operations import PLAYER_MATCH_STAT_FIELDS, STANDING_FIELDS
+from .identity import NAME_KEY_SQL, normalize_name
+from monitoring.metrics import record_rows
+
+
+PLAYER_STAT_FIELDS = PLAYER_MATCH_STAT_FIELDS[1:]  # team_id comes from the match side
+
+
+class SeasonBatch:
+    """
+    Parsed rows of one season, buffered in memory for load_season_batch.
+
+    Team and player names are kept as scraped (plus their normalize_name key);
+    IDs are resolved in the database during the merge, so historical seasons
+    can be loaded without per-row identity lookups.
+    """
+
+    def __init__(self, season: str):
+        self.season = season
+        self.matches: List[tuple] = []
+        self.events: List[tuple] = []
+        self.player_stats: List[tuple] = []
+        self.standings: List[tuple] = []
+        self._match_keys: Dict[tuple, int] = {}
+
+    def __len__(self):
+        return len(self.matches)
+
+    def add_match(self, round_number: int, match: Dict) -> Optional[int]:
+        """
+        Add a parsed match (listing + details); returns its batch-local key.
+
+        Matches without a date are skipped (they cannot be matched on the natural
+        key), as are repeated listings of the same match.
+        """
+        home_key, away_key = normalize_name(match["home_team"]), normalize_name(match["away_team"])
+        natural_key = (round_number, home_key, away_key, match["date"])
+        if not match["date"] or not home_key or not away_key or natural_key in self._match_keys:
+            return None
+
+        match_key = len(self.matches) + 1
+        self._match_keys[natural_key] = match_key
+        has_details = bool(match.get("details_fetched"))
+        self.matches.append((
+            match_key, round_number, match["date"], match["home_team"], home_key, match["away_team"], away_key,
+            match["home_score"], match["away_score"], match.get("arena"), match.get("referee"), has_details
+        ))
+        if not has_details:
+            return match_key
+
+        for e in match["events"]:
+            self.events.append((match_key, e["team_side"], e["player"], normalize_name(e["player"]),
+                                e["type"], e["minute"], e.get("added_time", 0)))
+        for team_side in ("home", "away"):
+            for player_name, stats in match["player_stats"][team_side].items():
+                self.player_stats.append((match_key, team_side, player_name, normalize_name(player_name),
+                                          *(stats.get(field, 0) for field in PLAYER_STAT_FIELDS)))
+        return match_key
+
+    def add_standings(self, round_number: int, rows: List[Dict]):
+        for row in rows:
+            self.standings.append((round_number, row["team_name"], normalize_name(row["team_name"]),
+                                   *(row.get(field) for field in STANDING_FIELDS)))
+
+
+# Staging tables (dropped at commit); column order matches the SeasonBatch tuples
+STAGING_TABLES = {
+    "stage_matches": """
+        match_key INT PRIMARY KEY, round INT, date DATE,
+        home_team TEXT, home_team_key TEXT, away_team TEXT, away_team_key TEXT,
+        home_score INT, away_score INT, stadium TEXT, referee TEXT, has_details BOOLEAN,
+        home_team_id INT, away_team_id INT, match_id INT
+    """,
+    "stage_events": """
+        match_key INT, team_side TEXT, player TEXT, player_key TEXT,
+        event_type TEXT, minute INT, added_time INT
+    """,
+    "stage_player_stats": """
+        match_key INT, team_side TEXT, player TEXT, player_key TEXT,
+        is_starter BOOLEAN, minutes_played INT, goals INT, own_goals INT, yellow_cards INT, red_cards INT
+    """,
+    "stage_standings": """
+        round INT, team TEXT, team_key TEXT,
+        matches_played INT, wins INT, draws INT, losses INT, goals_for INT, goals_against INT,
+        goal_difference INT, points INT, position INT
+    """,
+}
+
+STAGING_COLUMNS = {
+    "stage_matches": ("match_key", "round", "date", "home_team", "home_team_key", "away_team", "away_team_key",
+                      "home_score", "away_score", "stadium", "referee", "has_details"),
+    "stage_events": ("match_key", "team_side", "player", "player_key", "event_type", "minute", "added_time"),
+    "stage_player_stats": ("match_key", "team_side", "player", "player_key") + PLAYER_STAT_FIELDS,
+    "stage_standings": ("round", "team", "team_key") + STANDING_FIELDS,
+}
+
+# Set-based merge of the staged season, in dependency order: (counted table or None, SQL)
+MERGE_STATEMENTS = [
+    # Csapatok: meglévők név alapján (ix_teams_name_normalized), hiányzók új azonosítóval
+    (None, """
+        CREATE TEMP TABLE stage_teams ON COMMIT DROP AS
+        SELECT DISTINCT ON (team_key) team_key, name, NULL::INT AS team_id, FALSE AS is_new
+        FROM (
+            SELECT home_team_key AS team_key, home_team AS name FROM stage_matches
+            UNION ALL SELECT away_team_key, away_team FROM stage_matches
+            UNION ALL SELECT team_key, team FROM stage_standings
+        ) t
+        ORDER BY team_key
+    """),
+    (None, """
+        UPDATE stage_teams s SET team_id = t.team_id
+        FROM teams t WHERE """ + NAME_KEY_SQL.format(column="t.name") + """ = s.team_key
+    """),
+    (None, """
+        UPDATE stage_teams SET team_id = nextval(pg_get_serial_sequence('teams', 'team_id')), is_new = TRUE
+        WHERE team_id IS NULL
+    """),
+    ("teams", "INSERT INTO teams (team_id, name) SELECT team_id, name FROM stage_teams WHERE is_new"),
+
+    # Meccsek: upsert a természetes kulcsra, majd a match_id visszaolvasása
+    (None, """
+        UPDATE stage_matches s SET home_team_id = h.team_id, away_team_id = a.team_id
+        FROM stage_teams h, stage_teams a
+        WHERE h.team_key = s.home_team_key AND a.team_key = s.away_team_key
+    """),
+    ("matches", """
+        INSERT INTO matches (season, round, date, home_team_id, away_team_id,
+                             home_score, away_score, stadium, referee)
+        SELECT :season, round, date, home_team_id, away_team_id, home_score, away_score, stadium, referee
+        FROM stage_matches
+        ON CONFLICT ON CONSTRAINT uq_matches_season_round_teams_date DO UPDATE SET
+            home_score = EXCLUDED.home_score,
+            away_score = EXCLUDED.away_score,
+            stadium = COALESCE(EXCLUDED.stadium, matches.stadium),
+            referee = COALESCE(EXCLUDED.referee, matches.referee)
+    """),
+    (None, """
+        UPDATE stage_matches s SET match_id = m.match_id
+        FROM matches m
+        WHERE m.season = :season AND m.round = s.round AND m.date = s.date
+          AND m.home_team_id = s.home_team_id AND m.away_team_id = s.away_team_id
+    """),
+
+    # Játékosok: csapatonként név alapján, hiányzók létrehozása és csapathoz rendelése
+    (None, """
+        CREATE TEMP TABLE stage_players ON COMMIT DROP AS
+        SELECT DISTINCT ON (team_id, player_key) team_id, player_key, name,
+               NULL::INT AS player_id, FALSE AS is_new
+        FROM (
+            SELECT CASE p.team_side WHEN 'home' THEN m.home_team_id ELSE m.away_team_id END AS team_id,
+                   p.player_key, p.player AS name
+            FROM (SELECT match_key, team_side, player, player_key FROM stage_events
+                  UNION ALL
+                  SELECT match_key, team_side, player, player_key FROM stage_player_stats) p
+            JOIN stage_matches m USING (match_key)
+        ) t
+        ORDER BY team_id, player_key
+    """),
+    (None, """
+        UPDATE stage_players s SET player_id = p.player_id
+        FROM players p JOIN team_players tp ON tp.player_id = p.player_id
+        WHERE tp.team_id = s.team_id AND """ + NAME_KEY_SQL.format(column="p.name") + """ = s.player_key
+    """),
+    (None, """
+        UPDATE stage_players SET player_id = nextval(pg_get_serial_sequence('players', 'player_id')), is_new = TRUE
+        WHERE player_id IS NULL
+    """),
+    ("players", "INSERT INTO players (player_id, name) SELECT player_id, name FROM stage_players WHERE is_new"),
+    ("team_players", """
+        INSERT INTO team_players (team_id, player_id)
+        SELECT team_id, player_id FROM stage_players WHERE is_new
+        ON CONFLICT ON CONSTRAINT uq_team_players_team_player DO NOTHING
+    """),
+
+    # Események: a részletekkel letöltött meccsek eseményei cserélődnek
+    (None, """
+        DELETE FROM match_events
+        WHERE match_id IN (SELECT match_id FROM stage_matches WHERE has_details)
+    """),
+    ("match_events", """
+        INSERT INTO match_events (match_id, event_type, minute, added_time, player_id, team_id)
+        SELECT m.match_id, e.event_type, e.minute, e.added_time, p.player_id, p.team_id
+        FROM stage_events e
+        JOIN stage_matches m USING (match_key)
+        JOIN stage_players p
+          ON p.team_id = CASE e.team_side WHEN 'home' THEN m.home_team_id ELSE m.away_team_id END
+         AND p.player_key = e.player_key
+    """),
+    ("player_match_stats", """
+        INSERT INTO player_match_stats (match_id, player_id, team_id, is_starter, minutes_played,
+                                        goals, own_goals, yellow_cards, red_cards)
+        SELECT DISTINCT ON (m.match_id, p.player_id)
+               m.match_id, p.player_id, p.team_id, s.is_starter, s.minutes_played,
+               s.goals, s.own_goals, s.yellow_cards, s.red_cards
+        FROM stage_player_stats s
+        JOIN stage_matches m USING (match_key)
+        JOIN stage_players p
+          ON p.team_id = CASE s.team_side WHEN 'home' THEN m.home_team_id ELSE m.away_team_id END
+         AND p.player_key = s.player_key
+        ORDER BY m.match_id, p.player_id
+        ON CONFLICT ON CONSTRAINT uq_player_match_stats_match_player DO UPDATE SET
+            team_id = EXCLUDED.team_id,
+            is_starter = EXCLUDED.is_starter,
+            minutes_played = EXCLUDED.minutes_played,
+            goals = EXCLUDED.goals,
+            own_goals = EXCLUDED.own_goals,
+            yellow_cards = EXCLUDED.yellow_cards,
+            red_cards = EXCLUDED.red_cards
+    """),
+
+    # Tabellák
+    ("standings", """
+        INSERT INTO standings (season, round, team_id, matches_played, wins, draws, losses,
+                               goals_for, goals_against, goal_difference, points, position)
+        SELECT DISTINCT ON (s.round, t.team_id)
+               :season, s.round, t.team_id, s.matches_played, s.wins, s.draws, s.losses,
+               s.goals_for, s.goals_against, s.goal_difference, s.points, s.position
+        FROM stage_standings s
+        JOIN stage_teams t USING (team_key)
+        ORDER BY s.round, t.team_id
+        ON CONFLICT ON CONSTRAINT uq_standings_season_round_team DO UPDATE SET
+            matches_played = EXCLUDED.matches_played,
+            wins = EXCLUDED.wins,
+            draws = EXCLUDED.draws,
+            losses = EXCLUDED.losses,
+            goals_for = EXCLUDED.goals_for,
+            goals_against = EXCLUDED.goals_against,
+            goal_difference = EXCLUDED.goal_difference,
+            points = EXCLUDED.points,
+            position = EXCLUDED.position
+    """),
+]
+
+
+def _copy_rows(cursor, table: str, columns: Sequence[str], rows: List[tuple]):
+    """Stream rows into a staging table with COPY (CSV, empty field = NULL)"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def load_season_batch(batch: SeasonBatch, session=None) -> Dict[str, int]:
+    """
+    Load a season batch in one transaction: COPY into temporary staging tables,
+    then merge into the real tables with set-based SQL.
+
+    Re-loading a season is idempotent (upserts on the natural keys, events of
+    re-fetched matches are replaced). Returns the written row counts per table.
+    """
+    written: Dict[str, int] = {}
+    with session_scope(session) as session:
+        for table, columns in STAGING_TABLES.items():
+            session.execute(text(f"CREATE TEMP TABLE {table} ({columns}) ON COMMIT DROP"))
+
+        cursor = session.connection().connection.cursor()
+        try:
+            _copy_rows(cursor, "stage_matches", STAGING_COLUMNS["stage_matches"], batch.matches)
+            _copy_rows(cursor, "stage_events", STAGING_COLUMNS["stage_events"], batch.events)
+            _copy_rows(cursor, "stage_player_stats", STAGING_COLUMNS["stage_player_stats"], batch.player_stats)
+            _copy_rows(cursor, "stage_standings", STAGING_COLUMNS["stage_standings"], batch.standings)
+        finally:
+            cursor.close()
+
+        for table, statement in MERGE_STATEMENTS:
+            result = session.execute(text(statement), {"season": batch.season})
+            if table:
+                written[table] = written.get(table, 0) + result.rowcount
+                record_rows(table, result.rowcount)
+    return written
@@ -1,5 +1,9 @@
 import os
-from sqlalchemy import create_engine
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
 from .models import Base
@@ -17,16 +21,94 @@ engine = create_engine(
     echo=False
 )
 
+# Alembic migrations (alembic.ini + migrations/ in the project root)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_REVISION = '0001_baseline'
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Season totals per player and team, derived from the per-match fact table.
+# Refreshed once per match ingest (see db_operations.refresh_player_stats).
+PLAYER_SEASON_STATS_VIEW = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS player_season_stats AS
+SELECT
+    m.season,
+    pms.player_id,
+    pms.team_id,
+    COUNT(*) AS matches_played,
+    COUNT(*) FILTER (WHERE pms.is_starter) AS matches_started,
+    SUM(pms.minutes_played) AS minutes_played,
+    SUM(pms.goals) AS goals,
+    SUM(pms.own_goals) AS own_goals,
+    SUM(pms.yellow_cards) AS yellow_cards,
+    SUM(pms.red_cards) AS red_cards
+FROM player_match_stats pms
+JOIN matches m ON m.match_id = pms.match_id
+GROUP BY m.season, pms.player_id, pms.team_id
+"""
+
+def create_views():
+    """Create the materialized views (the unique index allows concurrent refresh)"""
+    with engine.begin() as conn:
+        conn.execute(text(PLAYER_SEASON_STATS_VIEW))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_player_season_stats "
+            "ON player_season_stats (season, player_id, team_id)"
+        ))
+
 def init_db():
-    """Initialize database - create all tables"""
+    """
+    Initialize database - create all tables.
+
+    The models describe the latest schema, so a fresh database is stamped at the
+    head migration. Existing tables are left alone (upgrade them with upgrade_db).
+    """
+    fresh = not inspect(engine).get_table_names()
     Base.metadata.create_all(bind=engine)
+    create_views()
+    if fresh:
+        command.stamp(_alembic_config(), 'head')
     print("Database tables created successfully!")
 
+def upgrade_db():
+    """
+    Upgrade the schema to the latest migration.
+
+    Databases created with init_db before the migrations existed (tables present,
+    no alembic_version) are stamped at the baseline first; the later migrations
+    are idempotent.
+    """
+    config = _alembic_config()
+    tables = inspect(engine).get_table_names()
+    if 'teams' in tables and 'alembic_version' not in tables:
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, 'head')
+    print("Database schema upgraded to the latest migration!")
+
+def schema_revisions():
+    """
+    The database's current migration revision and the latest one: (current, head).
+
+    The batch upserts (ON CONFLICT) need the unique constraints added by the
+    migrations, so writers should check that the two match before running.
+    """
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+    head = ScriptDirectory.from_config(_alembic_config()).get_current_head()
+    return current, head
+
+def _alembic_config():
+    config = Config(os.path.join(PROJECT_ROOT, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(PROJECT_ROOT, 'migrations'))
+    config.attributes['configure_logger'] = False
+    return config
+
 def drop_db():
     """Drop all tables"""
+    with engine.begin() as conn:
+        conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS player_season_stats"))
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
     Base.metadata.drop_all(bind=engine)
     print("Database tables dropped!")
 
@@ -45,6 +127,21 @@ def get_db_session():
     finally:
         session.close()
 
+@contextmanager
+def session_scope(session=None):
+    """
+    Unit of work for the db_operations helpers.
+
+    With an existing session the helper joins the caller's transaction (the
+    caller commits or rolls back, e.g. once per round / team); without one a
+    new session is opened and committed, as before.
+    """
+    if session is not None:
+        yield session
+        return
+    with get_db_session() as new_session:
+        yield new_session
+
 def get_session():
     """Get a new database session (manual management)"""
     return SessionLocal()
\ No newline at end of file
@@ -1,14 +1,42 @@
-from sqlalchemy import func
+from datetime import datetime, timezone
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
-from .models import Team, Player, TeamPlayer, Match, MatchEvent, Standing, PlayerStats, InjuryArticle
-from .database import get_db_session
+from sqlalchemy.orm import joinedload
+from .models import Team, Player, TeamPlayer, Match, MatchEvent, Standing, PlayerStats, PlayerMatchStats, InjuryArticle, name_key
+from .database import session_scope
+from .identity import normalize_name
+from monitoring.metrics import record_rows
+
+
+# ============== BULK HELPERS ==============
+
+def _bulk_upsert(session, model, rows, conflict_columns, update_columns=()):
+    """
+    INSERT ... ON CONFLICT for a list of rows, sent as one executemany batch.
+
+    With no update_columns the conflicting rows are left untouched (DO NOTHING).
+    """
+    if not rows:
+        return 0
+    stmt = insert(model)
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+    session.execute(stmt, rows)
+    record_rows(model.__tablename__, len(rows))
+    return len(rows)
 
 
 # ============== TEAM OPERATIONS ==============
 
-def create_team(name, address=None, website=None):
+def create_team(name, address=None, website=None, session=None):
     """Create a new team"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         existing = session.query(Team).filter_by(name=name).first()
         if existing:
             print(f"Csapat már létezik: {name} (ID: {existing.team_id})")
@@ -17,69 +45,150 @@ def create_team(name, address=None, website=None):
         team = Team(name=name, address=address, website=website)
         session.add(team)
         session.flush()
+        record_rows("teams")
         return team.team_id
 
 
-def get_team_by_name(name):
-    """Get team ID by name (case-insensitive, trimmed)"""
-    with get_db_session() as session:
-        normalized_name = name.upper().strip()
-
+def get_team_by_name(name, session=None):
+    """Get team ID by name (case-insensitive, whitespace-normalized)"""
+    with session_scope(session) as session:
         team = session.query(Team).filter(
-            func.upper(func.trim(Team.name)) == normalized_name
+            name_key(Team.name) == normalize_name(name)
         ).first()
         
         return team.team_id if team else None
 
 
-def get_all_teams():
+def get_all_teams(session=None):
     """Get all teams"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         return session.query(Team).all()
 
 
 # ============== PLAYER OPERATIONS ==============
 
-def create_player(name, birth_date=None, is_injured=False):
+def create_player(name, birth_date=None, is_injured=False, profile_checked_at=None, session=None):
     """Create a new player"""
-    with get_db_session() as session:
-        player = Player(name=name, birth_date=birth_date, is_injured=is_injured)
+    with session_scope(session) as session:
+        player = Player(name=name, birth_date=birth_date, is_injured=is_injured,
+                        profile_checked_at=profile_checked_at)
         session.add(player)
         session.flush()
+        record_rows("players")
         return player.player_id
 
 
-def get_player_by_name_and_team_name(player_name, team_name):
+def bulk_create_players(rows, session=None):
+    """
+    Create many players in one statement.
+
+    rows: [{"name", "birth_date", "profile_checked_at"}, ...]
+    Returns the new player IDs in the order of rows.
+    """
+    if not rows:
+        return []
+    with session_scope(session) as session:
+        result = session.execute(
+            insert(Player).returning(Player.player_id, sort_by_parameter_order=True),
+            [{"name": row["name"], "birth_date": row.get("birth_date"),
+              "is_injured": row.get("is_injured", False),
+              "profile_checked_at": row.get("profile_checked_at")} for row in rows]
+        )
+        player_ids = [row.player_id for row in result]
+        record_rows("players", len(player_ids))
+        return player_ids
+
+
+def get_player_by_name_and_team_name(player_name, team_name, session=None):
     """Get player ID by name and team name (case-insensitive)"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         player = session.query(Player)\
             .join(TeamPlayer)\
             .join(Team)\
-            .filter(func.upper(Player.name) == func.upper(player_name))\
-            .filter(func.upper(Team.name) == func.upper(team_name))\
+            .filter(name_key(Player.name) == normalize_name(player_name))\
+            .filter(name_key(Team.name) == normalize_name(team_name))\
             .first()
         return player.player_id if player else None
 
 
-def update_player_injury_status(player_id, is_injured):
+def get_known_players_by_team_name(team_name, session=None):
+    """
+    Get the known players of a team for incremental roster refresh.
+
+    Returns a dict keyed by normalize_name(player name):
+    {name: {"player_id", "birth_date", "profile_checked_at"}}
+    """
+    with session_scope(session) as session:
+        rows = session.query(Player.player_id, Player.name, Player.birth_date, Player.profile_checked_at)\
+            .join(TeamPlayer)\
+            .join(Team)\
+            .filter(name_key(Team.name) == normalize_name(team_name))\
+            .all()
+        return {
+            normalize_name(row.name): {
+                "player_id": row.player_id,
+                "birth_date": row.birth_date,
+                "profile_checked_at": row.profile_checked_at,
+            }
+            for row in rows if row.name
+        }
+
+
+def update_player_profile(player_id, birth_date=None, session=None):
+    """Store the birth date read from the player's profile page and mark the profile as checked"""
+    with session_scope(session) as session:
+        player = session.query(Player).filter_by(player_id=player_id).first()
+        if not player:
+            return False
+        if birth_date is not None:
+            player.birth_date = birth_date
+        player.profile_checked_at = datetime.now(timezone.utc)
+        record_rows("players")
+        return True
+
+
+def bulk_update_player_profiles(rows, session=None):
+    """
+    Mark many player profiles as checked (and store their birth dates) in one batch.
+
+    rows: [{"player_id", "birth_date"}, ...]; a None birth date keeps the stored one.
+    """
+    if not rows:
+        return 0
+    with session_scope(session) as session:
+        session.execute(
+            text("""
+                UPDATE players
+                SET birth_date = COALESCE(:birth_date, birth_date), profile_checked_at = :checked_at
+                WHERE player_id = :player_id
+            """),
+            [{"player_id": row["player_id"], "birth_date": row.get("birth_date"),
+              "checked_at": datetime.now(timezone.utc)} for row in rows]
+        )
+        record_rows("players", len(rows))
+        return len(rows)
+
+
+def update_player_injury_status(player_id, is_injured, session=None):
     """Update player injury status"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         player = session.query(Player).filter_by(player_id=player_id).first()
         if player:
             player.is_injured = is_injured
+            record_rows("players")
             return True
         return False
 
 
-def get_injured_players():
+def get_injured_players(session=None):
     """Get all injured players"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         return session.query(Player).filter_by(is_injured=True).all()
     
 
-def get_players_by_team_name(team_name):
+def get_players_by_team_name(team_name, session=None):
     """Get all players for a team by team name"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         return session.query(Player)\
             .join(TeamPlayer)\
             .join(Team)\
@@ -89,9 +198,9 @@ def get_players_by_team_name(team_name):
 
 # ============== TEAM-PLAYER OPERATIONS ==============
 
-def link_player_to_team(player_id, team_id):
+def link_player_to_team(player_id, team_id, session=None):
     """Link a player to a team"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         # Check if link already exists
         existing = session.query(TeamPlayer).filter_by(
             player_id=player_id, team_id=team_id
@@ -99,13 +208,24 @@ def link_player_to_team(player_id, team_id):
         if not existing:
             team_player = TeamPlayer(player_id=player_id, team_id=team_id)
             session.add(team_player)
+            record_rows("team_players")
             return True
         return False
 
 
-def get_players_by_team(team_id):
+def bulk_link_players_to_team(team_id, player_ids, session=None):
+    """Link many players to a team; existing links are skipped (ON CONFLICT DO NOTHING)"""
+    with session_scope(session) as session:
+        return _bulk_upsert(
+            session, TeamPlayer,
+            [{"team_id": team_id, "player_id": player_id} for player_id in dict.fromkeys(player_ids)],
+            conflict_columns=("team_id", "player_id")
+        )
+
+
+def get_players_by_team(team_id, session=None):
     """Get all players for a team"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         return session.query(Player).join(TeamPlayer).filter(
             TeamPlayer.team_id == team_id
         ).all()
@@ -114,9 +234,9 @@ def get_players_by_team(team_id):
 # ============== MATCH OPERATIONS ==============
 
 def create_match(season, round_num, date, home_team_id, away_team_id, 
-                 home_score=None, away_score=None, stadium=None, referee=None):
+                 home_score=None, away_score=None, stadium=None, referee=None, session=None):
     """Create a new match"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         match = Match(
             season=season,
             round=round_num,
@@ -130,18 +250,21 @@ def create_match(season, round_num, date, home_team_id, away_team_id,
         )
         session.add(match)
         session.flush()
+        record_rows("matches")
         return match.match_id
 
 
-def get_matches_by_round(season, round_num):
-    """Get all matches for a specific round"""
-    with get_db_session() as session:
-        return session.query(Match).filter_by(season=season, round=round_num).all()
+def get_matches_by_round(season, round_num, session=None):
+    """Get all matches for a specific round (teams eager-loaded; for reports see queries.list_matches)"""
+    with session_scope(session) as session:
+        return session.query(Match)\
+            .options(joinedload(Match.home_team), joinedload(Match.away_team))\
+            .filter_by(season=season, round=round_num).all()
     
 
-def get_match_by_teams_date_and_round(home_team_id: int, away_team_id: int, date: str, round_num: int):
+def get_match_by_teams_date_and_round(home_team_id: int, away_team_id: int, date: str, round_num: int, session=None):
     """Get match by team IDs, date and round (duplicate check)"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         return session.query(Match)\
             .filter_by(
                 date=date,
@@ -152,28 +275,105 @@ def get_match_by_teams_date_and_round(home_team_id: int, away_team_id: int, date
             .first()
 
 
+def get_existing_match_keys(season, session=None):
+    """
+    Get the stored matches of a season for duplicate / score change checks.
+
+    Returns a dict keyed by (home_team_id, away_team_id, date ISO string, round):
+    {key: {"match_id", "home_score", "away_score", "has_stats"}}
+    """
+    with session_scope(session) as session:
+        has_stats = session.query(PlayerMatchStats.match_id)\
+            .filter(PlayerMatchStats.match_id == Match.match_id)\
+            .exists()
+        rows = session.query(Match.match_id, Match.home_team_id, Match.away_team_id, Match.date,
+                             Match.round, Match.home_score, Match.away_score, has_stats.label("has_stats"))\
+            .filter(Match.season == season)\
+            .all()
+        return {
+            (row.home_team_id, row.away_team_id, row.date.isoformat() if row.date else None, row.round): {
+                "match_id": row.match_id,
+                "home_score": row.home_score,
+                "away_score": row.away_score,
+                "has_stats": row.has_stats,
+            }
+            for row in rows
+        }
+
+
+def update_match_result(match_id, home_score, away_score, referee=None, session=None):
+    """Update the score (and referee) of an existing match"""
+    with session_scope(session) as session:
+        match = session.query(Match).filter_by(match_id=match_id).first()
+        if not match:
+            return False
+        match.home_score = home_score
+        match.away_score = away_score
+        if referee is not None:
+            match.referee = referee
+        record_rows("matches")
+        return True
+
+
+def get_match_counts_by_round(season, session=None):
+    """Get the number of stored matches per round for a season: {round: count}"""
+    with session_scope(session) as session:
+        rows = session.query(Match.round, func.count(Match.match_id))\
+            .filter(Match.season == season)\
+            .group_by(Match.round)\
+            .all()
+        return {round_num: count for round_num, count in rows}
+
+
 # ============== MATCH EVENT OPERATIONS ==============
 
-def create_match_event(match_id, event_type, minute, player_id=None, team_id=None):
-    """Create a match event"""
-    with get_db_session() as session:
+def create_match_event(match_id, event_type, minute, player_id=None, team_id=None, added_time=0, session=None):
+    """Create a match event (minute + added time, e.g. 90+3 -> minute=90, added_time=3)"""
+    with session_scope(session) as session:
         event = MatchEvent(
             match_id=match_id,
             event_type=event_type,
             minute=minute,
+            added_time=added_time,
             player_id=player_id,
             team_id=team_id
         )
         session.add(event)
+        record_rows("match_events")
         return True
 
 
+def bulk_create_match_events(match_id, rows, session=None):
+    """
+    Create all events of a match in one executemany batch.
+
+    rows: [{"event_type", "minute", "added_time", "player_id", "team_id"}, ...]
+    """
+    if not rows:
+        return 0
+    with session_scope(session) as session:
+        session.execute(insert(MatchEvent), [
+            {"match_id": match_id, "event_type": row["event_type"], "minute": row["minute"],
+             "added_time": row.get("added_time", 0), "player_id": row.get("player_id"),
+             "team_id": row.get("team_id")}
+            for row in rows
+        ])
+        record_rows("match_events", len(rows))
+        return len(rows)
+
+
+def delete_match_events(match_id, session=None):
+    """Delete all events of a match (before re-ingesting a changed match)"""
+    with session_scope(session) as session:
+        return session.query(MatchEvent).filter_by(match_id=match_id).delete()
+
+
 # ============== STANDING OPERATIONS ==============
 
 def create_or_update_standing(season, round_num, team_id, matches_played, wins, 
-                               draws, losses, goals_for, goals_against, goal_difference, points, position):
+                               draws, losses, goals_for, goals_against, goal_difference, points, position, session=None):
     """Create or update team standing"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         standing = session.query(Standing).filter_by(
             season=season, round=round_num, team_id=team_id
         ).first()
@@ -206,126 +406,212 @@ def create_or_update_standing(season, round_num, team_id, matches_played, wins,
                 position=position
             )
             session.add(standing)
+        record_rows("standings")
+
+
+STANDING_FIELDS = ("matches_played", "wins", "draws", "losses", "goals_for", "goals_against",
+                   "goal_difference", "points", "position")
+
+
+def bulk_upsert_standings(season, round_num, rows, session=None):
+    """
+    Create or update the standings of a round in one batch (unique on season, round, team).
+
+    rows: [{"team_id", "position", "matches_played", "wins", "draws", "losses",
+            "goals_for", "goals_against", "goal_difference", "points"}, ...]
+    """
+    with session_scope(session) as session:
+        return _bulk_upsert(
+            session, Standing,
+            [{"season": season, "round": round_num, "team_id": row["team_id"],
+              **{field: row.get(field) for field in STANDING_FIELDS}} for row in rows],
+            conflict_columns=("season", "round", "team_id"),
+            update_columns=STANDING_FIELDS
+        )
 
 
-def get_standings(season, round_num):
-    """Get standings for a specific round"""
-    with get_db_session() as session:
-        return session.query(Standing).filter_by(
+def bulk_upsert_season_standings(season, rows, session=None):
+    """
+    Create or update the standings of several rounds in one batch.
+
+    rows: like bulk_upsert_standings, plus "round" on each row
+    """
+    with session_scope(session) as session:
+        return _bulk_upsert(
+            session, Standing,
+            [{"season": season, "round": row["round"], "team_id": row["team_id"],
+              **{field: row.get(field) for field in STANDING_FIELDS}} for row in rows],
+            conflict_columns=("season", "round", "team_id"),
+            update_columns=STANDING_FIELDS
+        )
+
+
+def get_max_standing_round(season, session=None):
+    """The last round with a stored table in a season (None if there is none)"""
+    with session_scope(session) as session:
+        return session.query(func.max(Standing.round)).filter(Standing.season == season).scalar()
+
+
+def get_standings(season, round_num, session=None):
+    """Get standings for a specific round (team eager-loaded; for reports see queries.get_round_table)"""
+    with session_scope(session) as session:
+        return session.query(Standing).options(joinedload(Standing.team)).filter_by(
             season=season, round=round_num
         ).order_by(Standing.position).all()
 
 
 # ============== PLAYER STATS OPERATIONS ==============
 
-def create_or_update_player_stats(player_id, team_id, matches_played, goals, own_goals, 
-                                   yellow_cards, red_cards, minutes_played):
-    """Create or update player statistics"""
-    with get_db_session() as session:
-        stat = session.query(PlayerStats).filter_by(
-            player_id=player_id, team_id=team_id
-        ).first()
-        
-        if stat:
-            # Update existing
-            stat.matches_played = stat.matches_played + matches_played
-            stat.goals = stat.goals + goals
-            stat.own_goals = stat.own_goals + own_goals
-            stat.yellow_cards = stat.yellow_cards + yellow_cards
-            stat.red_cards = stat.red_cards + red_cards
-            stat.minutes_played = stat.minutes_played + minutes_played
-        else:
-            # Create new
-            stat = PlayerStats(
-                player_id=player_id,
-                team_id=team_id,
-                matches_played=matches_played,
-                goals=goals,
-                own_goals=own_goals,
-                yellow_cards=yellow_cards,
-                red_cards=red_cards,
-                minutes_played=minutes_played
-            )
-            session.add(stat)
+PLAYER_MATCH_STAT_FIELDS = ("team_id", "is_starter", "minutes_played", "goals", "own_goals", "yellow_cards", "red_cards")
+
+
+def upsert_player_match_stats(match_id, rows, session=None):
+    """
+    Write the player stats of one match idempotently (one executemany batch per match).
+
+    rows: [{"player_id", "team_id", "is_starter", "minutes_played", "goals",
+            "own_goals", "yellow_cards", "red_cards"}, ...]
+    Re-running a match overwrites its rows instead of adding to them.
+    """
+    with session_scope(session) as session:
+        return _bulk_upsert(
+            session, PlayerMatchStats,
+            [{"match_id": match_id, "player_id": row["player_id"],
+              **{field: row.get(field, 0) for field in PLAYER_MATCH_STAT_FIELDS}} for row in rows],
+            conflict_columns=("match_id", "player_id"),
+            update_columns=PLAYER_MATCH_STAT_FIELDS
+        )
+
+
+def refresh_player_stats(session=None):
+    """
+    Recompute the aggregates from player_match_stats with set-based SQL:
+    refresh the player_season_stats materialized view and rebuild the player_stats
+    totals of every player and team that has match-level rows. Call once per ingest.
+
+    Rows without match-level data (totals scraped before the fact table existed)
+    are left as they are, so an upgraded database keeps them until a backfill
+    replaces them.
+    """
+    with session_scope(session) as session:
+        session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY player_season_stats"))
+        result = session.execute(text("""
+            INSERT INTO player_stats (player_id, team_id, matches_played, goals, own_goals,
+                                      yellow_cards, red_cards, minutes_played)
+            SELECT player_id, team_id, COUNT(*), SUM(goals), SUM(own_goals),
+                   SUM(yellow_cards), SUM(red_cards), SUM(minutes_played)
+            FROM player_match_stats
+            WHERE team_id IS NOT NULL  -- a NULL team_id never conflicts and would add a row on every run
+            GROUP BY player_id, team_id
+            ON CONFLICT ON CONSTRAINT uq_player_stats_player_team DO UPDATE SET
+                matches_played = EXCLUDED.matches_played,
+                goals = EXCLUDED.goals,
+                own_goals = EXCLUDED.own_goals,
+                yellow_cards = EXCLUDED.yellow_cards,
+                red_cards = EXCLUDED.red_cards,
+                minutes_played = EXCLUDED.minutes_played
+        """))
+        record_rows("player_stats", result.rowcount)
+        return result.rowcount
+
+
+def get_top_scorers(season, limit=10, session=None):
+    """Get the top scorers of a season from the precomputed season aggregates"""
+    with session_scope(session) as session:
+        return session.execute(text("""
+            SELECT p.name AS player_name, t.name AS team_name, s.goals, s.matches_played, s.minutes_played
+            FROM player_season_stats s
+            JOIN players p ON p.player_id = s.player_id
+            LEFT JOIN teams t ON t.team_id = s.team_id
+            WHERE s.season = :season AND s.goals > 0
+            ORDER BY s.goals DESC, s.minutes_played ASC
+            LIMIT :limit
+        """), {"season": season, "limit": limit}).all()
 
 
 # ============== INJURY ARTICLE OPERATIONS ==============
 
-def create_injury_article(url, player_name=None, team_name=None, title=None, published_date=None, injury_type=None, duration=None):
-    """Create a new injury article (returns None if URL already exists)"""
-    with get_db_session() as session:
-        try:
-            # Check if URL already exists
-            existing = session.query(InjuryArticle).filter_by(url=url).first()
-            if existing:
-                return None
-            
-            player_id = None
-            
-            # Normalize names to uppercase
-            if player_name is not None and team_name is not None:
-                player_name_upper = player_name.upper().strip()
-                team_name_upper = team_name.upper().strip()
-                
-                # Find player by name and team
-                player_id = get_player_by_name_and_team_name(player_name_upper, team_name_upper)
-
-                if not player_id and ' ' in player_name_upper:
-                    name_parts = player_name_upper.split()
-                    if len(name_parts) == 2:
-                        reversed_name = f"{name_parts[1]} {name_parts[0]}"
-                        player_id = get_player_by_name_and_team_name(reversed_name, team_name_upper)
-                
-            player_id = player_id if player_id else None
-            
-            # Determine if manual check is needed
-            needs_manual_check = player_id is None
-            
-            injury_article = InjuryArticle(
-                player_id=player_id,
-                url=url,
-                title=title,
-                published_date=published_date,
-                injury_type=injury_type,
-                injury_start=published_date,
-                duration=duration,
-                needs_manual_check=needs_manual_check
-            )
-            session.add(injury_article)
-            session.flush()
+def create_injury_article(url, player_name=None, team_name=None, title=None, published_date=None, injury_type=None, duration=None, player_id=None, session=None):
+    """
+    Create a new injury article (returns None if URL already exists).
 
-            if player_id:
-                update_player_injury_status(player_id, True)
+    If player_id is given (already resolved by the caller), the name lookup is skipped.
+    """
+    with session_scope(session) as session:
+        # Check if URL already exists
+        existing = session.query(InjuryArticle).filter_by(url=url).first()
+        if existing:
+            return None
+        
+        # Normalize names to uppercase
+        if player_id is None and player_name is not None and team_name is not None:
+            player_name_upper = player_name.upper().strip()
+            team_name_upper = team_name.upper().strip()
             
-            print(f"Cikk mentve (ID: {injury_article.id}), "
-                  f"Manuális ellenőrzés szükséges: {needs_manual_check}")
+            # Find player by name and team (in the same session, no second connection)
+            player_id = get_player_by_name_and_team_name(player_name_upper, team_name_upper, session=session)
+
+            if not player_id and ' ' in player_name_upper:
+                name_parts = player_name_upper.split()
+                if len(name_parts) == 2:
+                    reversed_name = f"{name_parts[1]} {name_parts[0]}"
+                    player_id = get_player_by_name_and_team_name(reversed_name, team_name_upper, session=session)
             
-            return injury_article.id
+        player_id = player_id if player_id else None
+        
+        # Determine if manual check is needed
+        needs_manual_check = player_id is None
+        
+        injury_article = InjuryArticle(
+            player_id=player_id,
+            url=url,
+            title=title,
+            published_date=published_date,
+            injury_type=injury_type,
+            injury_start=published_date,
+            duration=duration,
+            needs_manual_check=needs_manual_check
+        )
+        try:
+            # Savepoint: a concurrent duplicate URL only rolls back this insert
+            with session.begin_nested():
+                session.add(injury_article)
+                session.flush()
         except IntegrityError:
             return None
+        record_rows("injury_articles")
+
+        if player_id:
+            update_player_injury_status(player_id, True, session=session)
+        
+        print(f"Cikk mentve (ID: {injury_article.id}), "
+              f"Manuális ellenőrzés szükséges: {needs_manual_check}")
+        
+        return injury_article.id
 
 
-def get_injury_article_by_url(url):
+def get_injury_article_by_url(url, session=None):
     """Get injury article by URL"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         return session.query(InjuryArticle).filter_by(url=url).first()
 
 
-def update_injury_article(injury_article_id, **kwargs):
+def update_injury_article(injury_article_id, session=None, **kwargs):
     """Update an existing injury article"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         injury_article = session.query(InjuryArticle).filter_by(id=injury_article_id).first()
         if injury_article:
             for key, value in kwargs.items():
                 if hasattr(injury_article, key):
                     setattr(injury_article, key, value)
+            record_rows("injury_articles")
             return True
         return False
 
 
-def get_injuries_for_player(player_id):
+def get_injuries_for_player(player_id, session=None):
     """Get all injury records for a player"""
-    with get_db_session() as session:
+    with session_scope(session) as session:
         return session.query(InjuryArticle).filter(
             InjuryArticle.player_id == player_id
         ).all()
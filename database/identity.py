@@ -0,0 +1,145 @@
+import threading
+from typing import Dict, Optional, Tuple
+from .models import Team, Player, TeamPlayer, name_key
+from .database import session_scope
+from monitoring.metrics import IDENTITY_LOOKUPS, current_stage
+
+
+# Raw SQL form of models.name_key (backfill merge)
+NAME_KEY_SQL = r"upper(trim(regexp_replace({column}, '\s+', ' ', 'g')))"
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lookup key for team and player names (upper-cased, trimmed, single spaces)"""
+    return " ".join((name or "").upper().split())
+
+
+class IdentityResolver:
+    """
+    In-memory identity map for team and player IDs during ingestion.
+
+    The team name -> team_id and (player name, team_id) -> player_id maps are
+    loaded with one query each on first use. New rows are written through with
+    register_team / register_player, so later lookups in the same run hit the
+    map. A miss falls back to a single database query, and its result (also
+    "not found") is cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._teams: Optional[Dict[str, Optional[int]]] = None
+        self._players: Optional[Dict[Tuple[str, int], Optional[int]]] = None
+        self.hits = {"team": 0, "player": 0}
+        self.misses = {"team": 0, "player": 0}
+
+    def _ensure_loaded(self, session=None):
+        if self._teams is not None:
+            return
+        with session_scope(session) as session:
+            teams = {normalize_name(name): team_id for team_id, name in session.query(Team.team_id, Team.name)}
+            players = {
+                (normalize_name(name), team_id): player_id
+                for player_id, name, team_id in session.query(Player.player_id, Player.name, TeamPlayer.team_id)
+                .join(TeamPlayer, TeamPlayer.player_id == Player.player_id)
+            }
+        with self._lock:
+            if self._teams is None:
+                self._teams, self._players = teams, players
+        print(f"Azonosítók betöltve: {len(teams)} csapat, {len(players)} játékos")
+
+    def _count(self, kind: str, hit: bool):
+        with self._lock:
+            (self.hits if hit else self.misses)[kind] += 1
+        IDENTITY_LOOKUPS.inc(stage=current_stage(), kind=kind, result="hit" if hit else "miss")
+
+    def team_id(self, name: str, session=None) -> Optional[int]:
+        self._ensure_loaded(session)
+        key = normalize_name(name)
+        if key in self._teams:
+            self._count("team", True)
+            return self._teams[key]
+
+        self._count("team", False)
+        with session_scope(session) as session:
+            team = session.query(Team.team_id).filter(name_key(Team.name) == key).first()
+        team_id = team.team_id if team else None
+        with self._lock:
+            self._teams[key] = team_id
+        return team_id
+
+    def player_id(self, name: str, team_id: Optional[int], session=None) -> Optional[int]:
+        if team_id is None:
+            return None
+        self._ensure_loaded(session)
+        key = (normalize_name(name), team_id)
+        if key in self._players:
+            self._count("player", True)
+            return self._players[key]
+
+        self._count("player", False)
+        with session_scope(session) as session:
+            player = session.query(Player.player_id)\
+                .join(TeamPlayer, TeamPlayer.player_id == Player.player_id)\
+                .filter(TeamPlayer.team_id == team_id)\
+                .filter(name_key(Player.name) == key[0])\
+                .first()
+        player_id = player.player_id if player else None
+        with self._lock:
+            self._players[key] = player_id
+        return player_id
+
+    def player_id_by_team_name(self, name: str, team_name: str, session=None) -> Optional[int]:
+        """Player lookup by team name; also tries the reversed "given name family name" order"""
+        team_id = self.team_id(team_name, session=session)
+        player_id = self.player_id(name, team_id, session=session)
+        parts = normalize_name(name).split()
+        if player_id is None and len(parts) == 2:
+            player_id = self.player_id(f"{parts[1]} {parts[0]}", team_id, session=session)
+        return player_id
+
+    def register_team(self, name: str, team_id: int):
+        """Write-through after a team insert has been committed"""
+        if self._teams is None:
+            return
+        with self._lock:
+            self._teams[normalize_name(name)] = team_id
+
+    def register_player(self, name: str, team_id: int, player_id: int):
+        """Write-through after a player insert / team link has been committed"""
+        if self._players is None:
+            return
+        with self._lock:
+            self._players[(normalize_name(name), team_id)] = player_id
+
+    def reset(self):
+        """Drop the maps (e.g. after a set-based load); the next lookup reloads them"""
+        with self._lock:
+            self._teams, self._players = None, None
+
+    def forget_misses(self):
+        """Drop cached "not found" results, keep the loaded IDs (between runs of a long-lived process)"""
+        with self._lock:
+            if self._teams is not None:
+                self._teams = {key: value for key, value in self._teams.items() if value is not None}
+                self._players = {key: value for key, value in self._players.items() if value is not None}
+
+    def format_stats(self) -> str:
+        parts = []
+        for kind in ("team", "player"):
+            total = self.hits[kind] + self.misses[kind]
+            rate = self.hits[kind] / total * 100 if total else 0.0
+            parts.append(f"{kind}: {self.hits[kind]} találat, {self.misses[kind]} hiány ({rate:.1f}%)")
+        return "Azonosító cache - " + ", ".join(parts)
+
+
+_shared_resolver: Optional[IdentityResolver] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_resolver(create: bool = True) -> Optional[IdentityResolver]:
+    """The process-wide identity resolver (created on first call, loaded on first lookup)"""
+    global _shared_resolver
+    with _shared_lock:
+        if _shared_resolver is None and create:
+            _shared_resolver = IdentityResolver()
+        return _shared_resolver
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, DateTime, UniqueConstraint, Index, func, literal_column
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -33,11 +33,13 @@ class Player(Base):
     name = Column(String(100))
     birth_date = Column(Date)
     is_injured = Column(Boolean, default=False)
+    profile_checked_at = Column(DateTime)
     
     # Relationships
     team_players = relationship('TeamPlayer', back_populates='player')
     match_events = relationship('MatchEvent', back_populates='player')
     player_stats = relationship('PlayerStats', back_populates='player')
+    match_stats = relationship('PlayerMatchStats', back_populates='player')
     injury_articles = relationship('InjuryArticle', back_populates='player')
     
     def __repr__(self):
@@ -46,6 +48,10 @@ class Player(Base):
 
 class TeamPlayer(Base):
     __tablename__ = 'team_players'
+    __table_args__ = (
+        UniqueConstraint('team_id', 'player_id', name='uq_team_players_team_player'),
+        Index('ix_team_players_player_id', 'player_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'))
@@ -61,6 +67,11 @@ class TeamPlayer(Base):
 
 class Match(Base):
     __tablename__ = 'matches'
+    __table_args__ = (
+        # Duplikáció ellenőrzés (get_existing_match_keys) és fordulónkénti számlálás
+        UniqueConstraint('season', 'round', 'home_team_id', 'away_team_id', 'date',
+                         name='uq_matches_season_round_teams_date'),
+    )
     
     match_id = Column(Integer, primary_key=True)
     season = Column(String(20))
@@ -77,6 +88,7 @@ class Match(Base):
     home_team = relationship('Team', foreign_keys=[home_team_id], back_populates='home_matches')
     away_team = relationship('Team', foreign_keys=[away_team_id], back_populates='away_matches')
     match_events = relationship('MatchEvent', back_populates='match')
+    player_match_stats = relationship('PlayerMatchStats', back_populates='match')
     
     def __repr__(self):
         return f"<Match(round={self.round}, date={self.date})>"
@@ -84,11 +96,16 @@ class Match(Base):
 
 class MatchEvent(Base):
     __tablename__ = 'match_events'
+    __table_args__ = (
+        Index('ix_match_events_match_id', 'match_id'),
+        Index('ix_match_events_player_id', 'player_id'),
+    )
     
     event_id = Column(Integer, primary_key=True)
     match_id = Column(Integer, ForeignKey('matches.match_id'))
     event_type = Column(String(30))
     minute = Column(Integer)
+    added_time = Column(Integer, default=0)  # Ráadás perc (90+3 -> minute=90, added_time=3)
     player_id = Column(Integer, ForeignKey('players.player_id'))
     team_id = Column(Integer, ForeignKey('teams.team_id'))
     
@@ -98,11 +115,12 @@ class MatchEvent(Base):
     team = relationship('Team', back_populates='match_events')
     
     def __repr__(self):
-        return f"<MatchEvent(type={self.event_type}, minute={self.minute})>"
+        return f"<MatchEvent(type={self.event_type}, minute={self.minute}+{self.added_time})>"
 
 
 class Standing(Base):
     __tablename__ = 'standings'
+    __table_args__ = (UniqueConstraint('season', 'round', 'team_id', name='uq_standings_season_round_team'),)
     
     id = Column(Integer, primary_key=True)
     season = Column(String(20))
@@ -127,6 +145,7 @@ class Standing(Base):
 
 class PlayerStats(Base):
     __tablename__ = 'player_stats'
+    __table_args__ = (UniqueConstraint('player_id', 'team_id', name='uq_player_stats_player_team'),)
     
     id = Column(Integer, primary_key=True)
     player_id = Column(Integer, ForeignKey('players.player_id'))
@@ -146,8 +165,36 @@ class PlayerStats(Base):
         return f"<PlayerStats(player_id={self.player_id}, goals={self.goals})>"
 
 
+class PlayerMatchStats(Base):
+    """Egy játékos egy meccsen (tény tábla; a szezon összesítők ebből számolódnak)"""
+    __tablename__ = 'player_match_stats'
+    __table_args__ = (
+        UniqueConstraint('match_id', 'player_id', name='uq_player_match_stats_match_player'),
+        Index('ix_player_match_stats_player_id', 'player_id'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    match_id = Column(Integer, ForeignKey('matches.match_id'), nullable=False)
+    player_id = Column(Integer, ForeignKey('players.player_id'), nullable=False)
+    team_id = Column(Integer, ForeignKey('teams.team_id'))
+    is_starter = Column(Boolean, default=False)
+    minutes_played = Column(Integer, default=0)
+    goals = Column(Integer, default=0)
+    own_goals = Column(Integer, default=0)
+    yellow_cards = Column(Integer, default=0)
+    red_cards = Column(Integer, default=0)
+    
+    # Relationships
+    match = relationship('Match', back_populates='player_match_stats')
+    player = relationship('Player', back_populates='match_stats')
+    
+    def __repr__(self):
+        return f"<PlayerMatchStats(match_id={self.match_id}, player_id={self.player_id}, goals={self.goals})>"
+
+
 class InjuryArticle(Base):
     __tablename__ = 'injury_articles'
+    __table_args__ = (Index('ix_injury_articles_player_id', 'player_id'),)
     
     id = Column(Integer, primary_key=True)
     player_id = Column(Integer, ForeignKey('players.player_id'))
@@ -169,4 +216,18 @@ class InjuryArticle(Base):
             f"injury_type={self.injury_type}, "
             f"start={self.injury_start}, duration={self.duration}, "
             f"needs_manual_check={self.needs_manual_check})>"
-        )
\ No newline at end of file
+        )
+
+
+def name_key(column):
+    """Név keresési kulcs SQL-ben: a database.identity.normalize_name megfelelője"""
+    # A literálok a lekérdezésben is inline maradnak, különben a funkcionális index nem illeszkedik
+    return func.upper(func.trim(func.regexp_replace(
+        column, literal_column(r"'\s+'"), literal_column("' '"), literal_column("'g'"))))
+
+
+# Funkcionális indexek a kis-nagybetű / szóköz független név keresésekhez
+# (get_team_by_name, get_player_by_name_and_team_name, IdentityResolver);
+# a regexp_replace csak PostgreSQL-en létezik
+Index('ix_teams_name_normalized', name_key(Team.name)).ddl_if(dialect='postgresql')
+Index('ix_players_name_normalized', name_key(Player.name)).ddl_if(dialect='postgresql')
@@ -0,0 +1,273 @@
+"""
+Read API for reporting: immutable records instead of ORM objects.
+
+Every helper loads what its view needs with explicit joins / selectinload inside
+the session and returns NamedTuples, so callers never trigger lazy loads on
+detached objects (or N+1 queries). List helpers are paginated (page is 1-based).
+"""
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import aliased, joinedload, selectinload
+from .database import engine, session_scope
+from .models import Team, Player, TeamPlayer, Match, MatchEvent, Standing
+
+
+DEFAULT_PAGE_SIZE = 50
+
+SCORING_EVENTS = ("goal", "own_goal")
+
+
+# ============== RECORDS ==============
+
+class Page(NamedTuple):
+    items: Tuple
+    total: int
+    page: int
+    page_size: int
+
+    @property
+    def pages(self) -> int:
+        return (self.total + self.page_size - 1) // self.page_size if self.page_size else 0
+
+
+class TeamRecord(NamedTuple):
+    team_id: int
+    name: str
+    address: Optional[str]
+    website: Optional[str]
+
+
+class StandingRecord(NamedTuple):
+    position: int
+    team_id: int
+    team_name: str
+    matches_played: int
+    wins: int
+    draws: int
+    losses: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+
+
+class MatchRecord(NamedTuple):
+    match_id: int
+    season: str
+    round: int
+    date: Optional[date]
+    home_team_id: int
+    home_team: str
+    away_team_id: int
+    away_team: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+    stadium: Optional[str]
+    referee: Optional[str]
+
+
+class EventRecord(NamedTuple):
+    minute: int
+    added_time: int
+    event_type: str
+    player_id: Optional[int]
+    player_name: Optional[str]
+    team_id: Optional[int]
+    team_name: Optional[str]
+
+
+class ScorerRecord(NamedTuple):
+    player_id: Optional[int]
+    player_name: Optional[str]
+    team_name: Optional[str]
+    minute: int
+    added_time: int
+    own_goal: bool
+
+
+class MatchDetail(NamedTuple):
+    match: MatchRecord
+    events: Tuple[EventRecord, ...]
+    scorers: Tuple[ScorerRecord, ...]
+
+
+class InjuryRecord(NamedTuple):
+    injury_type: Optional[str]
+    injury_start: Optional[date]
+    duration: Optional[str]
+    published_date: Optional[date]
+    url: str
+
+
+class SquadPlayer(NamedTuple):
+    player_id: int
+    name: str
+    birth_date: Optional[date]
+    is_injured: bool
+    latest_injury: Optional[InjuryRecord]
+
+
+# ============== HELPERS ==============
+
+def _paginate(query, page: int, page_size: int) -> Tuple[list, int]:
+    """One page of an ordered query plus the total row count (two queries)"""
+    page = max(page, 1)
+    total = query.order_by(None).count()
+    return query.offset((page - 1) * page_size).limit(page_size).all(), total
+
+
+def _match_query(session):
+    """Matches with both team names in a single joined query"""
+    home, away = aliased(Team), aliased(Team)
+    return session.query(
+        Match.match_id, Match.season, Match.round, Match.date,
+        Match.home_team_id, home.name, Match.away_team_id, away.name,
+        Match.home_score, Match.away_score, Match.stadium, Match.referee
+    ).join(home, home.team_id == Match.home_team_id)\
+     .join(away, away.team_id == Match.away_team_id)
+
+
+def _latest_injury(player: Player) -> Optional[InjuryRecord]:
+    if not player.injury_articles:
+        return None
+    article = max(player.injury_articles, key=lambda a: (a.published_date or date.min, a.id))
+    return InjuryRecord(article.injury_type, article.injury_start, article.duration,
+                        article.published_date, article.url)
+
+
+def _squad_player(player: Player) -> SquadPlayer:
+    return SquadPlayer(player.player_id, player.name, player.birth_date, bool(player.is_injured),
+                       _latest_injury(player))
+
+
+# ============== TEAMS ==============
+
+def list_teams(page=1, page_size=DEFAULT_PAGE_SIZE, session=None) -> Page:
+    """Teams ordered by name"""
+    with session_scope(session) as session:
+        query = session.query(Team.team_id, Team.name, Team.address, Team.website).order_by(Team.name)
+        rows, total = _paginate(query, page, page_size)
+        return Page(tuple(TeamRecord(*row) for row in rows), total, page, page_size)
+
+
+def get_team_squad(team_id, session=None) -> Tuple[SquadPlayer, ...]:
+    """Players of a team with injury status and latest injury article (two queries)"""
+    with session_scope(session) as session:
+        players = session.query(Player)\
+            .join(TeamPlayer, TeamPlayer.player_id == Player.player_id)\
+            .filter(TeamPlayer.team_id == team_id)\
+            .options(selectinload(Player.injury_articles))\
+            .order_by(Player.name)\
+            .all()
+        return tuple(_squad_player(player) for player in players)
+
+
+def list_injured_players(page=1, page_size=DEFAULT_PAGE_SIZE, session=None) -> Page:
+    """Injured players with their latest injury article"""
+    with session_scope(session) as session:
+        query = session.query(Player)\
+            .filter(Player.is_injured.is_(True))\
+            .options(selectinload(Player.injury_articles))\
+            .order_by(Player.name)
+        players, total = _paginate(query, page, page_size)
+        return Page(tuple(_squad_player(player) for player in players), total, page, page_size)
+
+
+# ============== STANDINGS ==============
+
+def get_round_table(season, round_num, session=None) -> Tuple[StandingRecord, ...]:
+    """Standings of a round with team names (one joined query)"""
+    with session_scope(session) as session:
+        rows = session.query(
+            Standing.position, Standing.team_id, Team.name,
+            Standing.matches_played, Standing.wins, Standing.draws, Standing.losses,
+            Standing.goals_for, Standing.goals_against, Standing.goal_difference, Standing.points
+        ).join(Team, Team.team_id == Standing.team_id)\
+         .filter(Standing.season == season, Standing.round == round_num)\
+         .order_by(Standing.position)\
+         .all()
+        return tuple(StandingRecord(*row) for row in rows)
+
+
+# ============== MATCHES ==============
+
+def list_matches(season, round_num=None, page=1, page_size=DEFAULT_PAGE_SIZE, session=None) -> Page:
+    """Matches of a season (optionally one round) with team names, in date order"""
+    with session_scope(session) as session:
+        query = _match_query(session).filter(Match.season == season)
+        if round_num is not None:
+            query = query.filter(Match.round == round_num)
+        rows, total = _paginate(query.order_by(Match.round, Match.date, Match.match_id), page, page_size)
+        return Page(tuple(MatchRecord(*row) for row in rows), total, page, page_size)
+
+
+def get_match_detail(match_id, session=None) -> Optional[MatchDetail]:
+    """A match with its events (player and team names) and scorers, in two queries"""
+    with session_scope(session) as session:
+        match = session.query(Match)\
+            .options(
+                joinedload(Match.home_team), joinedload(Match.away_team),
+                selectinload(Match.match_events).joinedload(MatchEvent.player),
+                selectinload(Match.match_events).joinedload(MatchEvent.team),
+            )\
+            .filter(Match.match_id == match_id)\
+            .one_or_none()
+        if match is None:
+            return None
+
+        record = MatchRecord(
+            match.match_id, match.season, match.round, match.date,
+            match.home_team_id, match.home_team.name, match.away_team_id, match.away_team.name,
+            match.home_score, match.away_score, match.stadium, match.referee
+        )
+        events = tuple(
+            EventRecord(e.minute, e.added_time or 0, e.event_type, e.player_id,
+                        e.player.name if e.player else None, e.team_id, e.team.name if e.team else None)
+            for e in sorted(match.match_events, key=lambda e: (e.minute or 0, e.added_time or 0, e.event_id))
+        )
+        scorers = tuple(
+            ScorerRecord(e.player_id, e.player_name, e.team_name, e.minute, e.added_time, e.event_type == "own_goal")
+            for e in events if e.event_type in SCORING_EVENTS
+        )
+        return MatchDetail(record, events, scorers)
+
+
+# ============== QUERY COUNTING ==============
+
+class QueryCounter:
+    """Statements executed on the engine while counting (see count_queries)"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(max_queries: Optional[int] = None, bind=engine) -> Iterator[QueryCounter]:
+    """
+    Count the SQL statements executed inside the block.
+
+    With max_queries, an AssertionError lists the statements when the block
+    executed more (e.g. to catch N+1 regressions in reporting code):
+
+        with count_queries(max_queries=2):
+            get_match_detail(match_id, session=session)
+    """
+    counter = QueryCounter()
+    event.listen(bind, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", counter)
+    if max_queries is not None and counter.count > max_queries:
+        raise AssertionError(
+            f"{counter.count} queries executed, expected at most {max_queries}:\n" + "\n".join(counter.statements)
+        )
@@ -9,13 +9,15 @@ CREATE TABLE players (
     player_id SERIAL PRIMARY KEY,
     name VARCHAR(100),
     birth_date DATE,
-    is_injured BOOLEAN DEFAULT FALSE
+    is_injured BOOLEAN DEFAULT FALSE,
+    profile_checked_at TIMESTAMP
 );
 
 CREATE TABLE team_players (
     id SERIAL PRIMARY KEY,
     team_id INT REFERENCES teams(team_id),
-    player_id INT REFERENCES players(player_id)
+    player_id INT REFERENCES players(player_id),
+    CONSTRAINT uq_team_players_team_player UNIQUE (team_id, player_id)
 );
 
 CREATE TABLE matches (
@@ -28,7 +30,8 @@ CREATE TABLE matches (
     home_score INT,
     away_score INT,
     stadium VARCHAR(100),
-    referee VARCHAR(100)
+    referee VARCHAR(100),
+    CONSTRAINT uq_matches_season_round_teams_date UNIQUE (season, round, home_team_id, away_team_id, date)
 );
 
 CREATE TABLE match_events (
@@ -36,6 +39,7 @@ CREATE TABLE match_events (
     match_id INT REFERENCES matches(match_id),
     event_type VARCHAR(30),
     minute INT,
+    added_time INT DEFAULT 0,
     player_id INT REFERENCES players(player_id),
     team_id INT REFERENCES teams(team_id)
 );
@@ -53,7 +57,8 @@ CREATE TABLE standings (
     goals_against INT,
     goal_difference INT,
     points INT,
-    position INT
+    position INT,
+    CONSTRAINT uq_standings_season_round_team UNIQUE (season, round, team_id)
 );
 
 CREATE TABLE player_stats (
@@ -65,7 +70,22 @@ CREATE TABLE player_stats (
     own_goals INT,
     yellow_cards INT,
     red_cards INT,
-    minutes_played INT
+    minutes_played INT,
+    CONSTRAINT uq_player_stats_player_team UNIQUE (player_id, team_id)
+);
+
+CREATE TABLE player_match_stats (
+    id SERIAL PRIMARY KEY,
+    match_id INT NOT NULL REFERENCES matches(match_id),
+    player_id INT NOT NULL REFERENCES players(player_id),
+    team_id INT REFERENCES teams(team_id),
+    is_starter BOOLEAN DEFAULT FALSE,
+    minutes_played INT DEFAULT 0,
+    goals INT DEFAULT 0,
+    own_goals INT DEFAULT 0,
+    yellow_cards INT DEFAULT 0,
+    red_cards INT DEFAULT 0,
+    CONSTRAINT uq_player_match_stats_match_player UNIQUE (match_id, player_id)
 );
 
 CREATE TABLE injury_articles (
@@ -80,3 +100,30 @@ CREATE TABLE injury_articles (
     duration VARCHAR(100),
     needs_manual_check BOOLEAN DEFAULT TRUE
 );
+
+CREATE MATERIALIZED VIEW player_season_stats AS
+SELECT
+    m.season,
+    pms.player_id,
+    pms.team_id,
+    COUNT(*) AS matches_played,
+    COUNT(*) FILTER (WHERE pms.is_starter) AS matches_started,
+    SUM(pms.minutes_played) AS minutes_played,
+    SUM(pms.goals) AS goals,
+    SUM(pms.own_goals) AS own_goals,
+    SUM(pms.yellow_cards) AS yellow_cards,
+    SUM(pms.red_cards) AS red_cards
+FROM player_match_stats pms
+JOIN matches m ON m.match_id = pms.match_id
+GROUP BY m.season, pms.player_id, pms.team_id;
+
+CREATE UNIQUE INDEX uq_player_season_stats ON player_season_stats (season, player_id, team_id);
+
+-- Keresési indexek (név alapú azonosítás, idegen kulcsok)
+CREATE INDEX ix_teams_name_normalized ON teams (upper(trim(regexp_replace(name, '\s+', ' ', 'g'))));
+CREATE INDEX ix_players_name_normalized ON players (upper(trim(regexp_replace(name, '\s+', ' ', 'g'))));
+CREATE INDEX ix_team_players_player_id ON team_players (player_id);
+CREATE INDEX ix_match_events_match_id ON match_events (match_id);
+CREATE INDEX ix_match_events_player_id ON match_events (player_id);
+CREATE INDEX ix_player_match_stats_player_id ON player_match_stats (player_id);
+CREATE INDEX ix_injury_articles_player_id ON injury_articles (player_id);
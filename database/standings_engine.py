@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .database import session_scope
+from .db_operations import bulk_upsert_season_standings
+from .models import Match, Standing
+
+
+# Sorrend pontegyenlőség esetén (NB I versenykiírás): gólkülönbség, több lőtt gól,
+# több győzelem, majd az érintett csapatok egymás elleni eredményei
+# (pont, gólkülönbség, lőtt gól). Teljes egyezésnél a team_id dönt (determinisztikus).
+TIE_BREAKS = ("points", "goal_difference", "goals_for", "wins")
+
+
+class SeasonTable:
+    """
+    Standings of every round of a season, computed from match results.
+
+    Each statistic is a team x round matrix of cumulative values (column r is
+    the table after round r + 1); positions[t, r] is the 1-based position.
+    """
+
+    def __init__(self, team_ids: np.ndarray, stats: Dict[str, np.ndarray], positions: np.ndarray):
+        self.team_ids = team_ids
+        self.stats = stats
+        self.positions = positions
+
+    @property
+    def rounds(self) -> int:
+        return self.positions.shape[1]
+
+    def round_rows(self, round_number: int) -> List[Dict]:
+        """The table after a round as standing rows ordered by position"""
+        r = round_number - 1
+        order = np.argsort(self.positions[:, r], kind="stable")
+        return [
+            {"team_id": int(self.team_ids[t]), "position": int(self.positions[t, r]),
+             **{field: int(values[t, r]) for field, values in self.stats.items()}}
+            for t in order
+        ]
+
+    def all_rows(self) -> List[Dict]:
+        """Standing rows of every round (with "round")"""
+        return [{"round": n, **row} for n in range(1, self.rounds + 1) for row in self.round_rows(n)]
+
+
+def _scatter(team_idx: np.ndarray, round_idx: np.ndarray, values: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    matrix = np.zeros(shape, dtype=np.int64)
+    np.add.at(matrix, (team_idx, round_idx), values)
+    return matrix
+
+
+def compute_standings(results: Iterable[Sequence[int]], num_rounds: Optional[int] = None,
+                      team_ids: Optional[Iterable[int]] = None) -> Optional[SeasonTable]:
+    """
+    Tables for rounds 1..N from (round, home_team_id, away_team_id, home_score, away_score) results.
+
+    N is num_rounds, or the last round with a result. Teams in team_ids without a
+    played match get a row with zeros. Returns None without results.
+    """
+    results = np.asarray(list(results), dtype=np.int64).reshape(-1, 5)
+    if not len(results):
+        return None
+
+    rounds, home_ids, away_ids, home_goals, away_goals = results.T
+    team_ids = np.unique(np.concatenate([home_ids, away_ids, np.asarray(list(team_ids or []), dtype=np.int64)]))
+    home, away = np.searchsorted(team_ids, home_ids), np.searchsorted(team_ids, away_ids)
+    round_idx = rounds - 1
+    num_teams, num_rounds = len(team_ids), max(num_rounds or 0, int(rounds.max()))
+    shape = (num_teams, num_rounds)
+
+    home_win = (home_goals > away_goals).astype(np.int64)
+    away_win = (home_goals < away_goals).astype(np.int64)
+    draw = (home_goals == away_goals).astype(np.int64)
+
+    def per_team(home_values, away_values):
+        """Per-round value per team, accumulated over the rounds"""
+        return np.cumsum(_scatter(home, round_idx, home_values, shape)
+                         + _scatter(away, round_idx, away_values, shape), axis=1)
+
+    ones = np.ones_like(rounds)
+    stats = {
+        "matches_played": per_team(ones, ones),
+        "wins": per_team(home_win, away_win),
+        "draws": per_team(draw, draw),
+        "losses": per_team(away_win, home_win),
+        "goals_for": per_team(home_goals, away_goals),
+        "goals_against": per_team(away_goals, home_goals),
+    }
+    stats["goal_difference"] = stats["goals_for"] - stats["goals_against"]
+    stats["points"] = 3 * stats["wins"] + stats["draws"]
+
+    # Egymás elleni eredmények: [pont, gólkülönbség, lőtt gól] x forduló x csapat x ellenfél, kumulálva
+    head_to_head = np.zeros((3, num_rounds, num_teams, num_teams), dtype=np.int64)
+    for k, (home_values, away_values) in enumerate((
+            (3 * home_win + draw, 3 * away_win + draw),
+            (home_goals - away_goals, away_goals - home_goals),
+            (home_goals, away_goals))):
+        np.add.at(head_to_head[k], (round_idx, home, away), home_values)
+        np.add.at(head_to_head[k], (round_idx, away, home), away_values)
+    head_to_head = np.cumsum(head_to_head, axis=1)
+
+    positions = np.zeros(shape, dtype=np.int64)
+    for r in range(num_rounds):
+        order = _rank_round(stats, head_to_head[:, r], r)
+        positions[order, r] = np.arange(1, num_teams + 1)
+
+    return SeasonTable(team_ids, stats, positions)
+
+
+def _rank_round(stats: Dict[str, np.ndarray], head_to_head: np.ndarray, r: int) -> np.ndarray:
+    """Team indices of a round in table order"""
+    keys = np.stack([stats[field][:, r] for field in TIE_BREAKS])
+    # lexsort: az utolsó kulcs az elsődleges; stabil, így teljes egyezésnél a kisebb team_id marad elöl
+    order = np.lexsort(-keys[::-1])
+
+    sorted_keys = keys[:, order]
+    boundaries = np.flatnonzero(np.any(sorted_keys[:, 1:] != sorted_keys[:, :-1], axis=0)) + 1
+    for group in np.split(np.arange(len(order)), boundaries):
+        if len(group) < 2:
+            continue
+        tied = order[group]
+        mini_table = head_to_head[:, tied][:, :, tied].sum(axis=2)
+        order[group] = tied[np.lexsort(-mini_table[::-1])]
+    return order
+
+
+def load_season_results(season: str, session=None) -> List[Tuple[int, int, int, int, int]]:
+    """Played matches of a season as (round, home_team_id, away_team_id, home_score, away_score)"""
+    with session_scope(session) as session:
+        return [tuple(row) for row in session.query(
+            Match.round, Match.home_team_id, Match.away_team_id, Match.home_score, Match.away_score
+        ).filter(
+            Match.season == season, Match.round.isnot(None),
+            Match.home_score.isnot(None), Match.away_score.isnot(None)
+        )]
+
+
+def load_season_team_ids(season: str, session=None) -> List[int]:
+    """
+    Teams of a season: every team of its stored matches (played or not) and of its stored standings.
+
+    Teams that have not played yet (early rounds, postponed games) still get a table row.
+    """
+    with session_scope(session) as session:
+        team_ids = set()
+        for home_team_id, away_team_id in session.query(Match.home_team_id, Match.away_team_id)\
+                .filter(Match.season == season):
+            team_ids.update((home_team_id, away_team_id))
+        team_ids.update(team_id for team_id, in session.query(Standing.team_id).filter(Standing.season == season).distinct())
+        team_ids.discard(None)
+        return sorted(team_ids)
+
+
+def compute_season_standings(season: str, team_ids: Optional[Iterable[int]] = None,
+                             session=None) -> Optional[SeasonTable]:
+    """Tables of every played round of a season from the stored matches and teams"""
+    with session_scope(session) as session:
+        season_teams = set(load_season_team_ids(season, session=session)) | set(team_ids or [])
+        return compute_standings(load_season_results(season, session=session), team_ids=season_teams)
+
+
+def save_season_standings(season: str, table: SeasonTable, session=None) -> int:
+    """Write every round of a computed season table in one batch"""
+    return bulk_upsert_season_standings(season, table.all_rows(), session=session)
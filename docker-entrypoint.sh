@@ -23,14 +23,28 @@ echo "Ollama elérhető"
 echo "Ollama model betöltése (háttérben)..."
 curl -X POST http://ollama:11434/api/pull -d '{"name": "llama3:latest"}' > /dev/null 2>&1 &
 
-# Cron szolgáltatás indítása
-echo "Cron indítása..."
-service cron start
+# Adatbázis séma frissítése (meglévő telepítéseken is, helyben)
+echo "Adatbázis migrációk futtatása..."
+cd /app && python main.py --migrate
 
 # Log fájlok létrehozása
 touch /var/log/scraper.log
 touch /var/log/cron.log
 
+# Daemon mód: egy folyamat futtatja az ütemezett feladatokat (cron nélkül)
+if [ "$SCRAPER_MODE" = "daemon" ]; then
+    echo "Daemon indítása..."
+    cd /app
+    if [ "$RUN_INITIAL_SCRAPERS" = "true" ]; then
+        exec python main.py --setup --daemon >> /var/log/scraper.log 2>&1
+    fi
+    exec python main.py --daemon >> /var/log/scraper.log 2>&1
+fi
+
+# Cron szolgáltatás indítása
+echo "Cron indítása..."
+service cron start
+
 # Kezdeti scraperek futtatása
 if [ "$RUN_INITIAL_SCRAPERS" = "true" ]; then
     echo "TELJES RENDSZER SETUP INDÍTÁSA..."
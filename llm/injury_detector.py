@@ -1,10 +1,20 @@
 import os
+import threading
+import time
 import requests
+from monitoring.metrics import LLM_DURATION, LLM_TOKENS, current_stage
+
+# Egy Ollama válasz maximális ideje (másodperc); enélkül egy beragadt kérés örökké várna
+OLLAMA_TIMEOUT = float(os.getenv('OLLAMA_TIMEOUT', '300'))
+
 
 class LLMInjuryDetector:
-    def __init__(self, model_name="llama3:latest", ollama_url=None):
+    def __init__(self, model_name="llama3:latest", ollama_url=None, timeout=OLLAMA_TIMEOUT):
         self.model_name = model_name
         self.ollama_url = ollama_url or os.getenv('OLLAMA_URL', 'http://ollama:11434/api/generate')
+        self.timeout = timeout
+        # Keep-alive kapcsolat: a cikkenkénti kérések nem nyitnak új TCP kapcsolatot
+        self.session = requests.Session()
 
     def query_ollama(self, prompt: str) -> str:
         """
@@ -16,14 +26,35 @@ class LLMInjuryDetector:
             "stream": False
         }
 
+        start = time.perf_counter()
+        # A késleltetés a sikertelen kérésekre is rögzül: timeout, HTTP státusz vagy "error"
+        status = "error"
         try:
-            response = requests.post(self.ollama_url, json=payload)
+            response = self.session.post(self.ollama_url, json=payload, timeout=self.timeout)
+            status = str(response.status_code)
             response.raise_for_status()
-            return response.json().get("response", "")
+            data = response.json()
+            self._record_tokens(data)
+            return data.get("response", "")
+        except requests.Timeout as e:
+            status = "timeout"
+            print(f"Az Ollama nem válaszolt {self.timeout:.0f} másodpercen belül: {e}")
+            return ""
         except Exception as e:
+            if status == "200":
+                status = "invalid_response"
             print(f"Hiba történt az Ollama lekérdezése során: {e}")
             return ""
+        finally:
+            LLM_DURATION.observe(time.perf_counter() - start, stage=current_stage(), model=self.model_name,
+                                 status=status)
+
 
+    def _record_tokens(self, data: dict):
+        """Tokenszámok rögzítése (az Ollama válasz eval számlálóiból)."""
+        stage = current_stage()
+        LLM_TOKENS.inc(data.get("prompt_eval_count", 0), stage=stage, model=self.model_name, kind="prompt")
+        LLM_TOKENS.inc(data.get("eval_count", 0), stage=stage, model=self.model_name, kind="completion")
 
     def build_prompt_from_article(self, article_text: str) -> str:
         """
@@ -63,6 +94,19 @@ class LLMInjuryDetector:
         return prompt
 
 
+_shared_detector = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_detector() -> LLMInjuryDetector:
+    """A folyamat közös LLM detektora (egy Ollama kapcsolat a futások között is)."""
+    global _shared_detector
+    with _shared_lock:
+        if _shared_detector is None:
+            _shared_detector = LLMInjuryDetector()
+        return _shared_detector
+
+
 # Példa használat:
 if __name__ == "__main__":
     scraper = LLMInjuryDetector()
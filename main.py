@@ -5,14 +5,38 @@ Futtatás: python main.py [options]
 """
 
 import argparse
+import contextvars
+import os
+import signal
 import sys
 import logging
+import time
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
 
 from scrapers.team_scraper import TeamAndPlayersScraper
 from scrapers.match_scraper import MatchAndMatchEventScraper
 from scrapers.standing_scraper import StandingScraper
+from scrapers.backfill_scraper import SeasonBackfillScraper
 from scrapers.nso_scraper import NSOArticleScraper
-from database.database import init_db, drop_db
+from scrapers.fetch_engine import get_shared_engine, enable_replay_mode
+from scrapers.crawl_frontier import get_shared_frontier
+from scrapers.competitions import get_competitions
+from database.database import engine as db_engine, init_db, drop_db, upgrade_db, schema_revisions
+from database.identity import get_shared_resolver
+from database.standings_engine import compute_season_standings, save_season_standings
+from llm.injury_detector import get_shared_detector
+from monitoring.health import HealthServer
+from monitoring.metrics import stage, write_metrics
+from scheduler.scheduler import Job, Scheduler
+
+# Daemon ütemezés (crontab formátum), a korábbi cron feladatok időpontjaival
+DAEMON_SCHEDULES = {
+    "matches": os.getenv('SCHEDULE_MATCHES', '0 1 * * 0'),      # vasárnap 01:00
+    "standings": os.getenv('SCHEDULE_STANDINGS', '0 2 * * 0'),  # vasárnap 02:00
+    "articles": os.getenv('SCHEDULE_ARTICLES', '0 3 */2 * *'),  # minden második nap 03:00
+}
 
 # Logging beállítás
 logging.basicConfig(
@@ -30,6 +54,24 @@ def init_database():
     init_db()
     logging.info("Adatbázis kész")
 
+def migrate_database():
+    """Adatbázis séma frissítése a legutolsó migrációra"""
+    logging.info("Adatbázis migrációk futtatása...")
+    upgrade_db()
+    logging.info("Adatbázis séma naprakész")
+
+def check_database_schema():
+    """
+    A séma verziójának ellenőrzése a scraperek előtt.
+
+    A batch upsertek (ON CONFLICT) a migrációk unique constraintjeire épülnek; a
+    séma módosítása viszont kifejezett lépés (--migrate), ezért lemaradásnál hibával leállunk.
+    """
+    current, head = schema_revisions()
+    if current != head:
+        raise RuntimeError(f"Az adatbázis séma nem naprakész ({current or 'verzió nélkül'} -> {head}), "
+                           f"futtasd előbb: python main.py --migrate")
+
 def reset_database():
     """Adatbázis teljes resetelése"""
     logging.warning("ADATBÁZIS TÖRLÉSE...")
@@ -38,66 +80,323 @@ def reset_database():
     init_db()
     logging.info("Adatbázis resetelve")
 
-def run_teams():
-    """Csapatok és játékosok scrapelése"""
-    logging.info("Csapatok és játékosok scrapelése...")
-    scraper = TeamAndPlayersScraper()
-    scraper.save_teams_to_db()
-    logging.info("Csapatok és játékosok mentve")
+def run_per_competition(competitions, func):
+    """
+    func(competition) futtatása sorozatonként párhuzamosan.
+
+    A sorozatok a közös fetch engine-en osztoznak, így a hostonkénti rate limit
+    együtt érvényes rájuk, de egy sorozat letöltési várakozásait a többi kitölti.
+    Egy sorozat hibája nem állítja le a többit; a végén az első hiba továbbdobódik.
+    """
+    competitions = list(competitions)
+    if len(competitions) <= 1:
+        for competition in competitions:
+            func(competition)
+        return
+
+    with ThreadPoolExecutor(max_workers=len(competitions), thread_name_prefix="competition") as executor:
+        # A szálak a hívó metrika szakaszát (contextvar) is megkapják
+        futures = {executor.submit(contextvars.copy_context().run, func, competition): competition
+                   for competition in competitions}
+        errors = []
+        for future, competition in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"{competition.name}: sikertelen: {e}")
+                errors.append(e)
+    if errors:
+        raise errors[0]
+
+def run_teams(full_roster=False, competition_keys=None):
+    """
+    Csapatok és játékosok scrapelése.
+
+    A sorozatok szándékosan egymás után futnak: ugyanaz a klub több sorozatban is
+    szerepelhet (pl. bajnokság és kupa), és a keret mentése párhuzamosan ugyanazt a
+    csapatot vagy játékost kétszer hozná létre.
+    """
+    with stage("teams"):
+        for competition in get_competitions(competition_keys):
+            logging.info(f"{competition.name}: csapatok és játékosok scrapelése...")
+            scraper = TeamAndPlayersScraper(competition=competition, incremental=not full_roster)
+            scraper.save_teams_to_db()
+        logging.info("Csapatok és játékosok mentve")
 
-def run_matches():
+def run_matches(competition_keys=None, rounds=None, since_round=None):
     """Meccsek és események scrapelése"""
-    logging.info("Meccsek és események scrapelése...")
-    scraper = MatchAndMatchEventScraper()
-    scraper.save_matches_to_db()
-    logging.info("Meccsek és események mentve")
-
-def run_standings():
-    """Tabella scrapelése"""
-    logging.info("Tabella scrapelése...")
-    scraper = StandingScraper()
-    scraper.save_standings_to_db()
-    logging.info("Tabella mentve")
+    def scrape(competition):
+        logging.info(f"{competition.name}: meccsek és események scrapelése...")
+        scraper = MatchAndMatchEventScraper(competition=competition)
+        scraper.save_matches_to_db(rounds=rounds, since_round=since_round, refresh=False)
+
+    with stage("matches"):
+        try:
+            run_per_competition(get_competitions(competition_keys), scrape)
+        finally:
+            # Az összesítők egyszer, az összes sorozat után (a párhuzamos újraépítések ütköznének)
+            MatchAndMatchEventScraper.refresh_aggregates()
+        logging.info("Meccsek és események mentve")
+
+def run_new_standings(competition_keys=None):
+    """Tabella letöltése az MLSZ-ről, csak a legutóbb mentett forduló utáni fordulókra"""
+    def scrape(competition):
+        logging.info(f"{competition.name}: új fordulók tabellájának letöltése...")
+        StandingScraper(competition=competition).save_new_standings()
+
+    with stage("standings"):
+        run_per_competition((c for c in get_competitions(competition_keys) if c.has_standings), scrape)
+        logging.info("Tabella mentve")
+
+def run_standings(competition_keys=None, check=False):
+    """Tabella számolása a mentett meccsekből (opcionálisan összevetve az MLSZ tabellájával)"""
+    with stage("standings"):
+        for competition in get_competitions(competition_keys):
+            if not competition.has_standings:
+                continue
+            logging.info(f"{competition.name}: tabella számolása a meccsekből...")
+            table = compute_season_standings(competition.season_label)
+            if table is None:
+                logging.info(f"{competition.name}: még nincs lejátszott meccs")
+                continue
+            saved = save_season_standings(competition.season_label, table)
+            logging.info(f"{competition.name}: {table.rounds} forduló tabellája mentve ({saved} sor)")
+            if check:
+                StandingScraper(competition=competition).cross_check(table)
+        logging.info("Tabella mentve")
+
+def run_backfill(competition_keys=None):
+    """Korábbi szezonok tömeges betöltése (COPY + halmazalapú merge, szezononként folytatható)"""
+    with stage("backfill"):
+        logging.info("Szezonok tömeges betöltése...")
+        scraper = SeasonBackfillScraper(get_competitions(competition_keys))
+        scraper.backfill()
+        logging.info("Szezonok betöltve")
 
 def run_articles():
     """Cikkek scrapelése"""
-    logging.info("Cikkek scrapelése...")
-    scraper = NSOArticleScraper()
-    scraper.scrape_and_save_to_db()
-    logging.info("Cikkek mentve")
+    with stage("articles"):
+        logging.info("Cikkek scrapelése...")
+        scraper = NSOArticleScraper()
+        scraper.scrape_and_save_to_db()
+        logging.info("Cikkek mentve")
+
+def run_dag(stages):
+    """
+    Szakaszok futtatása a függőségeik szerint, a független ágak párhuzamosan.
+
+    Args:
+        stages: {név: (függvény, (függőségek nevei...))}
+
+    Egy szakasz hibája csak a tőle (közvetve) függő szakaszokat hagyja ki, a többi
+    ág tovább fut. A végén szakaszonkénti időzítés kerül a logba.
+
+    Returns:
+        {név: {"status": "ok" / "failed" / "skipped", "start": s, "duration": s}}
+    """
+    results = {}
+    pending = dict(stages)
+    running = {}
+    started = time.perf_counter()
+
+    def execute(name, func):
+        start = time.perf_counter()
+        try:
+            func()
+            status = "ok"
+        except Exception as e:
+            logging.error(f"[{name}] szakasz sikertelen: {e}")
+            status = "failed"
+        return {"status": status, "start": start - started, "duration": time.perf_counter() - start}
+
+    def schedule(executor):
+        # Addig ismételjük, amíg egy kihagyás újabb kihagyásokat okoz
+        changed = True
+        while changed:
+            changed = False
+            for name, (func, deps) in list(pending.items()):
+                if any(results.get(dep, {}).get("status") in ("failed", "skipped") for dep in deps):
+                    logging.warning(f"[{name}] kihagyva, mert egy függősége sikertelen")
+                    results[name] = {"status": "skipped", "start": None, "duration": 0.0}
+                elif all(results.get(dep, {}).get("status") == "ok" for dep in deps):
+                    running[executor.submit(execute, name, func)] = name
+                else:
+                    continue
+                del pending[name]
+                changed = True
+
+    with ThreadPoolExecutor(max_workers=max(len(stages), 1), thread_name_prefix="stage") as executor:
+        schedule(executor)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+            schedule(executor)
+
+    for name in pending:
+        logging.error(f"[{name}] nem indítható: ismeretlen vagy körkörös függőség")
+        results[name] = {"status": "skipped", "start": None, "duration": 0.0}
+
+    log_stage_timings(results, time.perf_counter() - started)
+    return results
+
+def log_stage_timings(results, wall_time):
+    """Szakaszonkénti időzítés: indulás a futás elejéhez képest, időtartam, állapot"""
+    logging.info("Szakaszok időzítése:")
+    for name, result in results.items():
+        start = f"+{result['start']:.1f}s" if result["start"] is not None else "-"
+        logging.info(f"  {name:<10} {result['status']:<8} indulás {start:>8}  időtartam {result['duration']:.1f}s")
+    total = sum(result["duration"] for result in results.values())
+    logging.info(f"Teljes futás: {wall_time:.1f}s (a szakaszok összege: {total:.1f}s)")
 
-def run_all():
-    """Összes scraper futtatása"""
+def run_all(competition_keys=None, articles_after_teams=False):
+    """
+    Összes scraper futtatása a függőségeik szerint.
+
+    teams -> matches -> standings (a tabella a mentett meccsekből számolódik), az NSO
+    cikkek (letöltés + LLM) ettől függetlenül, párhuzamosan futnak. Üres adatbázisnál
+    (articles_after_teams) a cikkek a csapatok után jönnek, hogy a sérülések
+    játékoshoz köthetők legyenek.
+    """
     logging.info("ÖSSZES SCRAPER INDÍTÁSA")
     
-    run_teams()
-    run_matches() 
-    run_standings()
-    run_articles()
+    results = run_dag({
+        "teams": (partial(run_teams, competition_keys=competition_keys), ()),
+        "matches": (partial(run_matches, competition_keys), ("teams",)),
+        "standings": (partial(run_standings, competition_keys), ("matches",)),
+        "articles": (run_articles, ("teams",) if articles_after_teams else ()),
+    })
+    failed = [name for name, result in results.items() if result["status"] != "ok"]
+    if failed:
+        raise RuntimeError(f"Sikertelen vagy kihagyott szakaszok: {', '.join(failed)}")
     
     logging.info("ÖSSZES SCRAPER BEFEJEZVE")
 
-def run_complete_setup():
+def run_complete_setup(competition_keys=None):
     """Teljes setup: adatbázis + összes scraper"""
     logging.info("TELJES RENDSZER SETUP INDÍTÁSA")
     init_database()
-    run_all()
+    check_database_schema()
+    run_all(competition_keys, articles_after_teams=True)
     logging.info("TELJES RENDSZER SETUP BEFEJEZVE")
 
+def run_daemon(competition_keys=None):
+    """
+    Hosszan futó folyamat: a meccs, tabella és cikk feladatok ütemezetten, egy meleg
+    folyamatban futnak (közös HTTP kliens, DB kapcsolat pool, azonosító cache és
+    Ollama kapcsolat), átfedés védelemmel és állapot végponttal.
+    """
+    logging.info("DAEMON INDÍTÁSA")
+
+    # Közös erőforrások felmelegítése: a feladatok futásai között is megmaradnak
+    get_shared_engine()
+    get_shared_detector()
+    with db_engine.connect():
+        pass
+
+    scheduler = Scheduler([
+        Job("matches", partial(run_matches, competition_keys), DAEMON_SCHEDULES["matches"]),
+        Job("standings", partial(run_standings, competition_keys), DAEMON_SCHEDULES["standings"],
+            waits_for=("matches",)),
+        Job("articles", run_articles, DAEMON_SCHEDULES["articles"]),
+    ], after_run=after_daemon_job)
+    health = HealthServer(scheduler.status)
+
+    def shutdown(signum, frame):
+        logging.info("Leállítási jel, az ütemező leáll (a megszakított futás a checkpointtól folytatódik)")
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    scheduler.start()
+    health.start()
+    for name, job in scheduler.jobs.items():
+        logging.info(f"  {name:<10} {job.schedule.expression:<14} következő futás: {job.schedule.next_after(datetime.now()):%Y-%m-%d %H:%M}")
+    scheduler.wait()
+    health.stop()
+    logging.info("DAEMON LEÁLLT")
+
+def after_daemon_job(job):
+    """Egy ütemezett futás után: letöltési statisztikák, metrikák, elavult cache bejegyzések"""
+    log_fetch_stats()
+    write_metrics(job="daemon")
+    resolver = get_shared_resolver(create=False)
+    if resolver is not None:
+        resolver.forget_misses()
+
+def parse_rounds(value):
+    """Forduló lista a CLI-hez: "5-9", "12" vagy "1,3,5-7" """
+    rounds = []
+    try:
+        for part in value.split(","):
+            if "-" in part:
+                start, end = part.split("-", 1)
+                rounds.extend(range(int(start), int(end) + 1))
+            else:
+                rounds.append(int(part))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Érvénytelen forduló lista: {value}")
+    return sorted(set(rounds))
+
+# Scraper futtatást kérő kapcsolók (a többi csak a futás módját állítja)
+SCRAPER_FLAGS = ('teams', 'matches', 'standings', 'scrape_standings', 'articles', 'all', 'setup', 'backfill', 'daemon')
+
+def has_scraper_flag(args):
+    return any(getattr(args, flag) for flag in SCRAPER_FLAGS)
+
+def log_fetch_stats():
+    """HTTP cache, azonosító cache és circuit breaker állapot kiírása a futás logjába"""
+    engine = get_shared_engine(create=False)
+    if engine is None:
+        return
+    if engine.cache is not None:
+        logging.info(engine.cache.format_stats())
+    resolver = get_shared_resolver(create=False)
+    if resolver is not None:
+        logging.info(resolver.format_stats())
+    for host, state in engine.breaker_states().items():
+        if state != "closed":
+            logging.warning(f"Circuit breaker nyitva maradt: {host} ({state})")
+
 def main():
     parser = argparse.ArgumentParser(description='MLSZ Scraper Suite')
     
     # Fő opciók
     parser.add_argument('--teams', action='store_true', help='Csapatok scrapelése')
     parser.add_argument('--matches', action='store_true', help='Meccsek scrapelése')
-    parser.add_argument('--standings', action='store_true', help='Tabella scrapelése')
+    parser.add_argument('--standings', action='store_true', help='Tabella számolása a mentett meccsekből')
     parser.add_argument('--articles', action='store_true', help='Cikkek scrapelése')
+    parser.add_argument('--scrape-standings', action='store_true',
+                        help='Az MLSZ tabella letöltése és mentése a számolt helyett: a legutóbb mentett '
+                             'forduló utáni fordulók (ha még nincs tabella, az 1. fordulótól)')
+    parser.add_argument('--standings-check', action='store_true',
+                        help='A számolt tabella összevetése az MLSZ tabellájával (utolsó forduló, egy oldal letöltés)')
     parser.add_argument('--all', action='store_true', help='Összes scraper futtatása')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Korábbi szezonok tömeges betöltése a --competition sorozatokból (COPY + merge)')
+    parser.add_argument('--full-roster', action='store_true',
+                        help='Minden játékos adatlapjának letöltése (nem csak az új / hiányos / elavult rekordoké)')
+    parser.add_argument('--rounds', type=parse_rounds, metavar='5-9',
+                        help='Csak ezek a fordulók (célzott újrafeldolgozás), pl. 5-9 vagy 1,3,5-7')
+    parser.add_argument('--since-round', type=int, metavar='N',
+                        help='Meccsek feldolgozása ettől a fordulótól (alapból az első hiányos fordulótól)')
+    parser.add_argument('--competition', action='append', metavar='KEY', dest='competitions',
+                        help='Sorozat kulcsa (pl. nb1-2025-26); többször is megadható, alapértelmezés: DEFAULT_COMPETITION')
     
     # Adatbázis opciók
     parser.add_argument('--init-db', action='store_true', help='Adatbázis inicializálása')
     parser.add_argument('--reset-db', action='store_true', help='Adatbázis teljes resetelése')
+    parser.add_argument('--migrate', action='store_true', help='Adatbázis séma frissítése (Alembic migrációk)')
     parser.add_argument('--setup', action='store_true', help='Teljes setup: adatbázis + összes scraper')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Hosszan futó folyamat ütemezett feladatokkal (meccsek, tabella, cikkek) és állapot végponttal')
+    
+    # Offline újrafeldolgozás
+    parser.add_argument('--replay', action='store_true',
+                        help='Scraperek futtatása az archivált oldalakon, hálózati forgalom nélkül')
+    parser.add_argument('--restart', action='store_true',
+                        help='Megszakadt futás checkpointjainak eldobása, a scraperek elölről kezdenek')
     
     args = parser.parse_args()
     
@@ -106,36 +405,69 @@ def main():
         return
     
     try:
+        if args.replay:
+            enable_replay_mode()
+            logging.info("REPLAY MÓD: az oldalak az archívumból töltődnek")
+            if not has_scraper_flag(args):
+                args.all = True
+        
+        if args.restart:
+            get_shared_frontier().reset()
+            logging.info("Crawl checkpointok törölve")
+        
         if args.reset_db:
             reset_database()
             return
             
+        if args.migrate:
+            migrate_database()
+            if not args.init_db and not has_scraper_flag(args):
+                return
+            
         if args.init_db:
             init_database()
-            if not any([args.teams, args.matches, args.standings, args.articles, args.all, args.setup]):
+            if not has_scraper_flag(args):
                 return
         
+        if not args.setup:
+            check_database_schema()
+        
+        if args.backfill:
+            run_backfill(args.competitions)
+        
         # Setup - adatbázis + összes scraper
         if args.setup:
-            run_complete_setup()
+            run_complete_setup(args.competitions)
+            if not args.daemon:
+                return
+        
+        if args.daemon:
+            run_daemon(args.competitions)
             return
             
         # Scraperek
         if args.all:
-            run_all()
+            run_all(args.competitions)
         else:
             if args.teams:
-                run_teams()
+                run_teams(full_roster=args.full_roster, competition_keys=args.competitions)
             if args.matches:
-                run_matches()
+                run_matches(args.competitions, args.rounds, args.since_round)
+            # A tabella mindig a mentett meccsekből számolódik (a meccsfrissítés után)
             if args.standings:
-                run_standings()
+                run_standings(args.competitions, check=args.standings_check)
+            if args.scrape_standings:
+                run_new_standings(args.competitions)
             if args.articles:
                 run_articles()
                 
     except Exception as e:
         logging.error(f"Hiba történt: {e}")
         sys.exit(1)
+    finally:
+        if not args.daemon:
+            log_fetch_stats()
+            write_metrics()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
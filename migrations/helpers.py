@@ -0,0 +1,12 @@
+from alembic import op
+
+
+def add_unique_constraint(name, table, columns):
+    """Unique constraint only if it does not exist yet (init_db may have created it already)"""
+    op.execute(f"""
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN
+                ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({', '.join(columns)});
+            END IF;
+        END $$;
+    """)
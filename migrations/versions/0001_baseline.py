@@ -0,0 +1,109 @@
+"""Baseline: the original schema (database/schema.sql before migrations were introduced)
+
+Existing deployments created with init_db are stamped at this revision
+(see database.database.upgrade_db) instead of running it.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'teams',
+        sa.Column('team_id', sa.Integer, primary_key=True),
+        sa.Column('name', sa.String(100)),
+        sa.Column('address', sa.String(70)),
+        sa.Column('website', sa.String(255)),
+    )
+    op.create_table(
+        'players',
+        sa.Column('player_id', sa.Integer, primary_key=True),
+        sa.Column('name', sa.String(100)),
+        sa.Column('birth_date', sa.Date),
+        sa.Column('is_injured', sa.Boolean, server_default=sa.false()),
+    )
+    op.create_table(
+        'team_players',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('team_id', sa.Integer, sa.ForeignKey('teams.team_id')),
+        sa.Column('player_id', sa.Integer, sa.ForeignKey('players.player_id')),
+    )
+    op.create_table(
+        'matches',
+        sa.Column('match_id', sa.Integer, primary_key=True),
+        sa.Column('season', sa.String(20)),
+        sa.Column('round', sa.Integer),
+        sa.Column('date', sa.Date),
+        sa.Column('home_team_id', sa.Integer, sa.ForeignKey('teams.team_id')),
+        sa.Column('away_team_id', sa.Integer, sa.ForeignKey('teams.team_id')),
+        sa.Column('home_score', sa.Integer),
+        sa.Column('away_score', sa.Integer),
+        sa.Column('stadium', sa.String(100)),
+        sa.Column('referee', sa.String(100)),
+    )
+    op.create_table(
+        'match_events',
+        sa.Column('event_id', sa.Integer, primary_key=True),
+        sa.Column('match_id', sa.Integer, sa.ForeignKey('matches.match_id')),
+        sa.Column('event_type', sa.String(30)),
+        sa.Column('minute', sa.Integer),
+        sa.Column('player_id', sa.Integer, sa.ForeignKey('players.player_id')),
+        sa.Column('team_id', sa.Integer, sa.ForeignKey('teams.team_id')),
+    )
+    op.create_table(
+        'standings',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('season', sa.String(20)),
+        sa.Column('round', sa.Integer),
+        sa.Column('team_id', sa.Integer, sa.ForeignKey('teams.team_id')),
+        sa.Column('matches_played', sa.Integer),
+        sa.Column('wins', sa.Integer),
+        sa.Column('draws', sa.Integer),
+        sa.Column('losses', sa.Integer),
+        sa.Column('goals_for', sa.Integer),
+        sa.Column('goals_against', sa.Integer),
+        sa.Column('goal_difference', sa.Integer),
+        sa.Column('points', sa.Integer),
+        sa.Column('position', sa.Integer),
+    )
+    op.create_table(
+        'player_stats',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('player_id', sa.Integer, sa.ForeignKey('players.player_id')),
+        sa.Column('team_id', sa.Integer, sa.ForeignKey('teams.team_id')),
+        sa.Column('matches_played', sa.Integer),
+        sa.Column('goals', sa.Integer),
+        sa.Column('own_goals', sa.Integer),
+        sa.Column('yellow_cards', sa.Integer),
+        sa.Column('red_cards', sa.Integer),
+        sa.Column('minutes_played', sa.Integer),
+    )
+    op.create_table(
+        'injury_articles',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('player_id', sa.Integer, sa.ForeignKey('players.player_id')),
+        sa.Column('url', sa.String(500), unique=True, nullable=False),
+        sa.Column('title', sa.String(300)),
+        sa.Column('published_date', sa.Date),
+        sa.Column('scraped_at', sa.DateTime, server_default=sa.func.current_timestamp()),
+        sa.Column('injury_type', sa.String(100)),
+        sa.Column('injury_start', sa.Date),
+        sa.Column('duration', sa.String(100)),
+        sa.Column('needs_manual_check', sa.Boolean, server_default=sa.true()),
+    )
+
+
+def downgrade():
+    for table in ('injury_articles', 'player_stats', 'standings', 'match_events',
+                  'matches', 'team_players', 'players', 'teams'):
+        op.drop_table(table)
@@ -0,0 +1,88 @@
+"""Ingest columns and tables: profile check time, added time, per-match player stats
+
+players.profile_checked_at, match_events.added_time, the player_match_stats fact
+table with the player_season_stats materialized view, and the unique constraints
+behind the batch upserts (standings, team_players).
+
+Every step is idempotent: databases created with init_db may already have some
+of these objects.
+
+Revision ID: 0002_ingest_tables
+Revises: 0001_baseline
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from migrations.helpers import add_unique_constraint
+
+
+revision = '0002_ingest_tables'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of the view as of this revision (the application constant may change later)
+PLAYER_SEASON_STATS_VIEW = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS player_season_stats AS
+SELECT
+    m.season,
+    pms.player_id,
+    pms.team_id,
+    COUNT(*) AS matches_played,
+    COUNT(*) FILTER (WHERE pms.is_starter) AS matches_started,
+    SUM(pms.minutes_played) AS minutes_played,
+    SUM(pms.goals) AS goals,
+    SUM(pms.own_goals) AS own_goals,
+    SUM(pms.yellow_cards) AS yellow_cards,
+    SUM(pms.red_cards) AS red_cards
+FROM player_match_stats pms
+JOIN matches m ON m.match_id = pms.match_id
+GROUP BY m.season, pms.player_id, pms.team_id
+"""
+
+
+def upgrade():
+    op.execute("ALTER TABLE players ADD COLUMN IF NOT EXISTS profile_checked_at TIMESTAMP")
+    op.execute("ALTER TABLE match_events ADD COLUMN IF NOT EXISTS added_time INT DEFAULT 0")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS player_match_stats (
+            id SERIAL PRIMARY KEY,
+            match_id INT NOT NULL REFERENCES matches(match_id),
+            player_id INT NOT NULL REFERENCES players(player_id),
+            team_id INT REFERENCES teams(team_id),
+            is_starter BOOLEAN DEFAULT FALSE,
+            minutes_played INT DEFAULT 0,
+            goals INT DEFAULT 0,
+            own_goals INT DEFAULT 0,
+            yellow_cards INT DEFAULT 0,
+            red_cards INT DEFAULT 0,
+            CONSTRAINT uq_player_match_stats_match_player UNIQUE (match_id, player_id)
+        )
+    """)
+    op.execute(PLAYER_SEASON_STATS_VIEW)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_player_season_stats "
+               "ON player_season_stats (season, player_id, team_id)")
+
+    # Korábbi duplikátumok törlése a unique constraintek előtt
+    # (tabella: a legutóbb írt sor marad; játékos-csapat kapcsolat: az első marad)
+    op.execute("""
+        DELETE FROM standings a USING standings b
+        WHERE a.season = b.season AND a.round = b.round AND a.team_id = b.team_id AND a.id < b.id
+    """)
+    op.execute("""
+        DELETE FROM team_players a USING team_players b
+        WHERE a.team_id = b.team_id AND a.player_id = b.player_id AND a.id > b.id
+    """)
+    add_unique_constraint('uq_standings_season_round_team', 'standings', ('season', 'round', 'team_id'))
+    add_unique_constraint('uq_team_players_team_player', 'team_players', ('team_id', 'player_id'))
+
+
+def downgrade():
+    op.execute("ALTER TABLE team_players DROP CONSTRAINT IF EXISTS uq_team_players_team_player")
+    op.execute("ALTER TABLE standings DROP CONSTRAINT IF EXISTS uq_standings_season_round_team")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS player_season_stats")
+    op.execute("DROP TABLE IF EXISTS player_match_stats")
+    op.execute("ALTER TABLE match_events DROP COLUMN IF EXISTS added_time")
+    op.execute("ALTER TABLE players DROP COLUMN IF EXISTS profile_checked_at")
@@ -0,0 +1,70 @@
+"""Indexes and unique constraints for the hot lookup paths
+
+- functional upper(trim(name)) indexes for team / player name lookups
+- unique (season, round, home_team_id, away_team_id, date) on matches
+  (duplicate check + per-round counts)
+- unique (player_id, team_id) on player_stats
+- foreign key indexes used by event replacement, squads and injury lookups
+
+Existing duplicates are removed first (the earliest match / stats row is kept).
+
+Revision ID: 0003_lookup_indexes
+Revises: 0002_ingest_tables
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from migrations.helpers import add_unique_constraint
+
+
+revision = '0003_lookup_indexes'
+down_revision = '0002_ingest_tables'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    'ix_teams_name_normalized': 'teams (upper(trim(name)))',
+    'ix_players_name_normalized': 'players (upper(trim(name)))',
+    'ix_team_players_player_id': 'team_players (player_id)',
+    'ix_match_events_match_id': 'match_events (match_id)',
+    'ix_match_events_player_id': 'match_events (player_id)',
+    'ix_player_match_stats_player_id': 'player_match_stats (player_id)',
+    'ix_injury_articles_player_id': 'injury_articles (player_id)',
+}
+
+
+def upgrade():
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+    # Duplikált meccsek (párhuzamos futásokból): az első marad, a többi eseményeivel együtt törlődik
+    op.execute("""
+        CREATE TEMP TABLE duplicate_matches ON COMMIT DROP AS
+        SELECT match_id FROM (
+            SELECT match_id, MIN(match_id) OVER (
+                PARTITION BY season, round, home_team_id, away_team_id, date
+            ) AS keep_id
+            FROM matches
+        ) t
+        WHERE match_id <> keep_id
+    """)
+    op.execute("DELETE FROM match_events WHERE match_id IN (SELECT match_id FROM duplicate_matches)")
+    op.execute("DELETE FROM player_match_stats WHERE match_id IN (SELECT match_id FROM duplicate_matches)")
+    op.execute("DELETE FROM matches WHERE match_id IN (SELECT match_id FROM duplicate_matches)")
+    add_unique_constraint('uq_matches_season_round_teams_date', 'matches',
+                          ('season', 'round', 'home_team_id', 'away_team_id', 'date'))
+
+    # A player_stats a következő frissítéskor úgyis újraépül a meccs statisztikákból
+    op.execute("""
+        DELETE FROM player_stats a USING player_stats b
+        WHERE a.player_id = b.player_id AND a.team_id = b.team_id AND a.id > b.id
+    """)
+    add_unique_constraint('uq_player_stats_player_team', 'player_stats', ('player_id', 'team_id'))
+
+
+def downgrade():
+    op.execute("ALTER TABLE player_stats DROP CONSTRAINT IF EXISTS uq_player_stats_player_team")
+    op.execute("ALTER TABLE matches DROP CONSTRAINT IF EXISTS uq_matches_season_round_teams_date")
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,46 @@
+"""Rewrite the old "2024/2025" match season label to the registry label "2025/26"
+
+Before the competition registry the match scraper wrote "2024/2025" for the
+adatbank season 65, while standings already used "2025/26" for the same season.
+The registry writes "2025/26" everywhere, so the old rows are relabelled to be
+recognized as existing. Matches that were already ingested again under the new
+label keep the new row; the old duplicate is removed with its events and stats.
+
+Revision ID: 0004_season_label
+Revises: 0003_lookup_indexes
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = '0004_season_label'
+down_revision = '0003_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+OLD_LABEL = '2024/2025'
+NEW_LABEL = '2025/26'
+
+
+def upgrade():
+    op.execute(f"""
+        CREATE TEMP TABLE relabelled_duplicates ON COMMIT DROP AS
+        SELECT old.match_id
+        FROM matches old
+        JOIN matches new
+          ON new.season = '{NEW_LABEL}' AND new.round = old.round AND new.date = old.date
+         AND new.home_team_id = old.home_team_id AND new.away_team_id = old.away_team_id
+        WHERE old.season = '{OLD_LABEL}'
+    """)
+    op.execute("DELETE FROM match_events WHERE match_id IN (SELECT match_id FROM relabelled_duplicates)")
+    op.execute("DELETE FROM player_match_stats WHERE match_id IN (SELECT match_id FROM relabelled_duplicates)")
+    op.execute("DELETE FROM matches WHERE match_id IN (SELECT match_id FROM relabelled_duplicates)")
+    op.execute(f"UPDATE matches SET season = '{NEW_LABEL}' WHERE season = '{OLD_LABEL}'")
+    # A szezon összesítők a meccs szezon címkéjét használják
+    op.execute("REFRESH MATERIALIZED VIEW player_season_stats")
+
+
+def downgrade():
+    # A régi címkéjű sorok az átírás után nem különböztethetők meg, így nincs mit visszaállítani
+    pass
@@ -0,0 +1,36 @@
+"""Name lookup indexes on the normalize_name expression
+
+Name lookups (identity resolver, backfill merge, get_team_by_name) now match on
+upper(trim(regexp_replace(name, '\s+', ' ', 'g'))), the SQL form of Python's
+normalize_name, which also collapses inner whitespace. The functional indexes
+from 0003 are rebuilt on that expression.
+
+Revision ID: 0005_name_key_indexes
+Revises: 0004_season_label
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = '0005_name_key_indexes'
+down_revision = '0004_season_label'
+branch_labels = None
+depends_on = None
+
+
+NAME_KEY = r"upper(trim(regexp_replace(name, '\s+', ' ', 'g')))"
+OLD_NAME_KEY = "upper(trim(name))"
+
+
+def _rebuild(expression):
+    for name, table in (('ix_teams_name_normalized', 'teams'), ('ix_players_name_normalized', 'players')):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+        op.execute(f"CREATE INDEX {name} ON {table} ({expression})")
+
+
+def upgrade():
+    _rebuild(NAME_KEY)
+
+
+def downgrade():
+    _rebuild(OLD_NAME_KEY)
@@ -0,0 +1,69 @@
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+
+from monitoring.metrics import REGISTRY
+
+
+HEALTH_PORT = int(os.getenv('DAEMON_HEALTH_PORT', '8080'))
+
+
+class HealthServer:
+    """
+    A daemon állapot végpontjai egy háttérszálon (http.server).
+
+    GET /health  - 200, ha az ütemező él, egyébként 503 (konténer healthcheck)
+    GET /status  - feladatonkénti állapot JSON-ben (utolsó / következő futás, hibák)
+    GET /metrics - a folyamat metrikái Prometheus formátumban
+
+    Args:
+        status: status() - az állapot szótár; a "status" kulcs "ok" értéke jelenti az egészséges állapotot
+        port: Figyelt port
+    """
+
+    def __init__(self, status: Callable[[], Dict], port: int = HEALTH_PORT):
+        self.status = status
+        self.port = port
+        self._server = None
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path == "/health":
+                    healthy = server.status().get("status") == "ok"
+                    self._send(200 if healthy else 503, "application/json",
+                               json.dumps({"status": "ok" if healthy else "unhealthy"}))
+                elif path == "/status":
+                    self._send(200, "application/json", json.dumps(server.status(), ensure_ascii=False, indent=2))
+                elif path == "/metrics":
+                    self._send(200, "text/plain; version=0.0.4", REGISTRY.render_prometheus())
+                else:
+                    self._send(404, "application/json", json.dumps({"error": "not found"}))
+
+            def _send(self, code: int, content_type: str, body: str):
+                data = body.encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                # A healthcheck percenkénti kérései ne töltsék tele a logot
+                pass
+
+        self._server = ThreadingHTTPServer(("0.0.0.0", self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="health", daemon=True).start()
+        logging.info(f"Állapot végpont: http://0.0.0.0:{self.port}/health, /status, /metrics")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
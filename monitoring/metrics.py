@@ -0,0 +1,244 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+METRICS_DIR = os.getenv('METRICS_TEXTFILE_DIR', 'metrics')
+METRICS_PREFIX = 'mlsz_scraper'
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Az aktuális futási szakasz (teams / matches / standings / articles).
+# ContextVar, így a fetch engine event loopjában futó taskok is öröklik.
+_current_stage: contextvars.ContextVar[str] = contextvars.ContextVar('stage', default='none')
+
+
+def current_stage() -> str:
+    return _current_stage.get()
+
+
+def set_stage(name: str):
+    """Szakasz beállítása az aktuális kontextusban (pl. egy asyncio task elején)."""
+    return _current_stage.set(name)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, key)), "value": value}
+                    for key, value in sorted(self.values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # kulcs -> (bucketenkénti darabszám, összeg, darabszám)
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self.values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self.values.items()):
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    le = _format_labels(self.labelnames, key, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{le} {bucket_count}")
+                inf = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total:g}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, key)), "count": count, "sum": total}
+                    for key, (_, total, count) in sorted(self.values.items())]
+
+
+class MetricsRegistry:
+    """A futás összes metrikája; Prometheus textfile és JSON összesítő formában exportálható."""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(f"{METRICS_PREFIX}_{name}", help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(f"{METRICS_PREFIX}_{name}", help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(f"{METRICS_PREFIX}_{name}", help_text, labelnames, buckets))
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict:
+        """Szakaszonkénti összesítő: minden metrika a 'stage' címke szerint csoportosítva."""
+        stages: Dict[str, Dict] = {}
+        for metric in self.metrics.values():
+            short_name = metric.name[len(METRICS_PREFIX) + 1:]
+            for item in metric.snapshot():
+                labels = dict(item["labels"])
+                stage_name = labels.pop("stage", "none")
+                entry = {k: v for k, v in item.items() if k != "labels"}
+                if labels:
+                    entry["labels"] = labels
+                stages.setdefault(stage_name, {}).setdefault(short_name, []).append(entry)
+        return {"generated_at": time.time(), "stages": stages}
+
+
+REGISTRY = MetricsRegistry()
+
+FETCH_DURATION = REGISTRY.histogram('fetch_duration_seconds', 'HTTP kérések késleltetése', ['stage', 'host', 'status'])
+FETCH_REQUESTS = REGISTRY.counter('fetch_requests_total', 'Kiszolgált oldalak forrás szerint (network/cache/replay)',
+                                  ['stage', 'host', 'source'])
+FETCH_BYTES = REGISTRY.counter('fetch_bytes_total', 'Hálózatról letöltött bájtok', ['stage', 'host'])
+FETCH_RETRIES = REGISTRY.counter('fetch_retries_total', 'Újrapróbált kérések', ['stage', 'host'])
+LLM_DURATION = REGISTRY.histogram('llm_duration_seconds', 'Ollama lekérdezések késleltetése (sikertelenek is)',
+                                  ['stage', 'model', 'status'],
+                                  buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0))
+LLM_TOKENS = REGISTRY.counter('llm_tokens_total', 'LLM tokenek (prompt / completion)', ['stage', 'model', 'kind'])
+IDENTITY_LOOKUPS = REGISTRY.counter('identity_lookups_total', 'Csapat / játékos azonosító feloldások (hit / miss)',
+                                    ['stage', 'kind', 'result'])
+PIPELINE_ITEMS = REGISTRY.counter('pipeline_items_total', 'Pipeline lépések által feldolgozott elemek (ok / error)',
+                                  ['stage', 'step', 'result'])
+PIPELINE_ITEM_SECONDS = REGISTRY.histogram('pipeline_item_seconds', 'Egy elem feldolgozási ideje pipeline lépésenként',
+                                           ['stage', 'step'])
+DB_ROWS = REGISTRY.counter('db_rows_written_total', 'Adatbázisba írt sorok táblánként', ['stage', 'table'])
+STAGE_DURATION = REGISTRY.gauge('stage_duration_seconds', 'Futási szakasz időtartama', ['stage'])
+STAGE_SUCCESS = REGISTRY.gauge('stage_success', 'Futási szakasz sikeres volt-e (1/0)', ['stage'])
+SCHEDULED_RUNS = REGISTRY.counter('scheduled_runs_total', 'Daemon ütemezett futások (ok / failed / overlap)',
+                                  ['job', 'result'])
+RUN_TIMESTAMP = REGISTRY.gauge('last_run_timestamp_seconds', 'Az utolsó futás vége (unix idő)', ['job'])
+
+
+def record_rows(table: str, count: int = 1):
+    """Adatbázisba írt sorok számlálása az aktuális szakaszhoz."""
+    if count:
+        DB_ROWS.inc(count, stage=current_stage(), table=table)
+
+
+@contextmanager
+def stage(name: str):
+    """Futási szakasz: a benne keletkező metrikák ezzel a 'stage' címkével kerülnek rögzítésre."""
+    token = _current_stage.set(name)
+    start = time.perf_counter()
+    success = 0
+    try:
+        yield
+        success = 1
+    finally:
+        STAGE_DURATION.set(time.perf_counter() - start, stage=name)
+        STAGE_SUCCESS.set(success, stage=name)
+        _current_stage.reset(token)
+
+
+def write_metrics(directory: Optional[str] = None, job: Optional[str] = None) -> Optional[str]:
+    """
+    A metrikák kiírása Prometheus textfile-ként és JSON összesítőként (atomikus cserével).
+
+    A fájlnév a futásban szereplő szakaszokból képzett job névből áll (pl.
+    mlsz_scraper_matches.prom), így a cron által külön indított futások nem
+    írják felül egymás eredményeit. A daemon fix job nevet ad meg, így a futások
+    során gyűlő szakaszok mindig ugyanazt a fájlt frissítik. Ha egy szakasz sem
+    futott, nem ír semmit.
+    """
+    stages = sorted({key[0] for key in STAGE_DURATION.values})
+    if not stages:
+        return None
+    job = job or "_".join(stages)
+
+    directory = directory or METRICS_DIR
+    os.makedirs(directory, exist_ok=True)
+    RUN_TIMESTAMP.set(time.time(), job=job)
+
+    outputs = {
+        f"{METRICS_PREFIX}_{job}.prom": REGISTRY.render_prometheus(),
+        f"{METRICS_PREFIX}_{job}_summary.json": json.dumps(REGISTRY.summary(), ensure_ascii=False, indent=2),
+    }
+    for filename, content in outputs.items():
+        path = os.path.join(directory, filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    return job
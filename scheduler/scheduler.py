@@ -0,0 +1,240 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from monitoring.metrics import SCHEDULED_RUNS
+
+
+class CronSchedule:
+    """
+    Crontab formátumú ütemezés (perc óra nap hónap hét_napja).
+
+    Mezőnként támogatott: *, */n, szám, tartomány (a-b, a-b/n) és vesszős lista.
+    A hét napja 0-7 (0 és 7 is vasárnap). Ha a nap és a hét napja is meg van adva,
+    bármelyik egyezése elég (mint a cronban).
+    """
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Érvénytelen cron kifejezés (5 mező kell): {expression!r}")
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse_field(part, low, high) for part, (low, high) in zip(parts, self.FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(","):
+            value_range, _, step = part.partition("/")
+            if value_range == "*":
+                start, end = low, high
+            elif "-" in value_range:
+                start, end = (int(v) for v in value_range.split("-", 1))
+            else:
+                start = end = int(value_range)
+                if step:
+                    end = high
+            if not low <= start <= end <= high:
+                raise ValueError(f"Érvénytelen cron mező: {field!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def matches(self, moment: datetime) -> bool:
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months and self._day_matches(moment))
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        """A következő egyező perc a megadott időpont után (legfeljebb egy éven belül)"""
+        day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(367):
+            if day.month in self.months and self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate > moment:
+                            return candidate
+            day += timedelta(days=1)
+        return None
+
+
+class Job:
+    """
+    Egy ütemezett feladat.
+
+    Args:
+        name: Feladat neve (log, státusz, metrikák)
+        func: A futtatandó függvény (argumentum nélkül)
+        schedule: Cron kifejezés
+        waits_for: Feladatok, amelyek futása alatt ez nem indul el, hanem megvárja őket
+            (pl. a tabella számolás a még futó meccsfrissítést)
+    """
+
+    def __init__(self, name: str, func: Callable[[], None], schedule: str, waits_for: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.schedule = CronSchedule(schedule)
+        self.waits_for = tuple(waits_for)
+        self.lock = threading.Lock()
+        self.pending = False
+        self.runs = 0
+        self.failures = 0
+        self.last_started: Optional[datetime] = None
+        self.last_finished: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.last_status: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self.lock.locked()
+
+    def status(self, now: datetime) -> Dict:
+        next_run = self.schedule.next_after(now)
+        return {
+            "schedule": self.schedule.expression,
+            "running": self.running,
+            "pending": self.pending,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started": self.last_started.isoformat(timespec="seconds") if self.last_started else None,
+            "last_finished": self.last_finished.isoformat(timespec="seconds") if self.last_finished else None,
+            "last_duration": round(self.last_duration, 1) if self.last_duration is not None else None,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "next_run": next_run.isoformat(timespec="seconds") if next_run else None,
+        }
+
+
+class Scheduler:
+    """
+    Folyamaton belüli ütemező: percenként megnézi, mely feladatok esedékesek, és
+    külön szálon elindítja őket.
+
+    Átfedés védelem: egy feladat nem indul el újra, amíg az előző futása tart (az
+    esedékesség ilyenkor kimarad, és a log jelzi). A waits_for feladatok futása
+    alatt az esedékes feladat várakozik, és azok végeztével indul.
+
+    Args:
+        jobs: A feladatok
+        after_run: after_run(job) - minden futás után meghívódik (pl. metrikák kiírása)
+    """
+
+    def __init__(self, jobs: List[Job], after_run: Optional[Callable[[Job], None]] = None):
+        self.jobs = {job.name: job for job in jobs}
+        self.after_run = after_run
+        self.started_at: Optional[datetime] = None
+        self.last_tick: Optional[datetime] = None
+        self._stop = threading.Event()
+        # Egy futás vége felébreszti az ütemezőt (a rá váró feladatok azonnal indulhatnak)
+        self._wake = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max(len(jobs), 1), thread_name_prefix="job")
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.started_at = datetime.now()
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._executor.shutdown(wait=False)
+
+    def wait(self):
+        """Blokkol, amíg az ütemező le nem áll."""
+        while self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def _loop(self):
+        last_minute = None
+        while not self._stop.is_set():
+            now = datetime.now()
+            minute = now.replace(second=0, microsecond=0)
+            self.last_tick = now
+            if minute != last_minute:
+                last_minute = minute
+                for job in self.jobs.values():
+                    if job.schedule.matches(minute):
+                        if job.running:
+                            logging.warning(f"[{job.name}] esedékes, de az előző futás még tart - kihagyva")
+                            SCHEDULED_RUNS.inc(job=job.name, result="overlap")
+                        else:
+                            job.pending = True
+            for job in self.jobs.values():
+                if job.pending:
+                    self._try_start(job)
+            self._wake.wait(max(1.0, 60 - datetime.now().second))
+            self._wake.clear()
+
+    def _try_start(self, job: Job) -> bool:
+        blocking = [name for name in job.waits_for if self.jobs[name].running]
+        if blocking:
+            return False
+        if not job.lock.acquire(blocking=False):
+            return False
+        job.pending = False
+        try:
+            self._executor.submit(self._run, job)
+        except RuntimeError:
+            # Leállás közben már nem indul új futás
+            job.lock.release()
+            return False
+        return True
+
+    def _run(self, job: Job):
+        job.last_started = datetime.now()
+        start = time.perf_counter()
+        logging.info(f"[{job.name}] ütemezett futás indul")
+        try:
+            job.func()
+            job.last_status = "ok"
+            job.last_error = None
+        except Exception as e:
+            job.last_status = "failed"
+            job.last_error = str(e)
+            job.failures += 1
+            logging.error(f"[{job.name}] ütemezett futás sikertelen: {e}")
+        finally:
+            job.runs += 1
+            job.last_duration = time.perf_counter() - start
+            job.last_finished = datetime.now()
+            SCHEDULED_RUNS.inc(job=job.name, result=job.last_status)
+            logging.info(f"[{job.name}] futás vége ({job.last_status}, {job.last_duration:.1f}s)")
+            try:
+                if self.after_run is not None:
+                    self.after_run(job)
+            except Exception as e:
+                logging.error(f"[{job.name}] futás utáni lépés sikertelen: {e}")
+            finally:
+                job.lock.release()
+                self._wake.set()
+
+    def status(self) -> Dict:
+        now = datetime.now()
+        return {
+            "status": "ok" if self.alive else "stopped",
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "last_tick": self.last_tick.isoformat(timespec="seconds") if self.last_tick else None,
+            "jobs": {name: job.status(now) for name, job in self.jobs.items()},
+        }
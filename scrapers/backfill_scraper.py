@@ -0,0 +1,84 @@
+from typing import List, Optional
+from scrapers.base_scraper import BaseScraper
+from scrapers.competitions import Competition, get_competitions
+from scrapers.match_scraper import MatchAndMatchEventScraper
+from scrapers.standing_scraper import StandingScraper
+from database.backfill import SeasonBatch, load_season_batch
+from database.db_operations import refresh_player_stats
+
+
+class SeasonBackfillScraper(BaseScraper):
+    """
+    Korábbi szezonok tömeges betöltése (python main.py --backfill).
+
+    Szezononként letölti az összes lejátszott forduló oldalt és meccs részletes
+    oldalt, a meccseket, eseményeket, játékos statisztikákat és tabellákat egy
+    memóriabeli batch-be gyűjti, majd egyetlen tranzakcióban tölti be: COPY a
+    staging táblákba, utána halmazalapú merge (database/backfill.py). A hiányzó
+    csapatok és játékosok a merge során jönnek létre.
+
+    A checkpoint egysége a szezon: megszakadt futás után a már betöltött
+    szezonok kimaradnak, a félbemaradt szezon elölről (a HTTP cache-ből) töltődik.
+    """
+
+    def __init__(self, competitions: Optional[List[Competition]] = None):
+        super().__init__()
+        self.competitions = competitions or get_competitions()
+        self.match_scrapers = {
+            c.key: MatchAndMatchEventScraper(competition=c, incremental=False, engine=self.engine,
+                                             frontier=self.frontier, identity=self.identity)
+            for c in self.competitions
+        }
+        self.standing_scrapers = {
+            c.key: StandingScraper(competition=c, engine=self.engine, frontier=self.frontier, identity=self.identity)
+            for c in self.competitions
+        }
+
+    def collect_season(self, competition: Competition) -> SeasonBatch:
+        """Egy szezon összes lejátszott fordulójának letöltése és kinyerése egy batch-be."""
+        batch = SeasonBatch(competition.season_label)
+        match_scraper = self.match_scrapers[competition.key]
+        standing_scraper = self.standing_scrapers[competition.key]
+
+        for round_number in competition.round_numbers():
+            soup = self.get_soup(competition.round_url(round_number))
+            matches = match_scraper._parse_round_listing(soup)
+            if not matches:
+                print(f"{competition.name}: {round_number}. forduló még nincs lejátszva, szezon vége")
+                break
+
+            # Minden meccs részletes oldala kell (forduló szinten párhuzamosan letöltve)
+            match_scraper._attach_match_details(matches)
+            for m in matches:
+                # Részletek nélküli meccs nem kerül be; a forduló hiányos marad, az inkrementális futás pótolja
+                if m["details_fetched"]:
+                    batch.add_match(round_number, m)
+            if competition.has_standings:
+                batch.add_standings(round_number, standing_scraper._parse_round_table(soup, round_number))
+            print(f"{competition.name}: {round_number}. forduló kinyerve ({len(matches)} meccs)")
+
+        return batch
+
+    def backfill(self):
+        """A sorozatok betöltése szezononként, majd az összesítők újraszámolása."""
+        units = [(c.round_url(1), c) for c in self.competitions]
+        self.run_checkpointed("backfill", units, self._backfill_season)
+
+        rows = refresh_player_stats()
+        print(f"Játékos összesítők frissítve ({rows} sor)")
+        # A merge által létrehozott csapatok és játékosok a következő kereséskor töltődnek be
+        self.identity.reset()
+
+    def _backfill_season(self, competition: Competition):
+        batch = self.collect_season(competition)
+        if not batch.matches:
+            print(f"{competition.name}: nincs betölthető meccs")
+            return
+        written = load_season_batch(batch)
+        summary = ", ".join(f"{table}: {count}" for table, count in written.items())
+        print(f"{competition.name} ({competition.season_label}) betöltve - {summary}")
+
+
+if __name__ == "__main__":
+    scraper = SeasonBackfillScraper()
+    scraper.backfill()
@@ -1,38 +1,90 @@
-import requests
+from typing import Any, Callable, List, Optional, Tuple
 from bs4 import BeautifulSoup
-import time
+from scrapers.crawl_frontier import CrawlFrontier, get_shared_frontier
+from scrapers.fetch_engine import FetchEngine, get_shared_engine
+from scrapers.html_parser import parse_html
+from database.identity import IdentityResolver, get_shared_resolver
 
 class BaseScraper:
     BASE_URL = "https://adatbank.mlsz.hu/"
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, engine: Optional[FetchEngine] = None, parser_backend: Optional[str] = None,
+                 frontier: Optional[CrawlFrontier] = None, identity: Optional[IdentityResolver] = None):
+        # HTML parser backend (None = HTML_PARSER környezeti változó)
+        self.parser_backend = parser_backend
+        # Az összes scraper egy közös, hostonként rate limitelt klienst használ
+        self.engine = engine or get_shared_engine()
+        # Megszakadt futások folytatásához
+        self.frontier = frontier or get_shared_frontier()
+        # Csapat / játékos azonosítók memóriában (első feloldáskor töltődik be)
+        self.identity = identity or get_shared_resolver()
+        self.headers = {
             'User-Agent': 'MLSZ-Scraper/1.0 (University Project; Budapest; borcsiczkypatrik@gmail.com)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'hu-HU,hu;q=0.9,en;q=0.8',
             'Connection': 'keep-alive',
-        })
+        }
+
+    def _full_url(self, url: str) -> str:
+        return url if url.startswith("http") else self.BASE_URL + url
 
     def get_soup(self, url: str, delay: float = 4.0, max_retries: int = 3) -> BeautifulSoup:
-        """Letölti és feldolgozza a HTML-t retry-vel"""
-        full_url = url if url.startswith("http") else self.BASE_URL + url
-        
-        for attempt in range(max_retries):
+        """
+        Letölti és feldolgozza a HTML-t retry-vel.
+
+        A kérések ütemezését a fetch engine hostonkénti token bucketje végzi,
+        a `delay` már csak az újrapróbálkozások közötti várakozás alapja.
+        """
+        return parse_html(self.get_html(url, delay, max_retries), self.parser_backend)
+
+    def get_html(self, url: str, delay: float = 4.0, max_retries: int = 3, fresh: bool = False) -> str:
+        """
+        Letölti a HTML-t retry-vel, feldolgozás nélkül (pl. külön pipeline lépésben parse-oláshoz).
+
+        fresh=True: a HTTP cache TTL-je helyett a szerverről kérjük le (megváltozott oldal).
+        """
+        resp = self.engine.fetch(self._full_url(url), headers=self.headers, max_retries=max_retries,
+                                 backoff=delay, fresh=fresh)
+        return resp.text
+
+    def get_soups(self, urls: List[str], delay: float = 4.0, max_retries: int = 3,
+                  fresh: bool = False) -> List[Optional[BeautifulSoup]]:
+        """Több oldal párhuzamos letöltése és feldolgozása; sikertelen letöltés helyén None (fresh: lásd get_html)."""
+        full_urls = [self._full_url(url) for url in urls]
+        results = self.engine.fetch_many(full_urls, headers=self.headers, max_retries=max_retries, backoff=delay,
+                                         fresh=fresh)
+
+        soups = []
+        for url, resp in zip(full_urls, results):
+            if isinstance(resp, Exception):
+                print(f"Letöltés sikertelen: {url} - {resp}")
+                soups.append(None)
+            else:
+                soups.append(parse_html(resp.text, self.parser_backend))
+        return soups
+
+    def run_checkpointed(self, stage: str, units: List[Tuple[str, Any]], process: Callable[[Any], Optional[bool]]):
+        """
+        Egységek (URL + adat) feldolgozása a crawl frontier checkpointjaival.
+
+        Egy megszakadt futás után a már elkészült egységek kimaradnak. Ha a
+        `process` False-t ad vissza (pl. még le nem játszott forduló), a szakasz
+        véget ér, és az az egység nem számít elkészültnek.
+        """
+        self.frontier.begin(stage)
+        self.frontier.plan(stage, [url for url, _ in units])
+
+        for url, item in units:
+            if self.frontier.should_skip(stage, url):
+                continue
             try:
-                time.sleep(delay)
-                resp = self.session.get(full_url, timeout=30)
-                resp.raise_for_status()
-                resp.encoding = 'utf-8'
-                return BeautifulSoup(resp.text, "html.parser")
-                
-            except requests.exceptions.RequestException as e:
-                if attempt < max_retries - 1:
-                    wait_time = delay * (attempt + 1)
-                    print(f"Próbálkozás {attempt + 1}/{max_retries} sikertelen, várok {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"Minden {max_retries} próbálkozás sikertelen: {e}")
-                    raise
-        
-        raise Exception("Elértük a maximális próbálkozások számát")
\ No newline at end of file
+                result = process(item)
+            except Exception:
+                self.frontier.mark_failed(stage, url)
+                raise
+            if result is False:
+                break
+            self.frontier.mark_done(stage, url)
+            self.frontier.set_checkpoint(stage, "last_done", url)
+
+        self.frontier.finish(stage)
@@ -0,0 +1,94 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+
+MLSZ_BASE_URL = "https://adatbank.mlsz.hu/"
+
+# További sorozatok JSON fájlból is felvehetők (ugyanazokkal a mezőkkel, mint a Competition)
+COMPETITIONS_FILE = os.getenv('COMPETITIONS_FILE', '')
+DEFAULT_COMPETITION = os.getenv('DEFAULT_COMPETITION', 'nb1-2025-26')
+
+
+class Competition:
+    """
+    Egy MLSZ adatbank sorozat (bajnokság / kupa egy adott szezonban).
+
+    Args:
+        key: Rövid azonosító a CLI-hez (pl. "nb1-2025-26")
+        name: Megjelenítendő név
+        league_id: Az adatbank liga azonosító (az URL-ben: league/{season_id}/0/{league_id}/...)
+        season_id: Az adatbank szezon azonosító
+        season_label: Az adatbázisba írt szezon címke (pl. "2025/26")
+        rounds: Fordulók száma
+        matches_per_round: Meccsek száma egy teljes fordulóban
+        discovery_club_id: Egy klub azonosítója, aminek az oldalán a sorozat összes csapata szerepel
+        discovery_round: A csapatlistához használt forduló
+        has_standings: Van-e tabella a forduló oldalakon (kupában nincs)
+    """
+
+    def __init__(self, key: str, name: str, league_id: int, season_id: int, season_label: str,
+                 rounds: int, matches_per_round: int, discovery_club_id: Optional[int] = None,
+                 discovery_round: int = 1, has_standings: bool = True):
+        self.key = key
+        self.name = name
+        self.league_id = league_id
+        self.season_id = season_id
+        self.season_label = season_label
+        self.rounds = rounds
+        self.matches_per_round = matches_per_round
+        self.discovery_club_id = discovery_club_id
+        self.discovery_round = discovery_round
+        self.has_standings = has_standings
+
+    def round_url(self, round_number: int) -> str:
+        return f"{MLSZ_BASE_URL}league/{self.season_id}/0/{self.league_id}/{round_number}.html"
+
+    def club_discovery_url(self) -> Optional[str]:
+        if self.discovery_club_id is None:
+            return None
+        return f"club/{self.season_id}/0/{self.league_id}/{self.discovery_round}/{self.discovery_club_id}.html"
+
+    def round_numbers(self) -> range:
+        return range(1, self.rounds + 1)
+
+    def __repr__(self):
+        return f"<Competition({self.key}, league={self.league_id}, season={self.season_label})>"
+
+
+COMPETITIONS: Dict[str, Competition] = {
+    "nb1-2025-26": Competition(
+        key="nb1-2025-26",
+        name="NB I 2025/26",
+        league_id=31362,
+        season_id=65,
+        season_label="2025/26",
+        rounds=33,
+        matches_per_round=6,
+        discovery_club_id=307004,  # DVSC oldal (de tartalmazza az összes csapatot)
+        discovery_round=11,
+    ),
+}
+
+
+def _load_competitions_file(path: str):
+    with open(path, encoding="utf-8") as f:
+        for item in json.load(f):
+            competition = Competition(**item)
+            COMPETITIONS[competition.key] = competition
+
+
+if COMPETITIONS_FILE:
+    _load_competitions_file(COMPETITIONS_FILE)
+
+
+def get_competition(key: Optional[str] = None) -> Competition:
+    key = key or DEFAULT_COMPETITION
+    if key not in COMPETITIONS:
+        raise KeyError(f"Ismeretlen sorozat: {key} (elérhető: {', '.join(sorted(COMPETITIONS))})")
+    return COMPETITIONS[key]
+
+
+def get_competitions(keys: Optional[List[str]] = None) -> List[Competition]:
+    return [get_competition(key) for key in (keys or [DEFAULT_COMPETITION])]
+
@@ -0,0 +1,178 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+FRONTIER_PATH = os.getenv('CRAWL_FRONTIER_PATH', '.cache/frontier.sqlite')
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class CrawlFrontier:
+    """
+    Perzisztens crawl frontier checkpointokkal (helyi SQLite fájl).
+
+    Szakaszonként (pl. teams, matches) nyilvántartja a tervezett URL-eket és
+    állapotukat (pending / done / failed). Ha egy szakasz futása megszakad,
+    a következő futás onnan folytatja, ahol az előző abbamaradt; sikeres
+    befejezés után a következő futás tiszta lappal indul.
+    """
+
+    def __init__(self, path: str = FRONTIER_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.skipped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                stage TEXT NOT NULL,
+                url TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (stage, url)
+            );
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (stage, key)
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                stage TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            );
+        """)
+        self._conn.commit()
+
+    def _execute(self, query: str, params=()):
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            self._conn.commit()
+            return cursor
+
+    def begin(self, stage: str) -> bool:
+        """
+        Szakasz indítása.
+
+        Returns:
+            True, ha egy megszakadt futást folytatunk, False, ha új futás indul
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT finished_at FROM runs WHERE stage = ?", (stage,)).fetchone()
+        self.skipped[stage] = 0
+
+        if row is not None and row[0] is None:
+            counts = self.counts(stage)
+            print(f"[{stage}] Megszakadt futás folytatása: {counts.get(DONE, 0)} kész, "
+                  f"{counts.get(PENDING, 0)} függő, {counts.get(FAILED, 0)} hibás oldal")
+            return True
+
+        self.reset(stage)
+        self._execute("INSERT OR REPLACE INTO runs (stage, started_at, finished_at) VALUES (?, ?, NULL)",
+                      (stage, time.time()))
+        return False
+
+    def finish(self, stage: str):
+        """Szakasz sikeres befejezése: a következő futás elölről kezd."""
+        self._execute("UPDATE runs SET finished_at = ? WHERE stage = ?", (time.time(), stage))
+        skipped = self.skipped.get(stage, 0)
+        if skipped:
+            print(f"[{stage}] Checkpoint miatt kihagyott oldalak: {skipped}")
+
+    def reset(self, stage: Optional[str] = None):
+        """Egy szakasz (vagy minden szakasz) frontier és checkpoint adatainak törlése."""
+        for table in ("frontier", "checkpoints", "runs"):
+            if stage is None:
+                self._execute(f"DELETE FROM {table}")
+            else:
+                self._execute(f"DELETE FROM {table} WHERE stage = ?", (stage,))
+
+    def plan(self, stage: str, urls: Iterable[str]):
+        """URL-ek felvétele pending állapotban (a már ismertek állapota nem változik)."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO frontier (stage, url, state, updated_at) VALUES (?, ?, ?, ?)",
+                [(stage, url, PENDING, now) for url in urls]
+            )
+            self._conn.commit()
+
+    def _set_state(self, stage: str, url: str, state: str):
+        self._execute("""
+            INSERT INTO frontier (stage, url, state, attempts, updated_at) VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT (stage, url) DO UPDATE
+            SET state = excluded.state, attempts = frontier.attempts + 1, updated_at = excluded.updated_at
+        """, (stage, url, state, time.time()))
+
+    def mark_done(self, stage: str, url: str):
+        self._set_state(stage, url, DONE)
+
+    def mark_failed(self, stage: str, url: str):
+        self._set_state(stage, url, FAILED)
+
+    def is_done(self, stage: str, url: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM frontier WHERE stage = ? AND url = ?", (stage, url)
+            ).fetchone()
+        return row is not None and row[0] == DONE
+
+    def should_skip(self, stage: str, url: str) -> bool:
+        """True, ha az URL egy korábbi (megszakadt) futásban már elkészült; számolja a kihagyásokat."""
+        if self.is_done(stage, url):
+            self.skipped[stage] = self.skipped.get(stage, 0) + 1
+            return True
+        return False
+
+    def pending(self, stage: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM frontier WHERE stage = ? AND state != ? ORDER BY rowid", (stage, DONE)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def counts(self, stage: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM frontier WHERE stage = ? GROUP BY state", (stage,)
+            ).fetchall()
+        return dict(rows)
+
+    def set_checkpoint(self, stage: str, key: str, value):
+        self._execute(
+            "INSERT OR REPLACE INTO checkpoints (stage, key, value, updated_at) VALUES (?, ?, ?, ?)",
+            (stage, key, str(value), time.time())
+        )
+
+    def get_checkpoint(self, stage: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM checkpoints WHERE stage = ? AND key = ?", (stage, key)
+            ).fetchone()
+        return row[0] if row else default
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_frontier: Optional[CrawlFrontier] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_frontier() -> CrawlFrontier:
+    """A folyamat közös crawl frontierje (első híváskor jön létre)."""
+    global _shared_frontier
+    with _shared_lock:
+        if _shared_frontier is None:
+            _shared_frontier = CrawlFrontier()
+        return _shared_frontier
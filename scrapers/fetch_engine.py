@@ -0,0 +1,324 @@
+import asyncio
+import atexit
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from monitoring.metrics import (
+    FETCH_BYTES, FETCH_DURATION, FETCH_REQUESTS, FETCH_RETRIES, current_stage, set_stage
+)
+from scrapers.http_cache import HttpCache
+from scrapers.page_archive import ArchiveMissError, PageArchive
+from scrapers.retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def _parse_host_rps(value: str) -> Dict[str, float]:
+    """'adatbank.mlsz.hu=0.5,www.nemzetisport.hu=0.25' -> {host: rps}"""
+    limits = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        host, rps = item.split("=", 1)
+        try:
+            limits[host.strip().lower()] = float(rps)
+        except ValueError:
+            print(f"Érvénytelen rate limit beállítás: {item}")
+    return limits
+
+
+# Alapértelmezett udvariassági keret: hostonként 1 kérés / 4 s (ugyanaz, mint a régi time.sleep(4))
+DEFAULT_HOST_RPS = float(os.getenv('SCRAPER_DEFAULT_RPS', '0.25'))
+HOST_RPS = _parse_host_rps(os.getenv('SCRAPER_HOST_RPS', ''))
+MAX_CONNECTIONS = int(os.getenv('SCRAPER_MAX_CONNECTIONS', '20'))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv('SCRAPER_MAX_CONNECTIONS_PER_HOST', '4'))
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+PAGE_ARCHIVE_ENABLED = os.getenv('PAGE_ARCHIVE_ENABLED', 'true').lower() == 'true'
+
+
+class TokenBucket:
+    """Hostonkénti token bucket: másodpercenként `rate` token, legfeljebb `capacity` gyűlhet össze."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Vár, amíg egy token elérhető, majd elhasználja."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FetchResponse:
+    """Egy letöltött oldal: státusz, fejlécek és a nyers body."""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+
+class FetchEngine:
+    """
+    Aszinkron letöltő motor egy háttérszálon futó asyncio event loop-pal.
+
+    Egyetlen aiohttp kliens (connection pool) szolgálja ki az összes scrapert,
+    a kéréseket hostonkénti token bucket korlátozza, így különböző hostok
+    párhuzamosan tölthetők, miközben mindegyik udvarias marad.
+    """
+
+    def __init__(self, default_rps: float = DEFAULT_HOST_RPS, host_rps: Optional[Dict[str, float]] = None,
+                 max_connections: int = MAX_CONNECTIONS, max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+                 timeout: float = 30.0, cache: Optional[HttpCache] = None,
+                 archive: Optional[PageArchive] = None, replay: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None):
+        self.default_rps = default_rps
+        self.host_rps = dict(HOST_RPS if host_rps is None else host_rps)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        # Replay módban minden oldal az archívumból jön, hálózati forgalom nincs
+        self.replay = replay
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        self._client: Optional[aiohttp.ClientSession] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="fetch-engine", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coro):
+        # A hívó szál metrika szakaszát átvisszük az event loop taskjába
+        return asyncio.run_coroutine_threadsafe(self._in_stage(current_stage(), coro), self._loop).result()
+
+    @staticmethod
+    async def _in_stage(stage_name: str, coro):
+        set_stage(stage_name)
+        return await coro
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.host_rps.get(host, self.default_rps))
+            self._buckets[host] = bucket
+        return bucket
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            self._breakers[host] = breaker
+        return breaker
+
+    def breaker_states(self) -> Dict[str, str]:
+        """Hostonkénti circuit breaker állapotok (closed / open / half-open)."""
+        return {host: breaker.state for host, breaker in self._breakers.items()}
+
+    async def _get_client(self) -> aiohttp.ClientSession:
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ttl_dns_cache=300,
+            )
+            self._client = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._client
+
+    async def _fetch_once(self, url: str, headers: Dict[str, str]) -> FetchResponse:
+        host = urlsplit(url).hostname or ""
+        await self._bucket(host).acquire()
+        client = await self._get_client()
+        start = time.perf_counter()
+        status = "error"
+        try:
+            async with client.get(url, headers=headers) as resp:
+                status = str(resp.status)
+                body = await resp.read()
+                FETCH_BYTES.inc(len(body), stage=current_stage(), host=host)
+                resp.raise_for_status()
+                return FetchResponse(str(resp.url), resp.status, dict(resp.headers), body)
+        finally:
+            FETCH_DURATION.observe(time.perf_counter() - start, stage=current_stage(), host=host, status=status)
+
+    def _count_request(self, url: str, source: str):
+        FETCH_REQUESTS.inc(stage=current_stage(), host=urlsplit(url).hostname or "", source=source)
+
+    async def _fetch(self, url: str, headers: Dict[str, str], max_retries: int, backoff: float,
+                     fresh: bool = False) -> FetchResponse:
+        if self.replay:
+            return self._replay(url)
+
+        resp = await self._fetch_cached(url, headers, max_retries, backoff, fresh)
+        if self.archive is not None:
+            self.archive.store(url, resp.body)
+        return resp
+
+    def _replay(self, url: str) -> FetchResponse:
+        body = self.archive.latest(url) if self.archive is not None else None
+        if body is None:
+            raise ArchiveMissError(f"Nincs archivált változat: {url}")
+        self._count_request(url, "replay")
+        return FetchResponse(url, 200, {}, body)
+
+    async def _fetch_cached(self, url: str, headers: Dict[str, str], max_retries: int, backoff: float,
+                            fresh: bool = False) -> FetchResponse:
+        if self.cache is None:
+            resp = await self._fetch_with_retry(url, headers, max_retries, backoff)
+            self._count_request(url, "network")
+            return resp
+
+        entry = self.cache.get(url)
+        # fresh=True: a TTL nem elég, a szerverről kell (validátorral feltételesen) lekérni
+        if entry is not None and not fresh and self.cache.is_fresh(entry):
+            self.cache.record_hit(entry)
+            self._count_request(url, "cache")
+            return FetchResponse(url, 200, {}, entry.body)
+
+        request_headers = dict(headers)
+        request_headers.update(self.cache.conditional_headers(entry))
+        resp = await self._fetch_with_retry(url, request_headers, max_retries, backoff)
+
+        if resp.status == 304 and entry is not None:
+            self.cache.touch(url)
+            self.cache.record_hit(entry, revalidated=True)
+            self._count_request(url, "revalidated")
+            return FetchResponse(url, 200, resp.headers, entry.body)
+
+        self.cache.record_miss()
+        self._count_request(url, "network")
+        self.cache.store(url, resp.body, resp.headers)
+        return resp
+
+    async def _fetch_with_retry(self, url: str, headers: Dict[str, str], max_retries: int, backoff: float) -> FetchResponse:
+        breaker = self._breaker(urlsplit(url).hostname or "")
+
+        for attempt in range(max_retries):
+            if not breaker.allow():
+                raise CircuitOpenError(f"A host circuit breakere nyitva, kérés kihagyva: {url}")
+
+            try:
+                resp = await self._fetch_once(url, headers)
+                breaker.record_success()
+                return resp
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not self.retry_policy.is_retryable(e):
+                    # A host válaszolt (pl. 404), ez nem a host elérhetőségének hibája
+                    breaker.record_success()
+                    print(f"Végleges hiba, nincs újrapróbálkozás ({url}): {e}")
+                    raise
+
+                breaker.record_failure()
+                wait_time = self.retry_policy.backoff(attempt, e, backoff)
+                if attempt < max_retries - 1 and wait_time is not None:
+                    FETCH_RETRIES.inc(stage=current_stage(), host=urlsplit(url).hostname or "")
+                    print(f"Próbálkozás {attempt + 1}/{max_retries} sikertelen ({url}), várok {wait_time:.1f}s...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    print(f"Minden {attempt + 1} próbálkozás sikertelen ({url}): {e}")
+                    raise
+
+            except BaseException:
+                # Váratlan kivétel vagy megszakítás: a half-open próbakérés ne ragadjon be
+                breaker.release_trial()
+                raise
+
+        raise Exception("Elértük a maximális próbálkozások számát")
+
+    async def _fetch_many(self, urls: List[str], headers: Dict[str, str], max_retries: int, backoff: float,
+                          fresh: bool = False):
+        tasks = [self._fetch(url, headers, max_retries, backoff, fresh) for url in urls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+              max_retries: int = 3, backoff: float = 4.0, fresh: bool = False) -> FetchResponse:
+        """
+        Egy URL letöltése (blokkol, amíg a válasz megérkezik).
+
+        fresh=True esetén a cache TTL alapján nem szolgál ki, csak 304 újraellenőrzés után
+        (pl. ha tudjuk, hogy az oldal tartalma megváltozott).
+        """
+        return self._submit(self._fetch(url, headers or {}, max_retries, backoff, fresh))
+
+    def fetch_many(self, urls: List[str], headers: Optional[Dict[str, str]] = None,
+                   max_retries: int = 3, backoff: float = 4.0,
+                   fresh: bool = False) -> List[Union[FetchResponse, Exception]]:
+        """
+        Több URL párhuzamos letöltése (fresh: lásd fetch).
+
+        Returns:
+            Az URL-ek sorrendjében a válaszok, hibás letöltés helyén a kivétel
+        """
+        if not urls:
+            return []
+        return self._submit(self._fetch_many(list(urls), headers or {}, max_retries, backoff, fresh))
+
+    async def _close(self):
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+
+    def close(self):
+        """A kliens és az event loop leállítása."""
+        if not self._loop.is_running():
+            return
+        self._submit(self._close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if self.cache is not None:
+            self.cache.close()
+        if self.archive is not None:
+            self.archive.close()
+
+
+_shared_engine: Optional[FetchEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_engine(create: bool = True) -> Optional[FetchEngine]:
+    """A folyamat közös fetch engine-je (első híváskor jön létre, ha create=True)."""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None and create:
+            _shared_engine = FetchEngine(
+                cache=HttpCache() if HTTP_CACHE_ENABLED else None,
+                archive=PageArchive() if PAGE_ARCHIVE_ENABLED else None,
+            )
+            atexit.register(_shared_engine.close)
+        return _shared_engine
+
+
+def enable_replay_mode() -> FetchEngine:
+    """A közös engine átállítása replay módba: minden oldal az archívumból jön."""
+    engine = get_shared_engine()
+    if engine.archive is None:
+        engine.archive = PageArchive()
+    engine.replay = True
+    return engine
@@ -0,0 +1,158 @@
+import os
+from typing import Callable, Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+
+# Választható backendek: "html.parser" (beépített, leglassabb), "lxml", "selectolax".
+# Az alapértelmezés a korábbi html.parser marad; a gyorsabb backendek kifejezett választásra
+# (a hibás HTML-t eltérően javíthatják, ezért váltás előtt érdemes összevetni a kimenetet)
+HTML_PARSER = os.getenv('HTML_PARSER', 'html.parser')
+BACKENDS = ("html.parser", "lxml", "selectolax")
+
+ClassFilter = Union[str, Callable[[Optional[str]], bool], None]
+
+
+def parse_html(text: str, backend: Optional[str] = None):
+    """
+    HTML feldolgozása a beállított backenddel.
+
+    A "html.parser" és "lxml" backend BeautifulSoup objektumot ad vissza, a
+    "selectolax" backend egy SelectolaxTag-et, ami a scraperek által használt
+    BeautifulSoup API részhalmazát (find, find_all, get_text, get, [],
+    find_next_sibling, text) valósítja meg, így a kinyerő metódusok mindkét
+    backenddel változtatás nélkül működnek.
+    """
+    backend = backend or HTML_PARSER
+    if backend == "selectolax":
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            raise ImportError("A selectolax backendhez telepíteni kell a selectolax csomagot")
+        return SelectolaxTag(LexborHTMLParser(text).root)
+    if backend not in BACKENDS:
+        raise ValueError(f"Ismeretlen HTML parser backend: {backend}")
+    return BeautifulSoup(text, backend)
+
+
+def _is_element(node) -> bool:
+    # A lexbor a szöveg és komment csomópontokat "-text", "_comment" tagként adja vissza
+    return node.tag is not None and node.tag[0] not in "-_!"
+
+
+class SelectolaxTag:
+    """BeautifulSoup Tag-kompatibilis vékony wrapper egy selectolax csomópont köré."""
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    # ---------- attribútumok, szöveg ----------
+
+    @property
+    def name(self) -> str:
+        return self.node.tag
+
+    @property
+    def attrs(self) -> dict:
+        return self.node.attributes
+
+    def get(self, key: str, default=None):
+        value = self.node.attributes.get(key, default)
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        value = self.node.attributes.get(key)
+        if value is None and key not in self.node.attributes:
+            raise KeyError(key)
+        return value
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    @property
+    def string(self) -> Optional[str]:
+        """BeautifulSoup .string: egyetlen szöveges gyerek (egy gyerekes tageken át)."""
+        node = self.node
+        while True:
+            children = list(node.iter(include_text=True))
+            if len(children) != 1:
+                return None
+            child = children[0]
+            if child.tag == "-text":
+                return child.text_content
+            if not _is_element(child):
+                return None
+            node = child
+
+    # ---------- keresés ----------
+
+    def _selector(self, name: Optional[str], class_: ClassFilter, id: Optional[str], attrs: dict) -> str:
+        selector = name or ""
+        if isinstance(class_, str):
+            selector += f'[class="{class_}"]' if " " in class_ else f".{class_}"
+        if id:
+            selector += f"#{id}"
+        for attr, value in attrs.items():
+            if value is True:
+                selector += f"[{attr}]"
+            elif isinstance(value, str):
+                selector += f'[{attr}="{value}"]'
+        return selector or "*"
+
+    @staticmethod
+    def _class_matches(node, class_: Callable[[Optional[str]], bool]) -> bool:
+        value = node.attributes.get("class")
+        if value is None:
+            return bool(class_(None))
+        classes = value.split()
+        return any(class_(c) for c in classes) or bool(class_(" ".join(classes)))
+
+    def _matches(self, node, class_: ClassFilter, string: Optional[str]) -> bool:
+        if callable(class_) and not self._class_matches(node, class_):
+            return False
+        if string is not None and SelectolaxTag(node).string != string:
+            return False
+        return True
+
+    def _iter_matches(self, name, class_, id, string, attrs) -> Iterator["SelectolaxTag"]:
+        selector = self._selector(name, class_, id, attrs)
+        for node in self.node.css(selector):
+            if node.mem_id == self.node.mem_id:
+                continue
+            if self._matches(node, class_, string):
+                yield SelectolaxTag(node)
+
+    def find(self, name: Optional[str] = None, class_: ClassFilter = None, id: Optional[str] = None,
+             string: Optional[str] = None, **attrs) -> Optional["SelectolaxTag"]:
+        if not callable(class_) and string is None:
+            # Gyors út: a keresés teljesen a lexbor CSS motorjában fut
+            node = self.node.css_first(self._selector(name, class_, id, attrs))
+            if node is None:
+                return None
+            if node.mem_id != self.node.mem_id:
+                return SelectolaxTag(node)
+        return next(self._iter_matches(name, class_, id, string, attrs), None)
+
+    def find_all(self, name: Optional[str] = None, class_: ClassFilter = None, id: Optional[str] = None,
+                 string: Optional[str] = None, **attrs) -> List["SelectolaxTag"]:
+        return list(self._iter_matches(name, class_, id, string, attrs))
+
+    def find_next_sibling(self, name: Optional[str] = None) -> Optional["SelectolaxTag"]:
+        node = self.node.next
+        while node is not None:
+            if _is_element(node) and (name is None or node.tag == name):
+                return SelectolaxTag(node)
+            node = node.next
+        return None
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return f"<SelectolaxTag {self.node.tag}>"
@@ -0,0 +1,132 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+
+CACHE_PATH = os.getenv('HTTP_CACHE_PATH', '.cache/http_cache.sqlite')
+
+# Validátor nélküli válaszok frissességi ideje URL minta alapján (másodperc).
+# Az első illeszkedő szabály érvényes, ha egyik sem illeszkedik, nincs cache-elés.
+DEFAULT_TTL_RULES: List[Tuple[str, int]] = [
+    (r"adatbank\.mlsz\.hu/match/", 30 * 24 * 3600),    # lejátszott meccs részletes oldala
+    (r"adatbank\.mlsz\.hu/player/", 7 * 24 * 3600),    # játékos adatlap
+    (r"adatbank\.mlsz\.hu/club/", 24 * 3600),          # csapat oldal
+    (r"adatbank\.mlsz\.hu/league/", 6 * 3600),         # forduló oldal (sorsolás + tabella)
+    (r"nemzetisport\.hu/rovat/", 0),                    # rovat lista mindig friss legyen
+    (r"nemzetisport\.hu/", 7 * 24 * 3600),             # cikkek
+]
+
+
+class CacheEntry:
+    def __init__(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class HttpCache:
+    """
+    Lemezen tárolt HTTP válasz cache URL kulccsal.
+
+    ETag / Last-Modified validátorokat tárol, ezek alapján feltételes kérést
+    lehet küldeni (304 esetén a lemezről szolgálunk ki). Validátor nélküli
+    válaszoknál URL minta szerinti TTL dönti el a frissességet.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl_rules: Optional[List[Tuple[str, int]]] = None):
+        self.path = path
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in (ttl_rules or DEFAULT_TTL_RULES)]
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "bytes_saved": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def ttl_for(self, url: str) -> int:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return 0
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return CacheEntry(url, zlib.decompress(body), etag, last_modified, fetched_at)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Validátor nélküli bejegyzés a TTL-en belül hálózat nélkül kiszolgálható."""
+        if entry.has_validators:
+            return False
+        return time.time() - entry.fetched_at < self.ttl_for(entry.url)
+
+    def conditional_headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, body: bytes, headers: Dict[str, str]):
+        lowered = {key.lower(): value for key, value in headers.items()}
+        etag = lowered.get('etag')
+        last_modified = lowered.get('last-modified')
+        if not etag and not last_modified and self.ttl_for(url) <= 0:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, body, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, zlib.compress(body), etag, last_modified, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, url: str):
+        """304 után a bejegyzés frissítési idejének aktualizálása."""
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def record_hit(self, entry: CacheEntry, revalidated: bool = False):
+        self.stats["revalidated" if revalidated else "hits"] += 1
+        self.stats["bytes_saved"] += len(entry.body)
+
+    def record_miss(self):
+        self.stats["misses"] += 1
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (f"HTTP cache: {s['hits']} találat (TTL), {s['revalidated']} 304 újraellenőrzés, "
+                f"{s['misses']} hiány, megspórolt letöltés: {s['bytes_saved'] / 1024:.1f} KiB")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
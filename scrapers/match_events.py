@@ -0,0 +1,215 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+
+
+# Esemény ikon (a span style attribútumában lévő kép) -> esemény típus
+EVENT_ICONS = {
+    "event_goal.png": "goal",
+    "event_penalty_goal.png": "goal",
+    "event_own_goal.png": "own_goal",
+    "event_yellowcard.png": "yellow_card",
+    "event_redcard.png": "red_card",
+    "event_swap.png": "substitution",
+}
+
+# Esemény típus -> a játékos statisztika számlálója
+STAT_COUNTERS = {
+    "goal": "goals",
+    "own_goal": "own_goals",
+    "yellow_card": "yellow_cards",
+    "red_card": "red_cards",
+}
+
+# Rendes játékidő; hosszabbításos (kupa) meccsen 120 perc
+MATCH_LENGTH = 90
+EXTRA_TIME_LENGTH = 120
+
+_ICON_RE = re.compile(r"([\w-]+\.png)")
+_MINUTE_RE = re.compile(r"(\d+)\s*(?:\+\s*(\d+))?")
+
+
+def parse_minute(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Esemény perc a ráadással együtt: "90+3'" -> (90, 3), "67'" -> (67, 0).
+
+    Returns:
+        (perc, ráadás perc) vagy None, ha nincs benne szám
+    """
+    match = _MINUTE_RE.search(text)
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2) or 0)
+
+
+def event_type_for_style(style: str) -> Optional[str]:
+    """Az esemény típusa a span style attribútumában hivatkozott ikon alapján."""
+    match = _ICON_RE.search(style)
+    return EVENT_ICONS.get(match.group(1)) if match else None
+
+
+def match_length_for_events(events: List[Dict]) -> int:
+    """
+    A meccs hossza az esemény folyamból: ha van esemény a 90. perc után (a ráadás
+    nem számít, az "90+x" formátumú), a meccs hosszabbításba ment.
+    """
+    if any(event["minute"] > MATCH_LENGTH for event in events):
+        return EXTRA_TIME_LENGTH
+    return MATCH_LENGTH
+
+
+def apply_minutes_played(events: List[Dict], player_stats: Dict[str, Dict], team_side: str, match_length: int):
+    """Egy csapat játékosainak játszott percei a csapat eseményeiből, a megadott meccs hosszal."""
+    player_events: Dict[str, List[Dict]] = {}
+    for event in events:
+        if event["team_side"] == team_side:
+            player_events.setdefault(event["player"], []).append(event)
+    for player_name, stats in player_stats.items():
+        stats["minutes_played"] = minutes_played(player_events.get(player_name, []), stats["is_starter"], match_length)
+
+
+def minutes_played(player_events: List[Dict], is_starter: bool, match_length: int = MATCH_LENGTH) -> int:
+    """
+    Játszott percek az esemény folyamból: a pályára lépéstől (kezdőknél 0, cseréknél
+    a becserélés perce) a lecserélésig / kiállításig, vagy a meccs végéig.
+    A ráadás percek nem számítanak bele.
+    """
+    start = 0 if is_starter else None
+    end = match_length
+
+    for event in player_events:
+        minute = min(event["minute"], match_length)
+        if event["type"] == "substitution":
+            if event["is_sub_in"]:
+                start = minute
+            else:
+                end = minute
+        elif event["type"] == "red_card":
+            end = min(end, minute)
+
+    if start is None:
+        return 0
+    return max(0, end - start)
+
+
+def pair_substitutions(events: List[Dict]):
+    """
+    A le- és becserélések párosítása csapatonként, azonos perc (és ráadás) alapján.
+    A párosított események "partner" mezőt kapnak a másik játékos nevével.
+    """
+    outgoing: Dict[Tuple, List[Dict]] = {}
+    for event in events:
+        if event["type"] == "substitution" and not event["is_sub_in"]:
+            outgoing.setdefault((event["team_side"], event["minute"], event["added_time"]), []).append(event)
+
+    for event in events:
+        if event["type"] != "substitution" or not event["is_sub_in"]:
+            continue
+        candidates = outgoing.get((event["team_side"], event["minute"], event["added_time"]))
+        if candidates:
+            partner = candidates.pop(0)
+            event["partner"] = partner["player"]
+            partner["partner"] = event["player"]
+
+
+def _extract_player_row(row: BeautifulSoup, team_side: str, is_starter: bool,
+                        events: List[Dict], player_stats: Dict[str, Dict]):
+    """Egy játékos sorának eseményei egyetlen bejárással; a statisztika az eseményekből számolódik."""
+    name_td = row.find("td", class_="match_players_name")
+    player_link = name_td.find("a") if name_td else None
+    player_name = player_link.get_text(strip=True) if player_link else ""
+    if not player_name:
+        return
+
+    stats = {
+        "minutes_played": 0,
+        "goals": 0,
+        "own_goals": 0,
+        "yellow_cards": 0,
+        "red_cards": 0,
+        "is_starter": is_starter
+    }
+    player_events = []
+
+    cards_td = row.find("td", class_="match_players_cards")
+    if cards_td:
+        for span in cards_td.find_all("span"):
+            event_type = event_type_for_style(span.get("style", ""))
+            if event_type is None:
+                continue
+            minute = parse_minute(span.get_text(strip=True))
+            if minute is None:
+                continue
+
+            event = {
+                "minute": minute[0],
+                "added_time": minute[1],
+                "player": player_name,
+                "type": event_type,
+                "team_side": team_side
+            }
+            if event_type == "substitution":
+                # Kezdő játékosnál lecserélés, cserejátékosnál becserélés
+                # (a becserélt, majd lecserélt játékos második csere eseménye lecserélés)
+                event["is_sub_in"] = not is_starter and not any(
+                    e["type"] == "substitution" for e in player_events
+                )
+            counter = STAT_COUNTERS.get(event_type)
+            if counter:
+                stats[counter] += 1
+            player_events.append(event)
+
+    events.extend(player_events)
+    player_stats[player_name] = stats
+
+
+def extract_team_events(team_div: BeautifulSoup, team_side: str) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Egy csapat (left_team / right_team div) összes eseménye és játékos statisztikája.
+
+    A játszott perceket az extract_match_events számolja, a két csapat együttes
+    eseményeiből meghatározott meccs hosszal.
+
+    Returns:
+        (események, {játékos név: statisztika})
+    """
+    events: List[Dict] = []
+    player_stats: Dict[str, Dict] = {}
+
+    main_table = team_div.find("table")
+    if main_table:
+        for row in main_table.find_all("tr", class_="template-tr-selectable"):
+            _extract_player_row(row, team_side, True, events, player_stats)
+
+    replacement_table = team_div.find("table", class_="replacement")
+    if replacement_table:
+        for row in replacement_table.find_all("tr", class_="template-tr-selectable"):
+            _extract_player_row(row, team_side, False, events, player_stats)
+
+    return events, player_stats
+
+
+def extract_match_events(match_teams_div: BeautifulSoup) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    A meccs teljes esemény folyama (időrendben, párosított cserékkel) és a játékos statisztikák.
+
+    Returns:
+        (események, {"home": {...}, "away": {...}})
+    """
+    events: List[Dict] = []
+    player_stats = {"home": {}, "away": {}}
+
+    for div_id, team_side in (("left_team", "home"), ("right_team", "away")):
+        team_div = match_teams_div.find("div", id=div_id)
+        if team_div:
+            team_events, player_stats[team_side] = extract_team_events(team_div, team_side)
+            events.extend(team_events)
+
+    # Hosszabbítás esetén (bármelyik csapat 90. perc utáni eseménye) 120 perccel számolunk
+    match_length = match_length_for_events(events)
+    for team_side in ("home", "away"):
+        apply_minutes_played(events, player_stats[team_side], team_side, match_length)
+
+    events.sort(key=lambda e: (e["minute"], e["added_time"]))
+    pair_substitutions(events)
+    return events, player_stats
@@ -1,27 +1,121 @@
-from typing import List, Dict, Optional
+import os
+import threading
+from typing import Iterable, List, Dict, Optional, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 from scrapers.base_scraper import BaseScraper
+from scrapers.competitions import Competition, get_competition
+from scrapers.html_parser import parse_html
+from scrapers.match_events import extract_match_events
+from scrapers.pipeline import Pipeline, Step
+from database.database import get_db_session
 from database.db_operations import (
     create_match,
-    create_match_event,
-    get_match_by_teams_date_and_round,
-    get_player_by_name_and_team_name,
-    get_team_by_name,
-    create_or_update_player_stats
+    bulk_create_match_events,
+    delete_match_events,
+    get_existing_match_keys,
+    get_match_counts_by_round,
+    update_match_result,
+    refresh_player_stats,
+    upsert_player_match_stats
 )
 
+# Pipeline worker számok lépésenként: meccs oldal letöltés / HTML feldolgozás / adatbázis írás
+PIPELINE_WORKERS = {
+    "fetch": int(os.getenv('PIPELINE_FETCH_WORKERS', '4')),
+    "parse": int(os.getenv('PIPELINE_PARSE_WORKERS', '2')),
+    "persist": int(os.getenv('PIPELINE_PERSIST_WORKERS', '1')),
+}
+
 class MatchAndMatchEventScraper(BaseScraper):
     """Scraper az MLSZ adatbankból a meccsek és meccsesemények kinyerésére."""
-    
-    BASE_URL = "https://adatbank.mlsz.hu/league/65/0/31362/{}.html"
+
+    def __init__(self, competition: Optional[Competition] = None, incremental: bool = True,
+                 workers: Optional[Dict[str, int]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.competition = competition or get_competition()
+        # Inkrementális módban az adatbázisban már teljes fordulók kimaradnak
+        self.incremental = incremental
+        # A szezon már mentett meccsei (első használatkor töltődik be egyetlen lekérdezéssel)
+        self._existing_matches: Optional[Dict[Tuple, Dict]] = None
+        self.workers = {**PIPELINE_WORKERS, **(workers or {})}
+        # Pipeline futás közben: fordulónként a még mentésre váró és a hibás meccsek száma
+        self._round_progress: Dict[int, Dict[str, int]] = {}
+        self._progress_lock = threading.Lock()
+        self._season_finished = False
 
     def scrape_round(self, round_number: int) -> List[Dict]:
         """Egy adott forduló összes meccsének lekérése."""
-        print(f"{round_number}. forduló letöltése...")
-        url = self.BASE_URL.format(round_number)
+        print(f"{self.competition.name}: {round_number}. forduló letöltése...")
+        url = self.competition.round_url(round_number)
         soup = self.get_soup(url)
 
+        matches = self._parse_round_listing(soup)
+        self.classify_matches(round_number, matches)
+        self._attach_match_details(matches)
+        return matches
+
+    def _load_existing_matches(self) -> Dict[Tuple, Dict]:
+        if self._existing_matches is None:
+            self._existing_matches = get_existing_match_keys(self.competition.season_label)
+        return self._existing_matches
+
+    def classify_matches(self, round_number: int, matches: List[Dict]):
+        """
+        A listázó oldal meccseinek összevetése az adatbázissal, a részletes oldalak letöltése előtt.
+
+        Minden meccs kap egy "status" mezőt: "new" (még nincs az adatbázisban),
+        "changed" (megváltozott az eredmény, vagy még nincs meccsenkénti játékos
+        statisztikája), "unchanged" vagy "unknown_team". Csak az új és a
+        megváltozott meccsek részletes oldalát kell letölteni.
+        """
+        existing_matches = self._load_existing_matches()
+
+        for m in matches:
+            m["home_team_id"] = self.identity.team_id(m["home_team"])
+            m["away_team_id"] = self.identity.team_id(m["away_team"])
+            if m["home_team_id"] is None or m["away_team_id"] is None:
+                m["status"] = "unknown_team"
+                continue
+
+            existing = existing_matches.get((m["home_team_id"], m["away_team_id"], m["date"], round_number))
+            m["match_id"] = existing["match_id"] if existing else None
+            if existing is None:
+                m["status"] = "new"
+            elif (existing["home_score"], existing["away_score"]) != (m["home_score"], m["away_score"]) \
+                    or not existing.get("has_stats"):
+                m["status"] = "changed"
+            else:
+                m["status"] = "unchanged"
+
+    def _attach_match_details(self, matches: List[Dict]):
+        """
+        A meccs részletes oldalak párhuzamos letöltése és hozzáadása a meccs adatokhoz.
+
+        Ha a meccsek már át lettek vizsgálva (classify_matches), csak az új és a
+        megváltozott eredményű meccsek oldala töltődik le. Sikertelen letöltésnél a
+        meccs details_fetched=False jelzést kap, és nem kerül mentésre.
+        """
+        needs_details = [m for m in matches if m["url"] and m.get("status", "new") in ("new", "changed")]
+        detail_urls = [m["url"] for m in needs_details]
+        # Megváltozott eredménynél a cache-elt (régi) oldal nem használható
+        new_urls = [m["url"] for m in needs_details if m.get("status", "new") == "new"]
+        changed_urls = [m["url"] for m in needs_details if m.get("status") == "changed"]
+        detail_soups = dict(zip(new_urls, self.get_soups(new_urls)))
+        detail_soups.update(zip(changed_urls, self.get_soups(changed_urls, fresh=True)))
+        if len(needs_details) < len(matches):
+            print(f"Meccs részletes oldalak: {len(detail_urls)} letöltve, "
+                  f"{len(matches) - len(detail_urls)} kihagyva (már mentve)")
+
+        for m in matches:
+            detail_soup = detail_soups.get(m["url"]) if m["url"] else None
+            m.update(self._parse_match_details(detail_soup) if detail_soup else self._empty_match_details())
+            m["details_fetched"] = detail_soup is not None
+            if m.get("status", "new") in ("new", "changed") and detail_soup is None:
+                print(f"Meccs részletek hiányoznak, kihagyva: {m['home_team']} - {m['away_team']}")
+
+    def _parse_round_listing(self, soup: BeautifulSoup) -> List[Dict]:
+        """A forduló oldal meccslistájának kinyerése (részletes adatok nélkül)."""
         matches = []
 
         # A team-sorsolas boxon belül keresünk minden .schedule divet
@@ -76,19 +170,15 @@ class MatchAndMatchEventScraper(BaseScraper):
             # Meccsdátum konvertálása
             match_date = self._parse_date(date_text)
 
-            match_details = self.scrape_match_events(match_url)
-
+            home_score, away_score = result.split(" - ")
             return {
                 "home_team": home_team,
                 "away_team": away_team,
-                "home_score": result.split(" - ")[0],
-                "away_score": result.split(" - ")[1],
+                "home_score": self._parse_score(home_score),
+                "away_score": self._parse_score(away_score),
                 "arena": arena,
                 "date": match_date,
-                "url": match_url,
-                "referee": match_details["referee"],
-                "events": match_details["events"],
-                "player_stats": match_details["player_stats"]
+                "url": match_url
             }
 
         except Exception as e:
@@ -99,9 +189,16 @@ class MatchAndMatchEventScraper(BaseScraper):
     def scrape_match_events(self, match_url: str) -> Dict:
         """Meccsesemények és játékos statisztikák lekérése a meccs részletes oldaláról."""
         if not match_url:
-            return {"referee": None, "events": [], "player_stats": {}}
+            return self._empty_match_details()
 
         soup = self.get_soup(match_url)
+        return self._parse_match_details(soup)
+
+    def _empty_match_details(self) -> Dict:
+        return {"referee": None, "events": [], "player_stats": {"home": {}, "away": {}}}
+
+    def _parse_match_details(self, soup: BeautifulSoup) -> Dict:
+        """Meccsesemények és játékos statisztikák kinyerése a letöltött részletes oldalból."""
         events = []
         referee_name = None
         player_stats = {"home": {}, "away": {}}
@@ -120,18 +217,10 @@ class MatchAndMatchEventScraper(BaseScraper):
                     referee_name = value
                     break
 
-        # Csapatok adatainak feldolgozása
+        # Csapatok eseményei és játékos statisztikái (egyetlen bejárással)
         match_teams_div = soup.find("div", class_="match_teams_players")
         if match_teams_div:
-            # Hazai csapat feldolgozása
-            left_team_div = match_teams_div.find("div", id="left_team")
-            if left_team_div:
-                self._process_team_players(left_team_div, "home", events, player_stats["home"])
-
-            # Vendég csapat feldolgozása
-            right_team_div = match_teams_div.find("div", id="right_team")
-            if right_team_div:
-                self._process_team_players(right_team_div, "away", events, player_stats["away"])
+            events, player_stats = extract_match_events(match_teams_div)
 
         return {
             "referee": referee_name,
@@ -139,145 +228,9 @@ class MatchAndMatchEventScraper(BaseScraper):
             "player_stats": player_stats
         }
 
-    def _process_team_players(self, team_div: BeautifulSoup, team_side: str, events: List, player_stats: Dict):
-        """Egy csapat játékosainak feldolgozása."""
-        
-        # Kezdő játékosok
-        main_table = team_div.find("table")
-        if main_table:
-            for row in main_table.find_all("tr", class_="template-tr-selectable"):
-                self._process_player_row(row, team_side, events, player_stats, is_starter=True)
-        
-        # Cserék
-        replacement_table = team_div.find("table", class_="replacement")
-        if replacement_table:
-            for row in replacement_table.find_all("tr", class_="template-tr-selectable"):
-                self._process_player_row(row, team_side, events, player_stats, is_starter=False)
-
-    def _process_player_row(self, row: BeautifulSoup, team_side: str, events: List, player_stats: Dict, is_starter: bool):
-        """Egy játékos sor feldolgozása."""
-        try:
-            # Játékos nevének kinyerése
-            name_td = row.find("td", class_="match_players_name")
-            if not name_td:
-                return
-                
-            player_links = name_td.find_all("a")
-            if not player_links:
-                return
-                
-            player_name = player_links[0].get_text(strip=True)
-            if not player_name:
-                return
-
-            # Kártyák és események cellája
-            cards_td = row.find("td", class_="match_players_cards")
-            
-            # Játszott percek számítása
-            minutes_played = self._calculate_minutes_played(cards_td, is_starter)
-            
-            # Statisztika inicializálása
-            stats = {
-                "minutes_played": minutes_played,
-                "goals": 0,
-                "own_goals": 0,
-                "yellow_cards": 0,
-                "red_cards": 0,
-                "is_starter": is_starter
-            }
-
-            # Események feldolgozása
-            if cards_td:
-                for span in cards_td.find_all("span"):
-                    style = span.get("style", "")
-                    minute_text = span.get_text(strip=True).replace("'", "")
-                    minute = ''.join(filter(str.isdigit, minute_text))
-                    
-                    if not minute:
-                        continue
-                    
-                    # Esemény típusának meghatározása
-                    if "event_goal.png" in style or "event_penalty_goal.png" in style:
-                        event_type = "goal"
-                        stats["goals"] += 1
-                        events.append({
-                            "minute": minute,
-                            "player": player_name,
-                            "type": event_type,
-                            "team_side": team_side
-                        })
-                        
-                    elif "event_own_goal.png" in style:
-                        event_type = "own_goal"
-                        stats["own_goals"] += 1
-                        events.append({
-                            "minute": minute,
-                            "player": player_name,
-                            "type": event_type,
-                            "team_side": team_side
-                        })
-
-                    elif "event_yellowcard.png" in style:
-                        event_type = "yellow_card"
-                        stats["yellow_cards"] += 1
-                        events.append({
-                            "minute": minute,
-                            "player": player_name,
-                            "type": event_type,
-                            "team_side": team_side
-                        })
-                        
-                    elif "event_redcard.png" in style:
-                        event_type = "red_card"
-                        stats["red_cards"] += 1
-                        events.append({
-                            "minute": minute,
-                            "player": player_name,
-                            "type": event_type,
-                            "team_side": team_side
-                        })
-                        
-                    elif "event_swap.png" in style:
-                        event_type = "substitution"
-                        events.append({
-                            "minute": minute,
-                            "player": player_name,
-                            "type": event_type,
-                            "team_side": team_side,
-                            "is_sub_in": not is_starter  # Ha csere, akkor bejött, ha kezdő, akkor kiment
-                        })
-
-            # Statisztika mentése
-            player_stats[player_name] = stats
-            
-        except Exception as e:
-            print(f"Hiba játékos feldolgozásakor: {e}")
-
-    def _calculate_minutes_played(self, cards_td: BeautifulSoup, is_starter: bool) -> int:
-        """Játszott percek számítása."""
-        if not cards_td:
-            return 90 if is_starter else 0
-        
-        # Csere események keresése
-        substitution_spans = []
-        for span in cards_td.find_all("span"):
-            style = span.get("style", "")
-            if "event_swap.png" in style:
-                minute_text = span.get_text(strip=True).replace("'", "")
-                minute = ''.join(filter(str.isdigit, minute_text))
-                if minute:
-                    substitution_spans.append(int(minute))
-        
-        if not substitution_spans:
-            return 90 if is_starter else 0
-        
-        if is_starter:
-            # Kezdő játékos: kicserélték, annyi percet játszott
-            return min(substitution_spans)
-        else:
-            # Csere játékos: bekerült, 90 - bekerülési perc
-            substitution_time = min(substitution_spans)
-            return 90 - substitution_time
+    def _parse_score(self, score: str) -> Optional[int]:
+        score = score.strip()
+        return int(score) if score.isdigit() else None
 
     def _parse_date(self, date_str: str) -> Optional[str]:
         """Formátum: '2025. 07. 25.20:00' - returns string in 'YYYY-MM-DD' format"""
@@ -291,113 +244,276 @@ class MatchAndMatchEventScraper(BaseScraper):
             return None
 
 
-    def save_matches_to_db(self):
-        for round_number in range(1, 34):
-            matches = self.scrape_round(round_number)
-            for m in matches:
-                home_team_name = m["home_team"]
-                away_team_name = m["away_team"]
-
-                home_team_id = get_team_by_name(home_team_name)
-                away_team_id = get_team_by_name(away_team_name)
-
-                if home_team_id is None or away_team_id is None:
-                    print(f"Csapat nem található: {home_team_name} vagy {away_team_name}")
-                    continue
+    def first_incomplete_round(self) -> Optional[int]:
+        """Az első forduló, amelynek nincs meg az összes meccse az adatbázisban (None, ha mind teljes)."""
+        counts = get_match_counts_by_round(self.competition.season_label)
+        for round_number in self.competition.round_numbers():
+            if counts.get(round_number, 0) < self.competition.matches_per_round:
+                return round_number
+        return None
+
+    def plan_rounds(self, rounds: Optional[Iterable[int]] = None, since_round: Optional[int] = None) -> List[int]:
+        """
+        A feldolgozandó fordulók.
+
+        Args:
+            rounds: Konkrét fordulók (célzott újrafeldolgozás); megadása esetén minden más figyelmen kívül marad
+            since_round: Ettől a fordulótól kezdve; alapból az első hiányos fordulótól (inkrementális mód)
+                vagy az 1. fordulótól
+        """
+        all_rounds = list(self.competition.round_numbers())
+        if rounds is not None:
+            return [n for n in rounds if n in all_rounds]
+
+        if since_round is None:
+            since_round = self.first_incomplete_round() if self.incremental else 1
+            if since_round is None:
+                print(f"{self.competition.name}: minden forduló teljes az adatbázisban")
+                return []
+            if since_round > 1:
+                print(f"{self.competition.name}: az 1-{since_round - 1}. forduló már teljes, kihagyva")
+
+        return [n for n in all_rounds if n >= since_round]
+
+    def save_matches_to_db(self, rounds: Optional[Iterable[int]] = None, since_round: Optional[int] = None,
+                           refresh: bool = True):
+        """
+        Meccsek mentése fordulónként, az utolsó eredményt tartalmazó fordulóig.
+
+        Alapból csak az első, az adatbázisban még hiányos fordulótól indul. A feldolgozás
+        pipeline-ban fut: forduló lista -> meccs oldal letöltés -> feldolgozás -> mentés,
+        a lépések egymással átfedésben, korlátos sorokkal és lépésenként állítható worker
+        számmal. A forduló egy tranzakcióban mentődik, amikor az összes meccse végigért a
+        pipeline-on; egy meccs letöltési / feldolgozási hibája nem állítja meg a fordulót
+        (a többi meccse mentődik), de a forduló csak akkor számít késznek, ha minden meccse
+        sikeresen mentve.
+        refresh=False esetén az összesítők frissítése a hívóra marad (több sorozat után egyszer).
+        """
+        stage = self._checkpoint_stage()
+        planned = self.plan_rounds(rounds, since_round)
+        self.frontier.begin(stage)
+        self.frontier.plan(stage, [self.competition.round_url(n) for n in planned])
+        todo = [n for n in planned if not self.frontier.should_skip(stage, self.competition.round_url(n))]
+
+        self._round_progress = {}
+        self._season_finished = False
+        pipeline = Pipeline([
+            Step("listing", self._pipeline_listing, on_error=self._listing_failed),
+            Step("fetch", self._pipeline_fetch, workers=self.workers["fetch"], on_error=self._match_failed),
+            Step("parse", self._pipeline_parse, workers=self.workers["parse"], on_error=self._match_failed),
+            Step("persist", self._pipeline_persist, workers=self.workers["persist"], on_error=self._match_failed),
+        ])
+        pipeline.run(todo)
+        print(pipeline.format_report())
+
+        failed_rounds = sorted(n for n, progress in self._round_progress.items() if progress["failed"])
+        if failed_rounds:
+            # A szakasz nyitva marad: a következő futás a hibás fordulókat újra feldolgozza
+            print(f"{self.competition.name}: hibás meccsek miatt újrafuttatandó fordulók: {failed_rounds}")
+        else:
+            self.frontier.finish(stage)
+        if refresh:
+            self.refresh_aggregates()
+
+    def _checkpoint_stage(self) -> str:
+        return f"matches:{self.competition.key}"
+
+    def _pipeline_listing(self, round_number: int, emit):
+        """Forduló lista letöltése és összevetése az adatbázissal; a mentendő meccsek továbbadása."""
+        if self._season_finished:
+            return
+        print(f"{self.competition.name}: {round_number}. forduló letöltése...")
+        matches = self._parse_round_listing(self.get_soup(self.competition.round_url(round_number)))
+        if not matches:
+            print(f"{round_number}. forduló még nincs lejátszva")
+            self._season_finished = True
+            return
+
+        self.classify_matches(round_number, matches)
+        pending = [m for m in matches if m["status"] in ("new", "changed")]
+        for m in matches:
+            if m["status"] == "unknown_team":
+                print(f"Csapat nem található: {m['home_team']} vagy {m['away_team']}")
+        if len(pending) < len(matches):
+            print(f"{round_number}. forduló: {len(pending)} meccs feldolgozandó, "
+                  f"{len(matches) - len(pending)} kihagyva")
+
+        with self._progress_lock:
+            self._round_progress[round_number] = {"pending": len(pending), "failed": 0, "ready": []}
+        if not pending:
+            self._mark_round_done(round_number)
+        for m in pending:
+            m["round"] = round_number
+            emit(m)
+
+    def _pipeline_fetch(self, m: Dict, emit):
+        """Meccs részletes oldal letöltése; sikertelen letöltésnél a meccs (és így a forduló) hibás lesz."""
+        # Megváltozott eredménynél a cache-elt (régi) oldal nem használható
+        m["html"] = self.get_html(m["url"], fresh=m["status"] == "changed") if m["url"] else None
+        emit(m)
+
+    def _pipeline_parse(self, m: Dict, emit):
+        html = m.pop("html")
+        details = self._parse_match_details(parse_html(html, self.parser_backend)) if html is not None else None
+        m.update(details or self._empty_match_details())
+        m["details_fetched"] = details is not None
+        emit(m)
+
+    def _pipeline_persist(self, m: Dict, emit):
+        """A meccs a fordulója többi meccsére vár; a forduló utolsó meccse menti az egészet."""
+        if not m["details_fetched"]:
+            # Részletek nélkül nem mentünk félkész meccset; a forduló újrafuttatandó marad
+            raise RuntimeError("a meccs részletes oldala nem érhető el")
+        self._match_finished(m["round"], m)
+
+    def _persist_round(self, round_number: int, matches: List[Dict]) -> bool:
+        """Egy forduló kész meccseinek mentése egyetlen tranzakcióban (hiba esetén semmi sem marad belőle)."""
+        if not matches:
+            return True
+        try:
+            saved = {}
+            with get_db_session() as session:
+                for m in matches:
+                    saved.update(self._save_match(round_number, m, session))
+        except Exception as e:
+            print(f"{round_number}. forduló mentése sikertelen, visszagörgetve: {e}")
+            return False
+        # Csak a sikeresen commitolt forduló kerül a már mentett meccsek közé
+        self._existing_matches.update(saved)
+        return True
+
+    def _listing_failed(self, round_number: int, error: Exception):
+        with self._progress_lock:
+            self._round_progress[round_number] = {"pending": 0, "failed": 1, "ready": []}
+        self.frontier.mark_failed(self._checkpoint_stage(), self.competition.round_url(round_number))
+
+    def _match_failed(self, m: Dict, error: Exception):
+        print(f"Meccs feldolgozása sikertelen: {m['home_team']} - {m['away_team']} ({error})")
+        self._match_finished(m["round"], None)
+
+    def _match_finished(self, round_number: int, m: Optional[Dict]):
+        """Egy meccs végzett (m=None: hibás); a forduló utolsó meccse után a forduló mentése."""
+        with self._progress_lock:
+            progress = self._round_progress[round_number]
+            progress["pending"] -= 1
+            if m is None:
+                progress["failed"] += 1
+            else:
+                progress["ready"].append(m)
+            finished = progress["pending"] == 0
+            ready = progress["ready"] if finished else []
+            if finished:
+                progress["ready"] = []
+        if not finished:
+            return
+        if not self._persist_round(round_number, ready):
+            with self._progress_lock:
+                progress["failed"] += 1
+        if progress["failed"]:
+            self.frontier.mark_failed(self._checkpoint_stage(), self.competition.round_url(round_number))
+        else:
+            self._mark_round_done(round_number)
+
+    def _mark_round_done(self, round_number: int):
+        url = self.competition.round_url(round_number)
+        self.frontier.mark_done(self._checkpoint_stage(), url)
+        self.frontier.set_checkpoint(self._checkpoint_stage(), "last_done", url)
+
+    @staticmethod
+    def refresh_aggregates():
+        """A szezon összesítők (player_season_stats, player_stats) újraszámolása a meccs statisztikákból."""
+        rows = refresh_player_stats()
+        print(f"Játékos összesítők frissítve ({rows} sor)")
+
+    def _save_match(self, round_number: int, m: Dict, session) -> Dict[Tuple, Dict]:
+        """Egy meccs mentése a megadott tranzakcióban; visszaadja a mentett meccs kulcsát (üres, ha kimaradt)."""
+        home_team_name = m["home_team"]
+        away_team_name = m["away_team"]
+        home_team_id = m["home_team_id"]
+        away_team_id = m["away_team_id"]
+
+        if m["status"] == "unknown_team":
+            print(f"Csapat nem található: {home_team_name} vagy {away_team_name}")
+            return {}
+
+        if m["status"] == "unchanged":
+            print(f"Meccs már létezik: {home_team_name} - {away_team_name}")
+            return {}
+
+        if not m.get("details_fetched"):
+            # Új meccs sem kerül be részletek (események, statisztikák) nélkül: a következő futás pótolja
+            print(f"Meccs részletek nem érhetők el, mentés kihagyva: {home_team_name} - {away_team_name}")
+            return {}
+
+        if m["status"] == "changed":
+            match_id = m["match_id"]
+            update_match_result(match_id, m["home_score"], m["away_score"], m["referee"], session=session)
+            delete_match_events(match_id, session=session)
+            print(f"Meccs eredménye frissítve: {home_team_name} {m['home_score']}-{m['away_score']} {away_team_name}")
+        else:
+            match_id = create_match(
+                season=self.competition.season_label,
+                round_num=round_number,
+                date=m["date"],
+                home_team_id=home_team_id,
+                away_team_id=away_team_id,
+                home_score=m["home_score"],
+                away_score=m["away_score"], 
+                stadium=m["arena"],
+                referee=m["referee"],
+                session=session
+            )
+            print(f"Meccs mentve: {home_team_name} - {away_team_name}")
+
+        self._save_match_events(m, match_id, session)
+        saved_stats = self._save_player_stats_for_match(m, home_team_name, away_team_name, match_id, session)
+        # Statisztika nélküli meccs a következő futásban "changed" lesz, és újra letöltődik
+        return {(home_team_id, away_team_id, m["date"], round_number): {
+            "match_id": match_id, "home_score": m["home_score"], "away_score": m["away_score"],
+            "has_stats": saved_stats > 0
+        }}
+
+    def _save_match_events(self, m: Dict, match_id: int, session):
+        """Egy meccs eseményeinek mentése (egyetlen batch-ben)."""
+        rows = []
+        for e in m["events"]:
+            team_name = m["home_team"] if e["team_side"] == "home" else m["away_team"]
+            team_id = m["home_team_id"] if e["team_side"] == "home" else m["away_team_id"]
+            player_id = self.identity.player_id(e["player"], team_id, session=session)
 
-                existing_match = get_match_by_teams_date_and_round(
-                    home_team_id=home_team_id,
-                    away_team_id=away_team_id, 
-                    date=m["date"],
-                    round_num=round_number
-                )
-                
-                if existing_match:
-                    print(f"Meccs már létezik: {home_team_name} - {away_team_name}")
+            if not player_id:
+                print(f"Játékos nem található: {e['player']} ({team_name})")
+                continue
+
+            rows.append({
+                "event_type": e["type"],
+                "minute": e["minute"],
+                "added_time": e["added_time"],
+                "player_id": player_id,
+                "team_id": team_id,
+            })
+            added = f"+{e['added_time']}" if e["added_time"] else ""
+            print(f"Esemény: {e['minute']}{added}' {e['player']} ({e['type']})")
+
+        bulk_create_match_events(match_id, rows, session=session)
+
+
+    def _save_player_stats_for_match(self, match_data: Dict, home_team_name: str, away_team_name: str,
+                                     match_id: int, session) -> int:
+        """Játékos statisztikák mentése egy meccshez (meccsenként egyetlen idempotens upserttel); a mentett sorok száma."""
+        rows = []
+        for team_side, team_name in (("home", home_team_name), ("away", away_team_name)):
+            team_id = match_data[f"{team_side}_team_id"]
+            for player_name, stats in match_data["player_stats"][team_side].items():
+                player_id = self.identity.player_id(player_name, team_id, session=session)
+                if not player_id:
+                    print(f"Játékos nem található statisztikához: {player_name} ({team_name})")
                     continue
+                rows.append({"player_id": player_id, "team_id": team_id, **stats})
 
-                match_id = create_match(
-                    season="2024/2025",
-                    round_num=round_number,
-                    date=m["date"],
-                    home_team_id=home_team_id,
-                    away_team_id=away_team_id,
-                    home_score=m["home_score"],
-                    away_score=m["away_score"], 
-                    stadium=m["arena"],
-                    referee=m["referee"]
-                )
-                print(f"Meccs mentve: {home_team_name} - {away_team_name}")
-
-                for e in m["events"]:
-                    team_name = home_team_name if e["team_side"] == "home" else away_team_name
-                    team_id = get_team_by_name(team_name)
-                    player_id = get_player_by_name_and_team_name(e["player"], team_name)
-
-                    if not player_id:
-                        print(f"Játékos nem található: {e['player']} ({team_name})")
-                        continue
-
-                    create_match_event(
-                        match_id=match_id,
-                        event_type=e["type"],
-                        minute=e["minute"],
-                        player_id=player_id,
-                        team_id=team_id,
-                    )
-                    print(f"Esemény: {e['minute']}' {e['player']} ({e['type']})")
-
-                self._save_player_stats_for_match(m, home_team_name, away_team_name, match_id)
-
-
-    def _save_player_stats_for_match(self, match_data: Dict, home_team_name: str, away_team_name: str, match_id: int):
-        """Játékos statisztikák mentése egy meccshez."""
-        print(f"Játékos statisztikák mentése...")
-        
-        # Hazai csapat statisztikái
-        for player_name, stats in match_data["player_stats"]["home"].items():
-            self._save_single_player_stats(player_name, home_team_name, stats, match_id)
-        
-        # Vendég csapat statisztikái
-        for player_name, stats in match_data["player_stats"]["away"].items():
-            self._save_single_player_stats(player_name, away_team_name, stats, match_id)
-
-
-    def _save_single_player_stats(self, player_name: str, team_name: str, stats: Dict, match_id: int):
-        """Egy játékos statisztikáinak mentése."""
-        try:
-            player_id = get_player_by_name_and_team_name(player_name, team_name)
-            if not player_id:
-                print(f"Játékos nem található statisztikához: {player_name} ({team_name})")
-                return
-            
-            team_id = get_team_by_name(team_name)
-            if not team_id:
-                print(f"Csapat nem található: {team_name}")
-                return
-                
-            matches_played = 1
-            goals = stats.get("goals", 0)
-            own_goals = stats.get("own_goals", 0)
-            yellow_cards = stats.get("yellow_cards", 0) 
-            red_cards = stats.get("red_cards", 0)
-            minutes_played = stats.get("minutes_played", 0)
-            
-            create_or_update_player_stats(
-                player_id=player_id,
-                team_id=team_id,
-                matches_played=matches_played,
-                goals=goals,
-                own_goals=own_goals,
-                yellow_cards=yellow_cards,
-                red_cards=red_cards,
-                minutes_played=minutes_played
-            )
-            
-            print(f"Statisztika mentve: {player_name} - +{goals}gól, +{own_goals}öngól, +{minutes_played}perc, +{yellow_cards}sárga, +{red_cards}piros")
-            
-        except Exception as e:
-            print(f"Hiba a statisztika mentésénél ({player_name}): {e}")
+        saved = upsert_player_match_stats(match_id, rows, session=session)
+        print(f"Játékos statisztikák mentve: {saved} játékos")
+        return saved
 
 if __name__ == "__main__":
     scraper = MatchAndMatchEventScraper()
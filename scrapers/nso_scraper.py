@@ -4,7 +4,7 @@ from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 import json
 from scrapers.base_scraper import BaseScraper
-from llm.injury_detector import LLMInjuryDetector
+from llm.injury_detector import get_shared_detector
 from database.db_operations import create_injury_article
 
 class NSOArticleScraper(BaseScraper):
@@ -16,7 +16,7 @@ class NSOArticleScraper(BaseScraper):
     def __init__(self):
         super().__init__()
         # NSO-specifikus header beállítások
-        self.session.headers.update({
+        self.headers.update({
             'User-Agent': 'NSO-Scraper/1.0 (University Project; Budapest; borcsiczkypatrik@gmail.com)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'hu-HU,hu;q=0.9,en;q=0.8',
@@ -37,25 +37,28 @@ class NSOArticleScraper(BaseScraper):
         """
         try:
             soup = self.get_soup(url, delay, max_retries)
-            
-            title = self._extract_title(soup)
-            article_text = self._extract_article_text(soup)
-            lead = self._extract_lead(soup)
-            publish_date = self._extract_publish_date(soup)
-            
-            return {
-                'title': title,
-                'lead': lead,
-                'text': article_text,
-                'publish_date': publish_date,
-                'url': url,
-                'source': 'Nemzeti Sport'
-            }
+            return self._parse_article(soup, url)
             
         except Exception as e:
             print(f"Hiba a cikk scrapelése közben ({url}): {e}")
             return None
 
+    def _parse_article(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+        """Egy már letöltött cikk oldal adatainak kinyerése"""
+        title = self._extract_title(soup)
+        article_text = self._extract_article_text(soup)
+        lead = self._extract_lead(soup)
+        publish_date = self._extract_publish_date(soup)
+        
+        return {
+            'title': title,
+            'lead': lead,
+            'text': article_text,
+            'publish_date': publish_date,
+            'url': url,
+            'source': 'Nemzeti Sport'
+        }
+
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Cikk címének kinyerése"""
         title = soup.find('h1', class_='article-header-title')
@@ -123,12 +126,18 @@ class NSOArticleScraper(BaseScraper):
         """
         articles = []
         
-        for i, url in enumerate(urls):
+        # A letöltés párhuzamosan megy, az ütemezést a fetch engine rate limitje végzi
+        soups = self.get_soups(urls, delay)
+        
+        for i, (url, soup) in enumerate(zip(urls, soups)):
             print(f"Cikk scrapelése ({i+1}/{len(urls)}): {url}")
+            if soup is None:
+                continue
             
-            article_data = self.scrape_article(url, delay)
-            if article_data:
-                articles.append(article_data)
+            try:
+                articles.append(self._parse_article(soup, url))
+            except Exception as e:
+                print(f"Hiba a cikk scrapelése közben ({url}): {e}")
         
         return articles
 
@@ -257,7 +266,7 @@ class NSOArticleScraper(BaseScraper):
             return None
 
     def scrape_and_save_to_db(self):
-        llm_detector = LLMInjuryDetector()
+        llm_detector = get_shared_detector()
 
         # 1. Összes cikk link lekérése a rovatról
         print("Cikk linkek gyűjtése a rovatról...")
@@ -266,6 +275,14 @@ class NSOArticleScraper(BaseScraper):
             print("Nem sikerült cikk linkeket gyűjteni!")
             return
         
+        # Egy megszakadt futásban már feldolgozott cikkek kihagyása
+        self.frontier.begin("articles")
+        self.frontier.plan("articles", article_urls)
+        article_urls = [url for url in article_urls if not self.frontier.should_skip("articles", url)]
+        if not article_urls:
+            self.frontier.finish("articles")
+            return
+        
         # 2. Összes cikk scrapelése
         print("Cikkek letöltése...")
         all_articles = self.scrape_multiple_articles(article_urls, delay=4.0)
@@ -328,6 +345,7 @@ class NSOArticleScraper(BaseScraper):
                             print("Nincs sérülés a cikkben")
                             article_data['injury_data'] = result_data
                             no_injury_articles.append(article_data)
+                            self.frontier.mark_done("articles", article_data['url'])
                             
                 except json.JSONDecodeError as e:
                     print(f"Az LLM válasz nem JSON formátumú: {e}")
@@ -339,19 +357,27 @@ class NSOArticleScraper(BaseScraper):
                     else:
                         print("Nincs sérülés a cikkben (manuális elemzés)")
                         no_injury_articles.append(article_data)
+                        self.frontier.mark_done("articles", article_data['url'])
                 except Exception as e:
                     print(f"Hiba az eredmény feldolgozásában: {e}")
                     error_articles.append(article_data)
+                    self.frontier.mark_failed("articles", article_data['url'])
             else:
                 print("Hiba: Nem sikerült kapni választ az LLM-től")
                 error_articles.append(article_data)
+                self.frontier.mark_failed("articles", article_data['url'])
             
         for i, article in enumerate(injury_articles, 1):
             injury_data = article.get('injury_data', {})
             print(f"\n{i}. {article['title']}")
             
+            player_id = None
+            if injury_data.get('player_name') and injury_data.get('team'):
+                player_id = self.identity.player_id_by_team_name(injury_data['player_name'], injury_data['team'])
+
             injury_id = create_injury_article(
                 url=article['url'],
+                player_id=player_id,
                 player_name=injury_data.get('player_name'),
                 team_name=injury_data.get('team'),
                 title=article.get('title'),
@@ -360,6 +386,9 @@ class NSOArticleScraper(BaseScraper):
                 duration=injury_data.get('recovery_time')
             )
             print(injury_id)
+            self.frontier.mark_done("articles", article['url'])
+        
+        self.frontier.finish("articles")
 
 if __name__ == "__main__":
     nso_scraper = NSOArticleScraper()
@@ -0,0 +1,104 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+ARCHIVE_PATH = os.getenv('PAGE_ARCHIVE_PATH', '.cache/archive')
+
+
+class ArchiveMissError(Exception):
+    """Replay módban a kért URL nincs az archívumban."""
+
+
+class PageArchive:
+    """
+    Tömörített, tartalom-címzett nyers HTML archívum.
+
+    A body-k sha256 hash alapján gzip fájlokba kerülnek (azonos tartalom egyszer
+    tárolódik), az index SQLite táblában URL és letöltési idő szerint kereshető.
+    """
+
+    def __init__(self, path: str = ARCHIVE_PATH):
+        self.path = path
+        self.objects_dir = os.path.join(path, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(path, "index.sqlite"), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_url_fetched ON pages (url, fetched_at)")
+        self._conn.commit()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def store(self, url: str, body: bytes) -> str:
+        """Body archiválása; ha az URL legutóbbi változata azonos, nem kerül új sor az indexbe."""
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, object_path)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256 FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+            ).fetchone()
+            if not row or row[0] != digest:
+                self._conn.execute(
+                    "INSERT INTO pages (url, sha256, size, fetched_at) VALUES (?, ?, ?, ?)",
+                    (url, digest, len(body), time.time())
+                )
+                self._conn.commit()
+        return digest
+
+    def latest(self, url: str, before: Optional[float] = None) -> Optional[bytes]:
+        """Az URL legutóbb archivált változata (opcionálisan egy időpont előttről)."""
+        query = "SELECT sha256 FROM pages WHERE url = ?"
+        params: Tuple = (url,)
+        if before is not None:
+            query += " AND fetched_at <= ?"
+            params = (url, before)
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        if not row:
+            return None
+        with gzip.open(self._object_path(row[0]), "rb") as f:
+            return f.read()
+
+    def history(self, url: str) -> List[Tuple[str, float]]:
+        """Egy URL összes archivált változata: [(sha256, fetched_at), ...]"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT sha256, fetched_at FROM pages WHERE url = ? ORDER BY fetched_at", (url,)
+            ).fetchall()
+
+    def urls(self, pattern: str = "%") -> List[str]:
+        """Archivált URL-ek listája (SQL LIKE minta szerint szűrve)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT url FROM pages WHERE url LIKE ? ORDER BY url", (pattern,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,143 @@
+import contextvars
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional
+
+from monitoring.metrics import PIPELINE_ITEMS, PIPELINE_ITEM_SECONDS, current_stage
+
+
+# Lépések közötti sorok mérete (backpressure: a teli sor megállítja az előző lépést)
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '16'))
+
+_DONE = object()
+
+
+class Step:
+    """
+    A pipeline egy lépése.
+
+    Args:
+        name: Lépés neve (riport, metrikák)
+        handler: handler(item, emit) - egy elem feldolgozása; a kimenetet emit(x)-szel
+            adja tovább a következő lépésnek (akár többet is, vagy egyet sem)
+        workers: Párhuzamos worker szálak száma
+        on_error: on_error(item, exc) - hibás elem kezelése; a hiba nem állítja meg a pipeline-t
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any, Callable[[Any], None]], None], workers: int = 1,
+                 on_error: Optional[Callable[[Any, Exception], None]] = None):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.on_error = on_error
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _record(self, elapsed: float, ok: bool):
+        with self._lock:
+            self.busy_seconds += elapsed
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+
+    def format_stats(self) -> str:
+        wall = (self.finished_at or time.perf_counter()) - (self.started_at or time.perf_counter())
+        rate = self.processed / wall if wall > 0 else 0.0
+        utilization = self.busy_seconds / (wall * self.workers) * 100 if wall > 0 else 0.0
+        return (f"{self.name}: {self.processed} kész, {self.failed} hibás, {rate:.2f} elem/s "
+                f"({self.workers} worker, {utilization:.0f}% kihasználtság)")
+
+
+class Pipeline:
+    """
+    Lépésekre bontott feldolgozás worker szálakkal és korlátos sorokkal.
+
+    Minden lépés a saját sorából olvas és a következő lépés sorába ír; a sorok
+    mérete korlátos, így a lassú lépés visszafogja az előtte lévőket (pl. a
+    letöltés nem szalad el a feldolgozás előtt). Egy elem hibája csak azt az
+    elemet érinti. A worker szálak öröklik a hívó metrika szakaszát.
+    """
+
+    def __init__(self, steps: List[Step], queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.steps = steps
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in steps]
+
+    def run(self, items: Iterable[Any]):
+        """Az elemek átfuttatása az összes lépésen; visszatér, amikor minden lépés végzett."""
+        remaining = [step.workers for step in self.steps]
+        lock = threading.Lock()
+        threads = []
+
+        for index, step in enumerate(self.steps):
+            step.started_at = time.perf_counter()
+            for n in range(step.workers):
+                context = contextvars.copy_context()
+                thread = threading.Thread(target=context.run, args=(self._work, index, remaining, lock),
+                                          name=f"pipeline-{step.name}-{n}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        for item in items:
+            self.queues[0].put(item)
+        for _ in range(self.steps[0].workers):
+            self.queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+    def _work(self, index: int, remaining: List[int], lock: threading.Lock):
+        step = self.steps[index]
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.queues) else None
+        stage_name = current_stage()
+        # A teli következő sorra várakozás (backpressure) nem számít bele a lépés munkaidejébe
+        blocked = [0.0]
+
+        def emit(output):
+            if outbox is None:
+                return
+            start = time.perf_counter()
+            outbox.put(output)
+            blocked[0] += time.perf_counter() - start
+
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            start = time.perf_counter()
+            blocked[0] = 0.0
+            try:
+                step.handler(item, emit)
+                ok = True
+            except Exception as e:
+                ok = False
+                print(f"[{step.name}] Hiba: {e}")
+                if step.on_error is not None:
+                    try:
+                        step.on_error(item, e)
+                    except Exception as handler_error:
+                        print(f"[{step.name}] Hibakezelő hiba: {handler_error}")
+            elapsed = time.perf_counter() - start - blocked[0]
+            step._record(elapsed, ok)
+            PIPELINE_ITEMS.inc(stage=stage_name, step=step.name, result="ok" if ok else "error")
+            PIPELINE_ITEM_SECONDS.observe(elapsed, stage=stage_name, step=step.name)
+
+        # Az utolsó kilépő worker zárja le a következő lépést
+        with lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last:
+            step.finished_at = time.perf_counter()
+            if outbox is not None:
+                for _ in range(self.steps[index + 1].workers):
+                    outbox.put(_DONE)
+
+    def format_report(self) -> str:
+        return "Pipeline áteresztőképesség:\n" + "\n".join(f"  {step.format_stats()}" for step in self.steps)
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import aiohttp
+
+
+# Átmeneti hibát jelző HTTP státuszok; minden más 4xx/5xx végleges (pl. 404-et nincs értelme ismételni)
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('SCRAPER_BREAKER_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.getenv('SCRAPER_BREAKER_RESET', '300'))
+MAX_BACKOFF = float(os.getenv('SCRAPER_MAX_BACKOFF', '60'))
+
+
+class CircuitOpenError(Exception):
+    """A host circuit breakere nyitva van, a kérés hálózati forgalom nélkül elutasítva."""
+
+
+class RetryPolicy:
+    """
+    Hibák osztályozása és várakozási idő számítása.
+
+    Exponenciális backoff "full jitter"-rel, a szerver Retry-After fejlécét
+    alsó korlátként tiszteletben tartva. Ha a Retry-After a max_retry_after
+    értéknél hosszabbat kér, nem várunk, hanem feladjuk a kérést.
+    """
+
+    def __init__(self, max_delay: float = MAX_BACKOFF, max_retry_after: float = 300.0):
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        if isinstance(exc, aiohttp.ClientResponseError):
+            return exc.status in RETRYABLE_STATUSES
+        return isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+    def retry_after(self, exc: BaseException) -> Optional[float]:
+        """A Retry-After fejléc másodpercben (szám vagy HTTP dátum formátum)."""
+        headers = getattr(exc, "headers", None)
+        value = headers.get("Retry-After") if headers else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def backoff(self, attempt: int, exc: BaseException, base_delay: float) -> Optional[float]:
+        """Várakozás a következő próbálkozás előtt; None, ha nem érdemes újrapróbálni."""
+        delay = random.uniform(0, min(self.max_delay, base_delay * (2 ** attempt)))
+        retry_after = self.retry_after(exc)
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Hostonkénti circuit breaker.
+
+    `failure_threshold` egymást követő átmeneti hiba után kinyit, és `reset_timeout`
+    másodpercig minden kérést azonnal elutasít. Utána egy próbakérést enged át
+    (half-open): siker esetén bezár, hiba esetén újra kinyit.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        """
+        A próbakérés vége eredmény nélkül (pl. nem hálózati kivétel vagy megszakítás).
+
+        Az állapot half-open marad, a következő kérés újra próbálkozhat; enélkül a beragadt
+        jelző miatt a host minden további kérése elutasításra kerülne.
+        """
+        self._trial_in_flight = False
@@ -1,22 +1,33 @@
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 from scrapers.base_scraper import BaseScraper
+from scrapers.competitions import Competition, get_competition
+from database.database import get_db_session
 from database.db_operations import (
-    create_or_update_standing,
-    get_team_by_name,
+    STANDING_FIELDS,
+    bulk_upsert_standings,
+    get_max_standing_round,
 )
+from database.standings_engine import SeasonTable
 
 class StandingScraper(BaseScraper):
     """Scraper az MLSZ adatbankból a tabella adatainak kinyerésére."""
 
-    BASE_URL = "https://adatbank.mlsz.hu/league/65/0/31362/{}.html"
+    def __init__(self, competition: Optional[Competition] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.competition = competition or get_competition()
+        # Egy futáson belül már letöltött forduló tabellák
+        self._probed: Dict[int, List[Dict]] = {}
 
     def scrape_round(self, round_number: int) -> List[Dict]:
         """Egy adott forduló tabellájának lekérése."""
-        print(f"{round_number}. forduló tabellájának letöltése...")
-        url = self.BASE_URL.format(round_number)
+        print(f"{self.competition.name}: {round_number}. forduló tabellájának letöltése...")
+        url = self.competition.round_url(round_number)
         soup = self.get_soup(url)
+        return self._parse_round_table(soup, round_number)
 
+    def _parse_round_table(self, soup: BeautifulSoup, round_number: int) -> List[Dict]:
+        """A forduló oldal tabellájának kinyerése (üres lista, ha a forduló még nincs lejátszva)."""
         standings = []
 
         team_sorsolas_div = soup.find("div", class_="schedule_box")
@@ -129,12 +140,14 @@ class StandingScraper(BaseScraper):
             print(f"Hiba egy tabella sor feldolgozásakor: {e}")
             return None
 
-    def scrape_all_rounds(self) -> Dict[int, List[Dict]]:
-        """Az összes forduló tabellájának lekérése."""
+    def scrape_all_rounds(self, start_round: int = 1) -> Dict[int, List[Dict]]:
+        """Az összes (start_round-tól kezdődő) forduló tabellájának lekérése."""
         all_standings = {}
 
-        for round_number in range(1, 34):  # 33 forduló az NB1-ben
-            standings = self.scrape_round(round_number)
+        for round_number in self.competition.round_numbers():
+            if round_number < start_round:
+                continue
+            standings = self._round_standings(round_number)
             if standings:
                 all_standings[round_number] = standings
                 print(f"{round_number}. forduló tabellája sikeresen letöltve ({len(standings)} csapat)")
@@ -146,32 +159,94 @@ class StandingScraper(BaseScraper):
 
     def save_standings_to_db(self):
         """Az összes forduló tabellájának letöltése és adatbázisba mentése."""
-        all_standings = self.scrape_all_rounds()
+        rounds = [(self.competition.round_url(n), n) for n in self.competition.round_numbers()]
+        self.run_checkpointed(f"standings:{self.competition.key}", rounds, self._scrape_and_save_round)
+
+    def save_new_standings(self):
+        """
+        Csak a legutóbb mentett forduló utáni tabellák letöltése és mentése.
+
+        A lejátszott fordulók tabellája utólag nem változik, ezért a szezon mentett
+        maximumától előre haladva az első még le nem játszott fordulóig tölt le
+        (hetente általában 1-2 oldal). Ha a szezonhoz még nincs tabella, az 1.
+        fordulótól tölt le mindent (a korábbi fordulók is bekerülnek).
+        """
+        last_saved = get_max_standing_round(self.competition.season_label)
+        if last_saved is not None:
+            start = last_saved + 1
+            print(f"{self.competition.name}: tabella mentve a {last_saved}. fordulóig, innen folytatva")
+        else:
+            start = 1
+            print(f"{self.competition.name}: még nincs mentett tabella, teljes letöltés az 1. fordulótól")
+
+        # Külön checkpoint szakasz: a teljes letöltés (standings:) elkészült fordulói itt nem számítanak
+        rounds = [(self.competition.round_url(n), n) for n in self.competition.round_numbers() if n >= start]
+        self.run_checkpointed(f"new_standings:{self.competition.key}", rounds, self._scrape_and_save_round)
+
+    def _round_standings(self, round_number: int) -> List[Dict]:
+        if round_number not in self._probed:
+            self._probed[round_number] = self.scrape_round(round_number)
+        return self._probed[round_number]
+
+    def _scrape_and_save_round(self, round_number: int) -> bool:
+        standings = self._round_standings(round_number)
+        if not standings:
+            print(f"{round_number}. forduló még nincs lejátszva")
+            return False
+        print(f"{round_number}. forduló tabellája sikeresen letöltve ({len(standings)} csapat)")
+        self.save_round_standings(round_number, standings)
+        return True
+
+    def cross_check(self, table: SeasonTable, round_number: Optional[int] = None) -> List[str]:
+        """
+        A meccsekből számolt tabella összevetése az MLSZ tabellájával (alapból az utolsó számolt forduló).
+
+        Egyetlen forduló oldalt tölt le, és csak az eltéréseket jelenti; az adatbázisba nem ír.
+        """
+        round_number = round_number or table.rounds
+        scraped = self.scrape_round(round_number)
+        if not scraped:
+            print(f"{self.competition.name}: {round_number}. forduló tabellája nem érhető el, ellenőrzés kihagyva")
+            return []
+
+        computed = {row["team_id"]: row for row in table.round_rows(round_number)}
+        differences = []
+        for standing in scraped:
+            team_id = self.identity.team_id(standing["team_name"])
+            row = computed.pop(team_id, None)
+            if row is None:
+                differences.append(f"{standing['team_name']}: nincs a számolt tabellában")
+                continue
+            fields = [f"{field} {row[field]} != {standing[field]}"
+                      for field in STANDING_FIELDS if row[field] != standing[field]]
+            if fields:
+                differences.append(f"{standing['team_name']}: " + ", ".join(fields))
+        differences.extend(f"team_id={team_id}: nincs az MLSZ tabellában" for team_id in computed)
+
+        if differences:
+            print(f"{self.competition.name}: {round_number}. forduló tabellája eltér (számolt != MLSZ):")
+            for difference in differences:
+                print(f"  {difference}")
+        else:
+            print(f"{self.competition.name}: {round_number}. forduló tabellája egyezik az MLSZ tabellájával")
+        return differences
 
-        for round_number, standings in all_standings.items():
+    def save_round_standings(self, round_number: int, standings: List[Dict]):
+        """Egy forduló tabellájának mentése (egyetlen tranzakcióban, batch upserttel)."""
+        with get_db_session() as session:
+            rows = []
             for standing in standings:
-                team_id = get_team_by_name(str(standing.get('team_name')))
-                print(f"TEAM ID: {team_id}")
+                team_id = self.identity.team_id(str(standing.get('team_name')), session=session)
 
                 if team_id:
-                    create_or_update_standing(
-                        season="2025/26",
-                        team_id=team_id,
-                        round_num=round_number,
-                        position=standing["position"],
-                        matches_played=standing["matches_played"],
-                        wins=standing["wins"],
-                        draws=standing["draws"],
-                        losses=standing["losses"],
-                        goals_for=standing["goals_for"],
-                        goals_against=standing["goals_against"],
-                        goal_difference=standing["goal_difference"],
-                        points=standing["points"]
-                    )
-                    print(f"Tabella mentve: {standing['position']}. {standing['team_name']} ({standing['points']} pont)")
+                    rows.append({**standing, "team_id": team_id})
+                    print(f"Tabella: {standing['position']}. {standing['team_name']} ({standing['points']} pont)")
                 else:
                     print(f"Csapat nem található: {standing['team_name']}")
 
+            saved = bulk_upsert_standings(self.competition.season_label, round_number, rows, session=session)
+        print(f"{round_number}. forduló tabellája mentve ({saved} csapat)")
+
 
 if __name__ == "__main__":
     scraper = StandingScraper()
@@ -1,36 +1,48 @@
+import os
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from bs4 import BeautifulSoup
 from scrapers.base_scraper import BaseScraper
+from scrapers.competitions import Competition, get_competition
+from database.database import get_db_session
+from database.identity import normalize_name
 from database.db_operations import (
     create_team, 
-    create_player, 
-    link_player_to_team,
-    get_team_by_name,
-    get_player_by_name_and_team_name
+    bulk_create_players,
+    bulk_link_players_to_team,
+    bulk_update_player_profiles,
+    get_known_players_by_team_name
 )
 
+# Ennyi nap után a már ismert játékosok adatlapját is újra ellenőrizzük
+PLAYER_PROFILE_TTL_DAYS = int(os.getenv('PLAYER_PROFILE_TTL_DAYS', '180'))
+
 
 class TeamAndPlayersScraper(BaseScraper):
-    """MLSZ Adatbank scraper NB1 csapatokhoz és játékosokhoz"""
+    """MLSZ Adatbank scraper egy sorozat csapataihoz és játékosaihoz"""
     
-    def __init__(self, season: str = "2024/2025", league_id: int = 31362):
-        super().__init__()
-        self.season = season
-        self.league_id = league_id
+    def __init__(self, competition: Optional[Competition] = None,
+                 incremental: bool = True, profile_ttl_days: int = PLAYER_PROFILE_TTL_DAYS, **kwargs):
+        super().__init__(**kwargs)
+        self.competition = competition or get_competition()
+        # Inkrementális módban csak az új / hiányos / elavult játékos adatlapokat töltjük le
+        self.incremental = incremental
+        self.profile_ttl = timedelta(days=profile_ttl_days)
     
-    def scrape_all_teams(self, season: int = 65, round: int = 11) -> List[Dict]:
+    def scrape_all_teams(self) -> List[Dict]:
         """
-        Összeszedi az összes csapat alapadatait az NB1-ből.
+        Összeszedi a sorozat összes csapatának alapadatait.
         
-        Args:
-            season: Évad ID (65 = 2024/2025)
-            round: Forduló szám
+        A csapatlistát a sorozat discovery klubjának oldaláról olvassuk
+        (ez tartalmazza a sorozat összes csapatát).
             
         Returns:
             Lista dictekkel: [{"name": str, "url": str}, ...]
         """
-        url = f"club/{season}/0/{self.league_id}/{round}/307004.html"  # DVSC oldal (de tartalmazza az összes csapatot)
+        url = self.competition.club_discovery_url()
+        if url is None:
+            print(f"{self.competition.name}: nincs megadva discovery klub, a csapatlista kimarad")
+            return []
         soup = self.get_soup(url)
         
         teams = []
@@ -95,21 +107,33 @@ class TeamAndPlayersScraper(BaseScraper):
                 else:
                     team_data["website"] = ""
         
-        # Játékosok listája
-        team_data["players"] = self._scrape_players_from_team_page(soup)
+        # Játékosok listája (inkrementális módban az ismert játékosok adatlapja kimarad)
+        known_players = {}
+        if self.incremental and team_data.get("name"):
+            known_players = get_known_players_by_team_name(team_data["name"])
+        team_data["players"] = self._scrape_players_from_team_page(soup, known_players)
         
         return team_data
     
-    def _scrape_players_from_team_page(self, soup: BeautifulSoup) -> List[Dict]:
+    def _needs_profile(self, known: Optional[Dict]) -> bool:
+        """Kell-e letölteni a játékos adatlapját (új, hiányzó születési dátum vagy lejárt TTL)."""
+        if known is None or known["birth_date"] is None or known["profile_checked_at"] is None:
+            return True
+        checked_at = known["profile_checked_at"].replace(tzinfo=None)
+        return datetime.now(timezone.utc).replace(tzinfo=None) - checked_at > self.profile_ttl
+    
+    def _scrape_players_from_team_page(self, soup: BeautifulSoup, known_players: Optional[Dict] = None) -> List[Dict]:
         """
         Játékosok kinyerése a csapat oldaláról.
         
         Args:
             soup: BeautifulSoup object a csapat oldaláról
+            known_players: Az adatbázisban már ismert játékosok (normalize_name(név) -> adatok)
             
         Returns:
-            Lista: [{"name": str, "url": str, "birth_date": date}, ...]
+            Lista: [{"name": str, "url": str, "birth_date": date, "profile_fetched": bool}, ...]
         """
+        known_players = known_players or {}
         players = []
         
         # class="content playersTab jatekos_panel inactive_panel"
@@ -123,6 +147,7 @@ class TeamAndPlayersScraper(BaseScraper):
         if not tbody:
             return players
 
+        rows = []
         for row in tbody.find_all("tr"):
             player_link = row.find("a")
             if not player_link:
@@ -130,11 +155,30 @@ class TeamAndPlayersScraper(BaseScraper):
             
             player_name = player_link.find("span", class_="playerName")
             player_url = player_link.get("href")
+            rows.append((player_name.text.strip() if player_name else "", player_url))
+        
+        # Játékos adatlapok párhuzamos letöltése (csak ahol szükséges)
+        profile_urls = [
+            player_url for name, player_url in rows
+            if player_url and self._needs_profile(known_players.get(normalize_name(name)))
+        ]
+        profile_soups = dict(zip(profile_urls, self.get_soups(profile_urls)))
+        print(f"Játékos adatlapok: {len(profile_urls)} letöltve, {len(rows) - len(profile_urls)} kihagyva (ismert)")
+        
+        for name, player_url in rows:
+            if player_url not in profile_soups:
+                known = known_players.get(normalize_name(name))
+                players.append({
+                    "name": name,
+                    "url": player_url,
+                    "birth_date": known["birth_date"] if known else None,
+                    "profile_fetched": False
+                })
+                continue
             
             birth_date = None
-            if player_url:
-                player_soup = self.get_soup(player_url)
-
+            player_soup = profile_soups.get(player_url)
+            if player_soup:
                 birth_td_label = player_soup.find("td", string="Születési idő")
                 if birth_td_label:
                     birth_td = birth_td_label.find_next_sibling("td")
@@ -142,9 +186,10 @@ class TeamAndPlayersScraper(BaseScraper):
                         birth_date = birth_td.text.strip()
             
             players.append({
-                "name": player_name.text.strip() if player_name else "",
+                "name": name,
                 "url": player_url,
-                "birth_date": self._parse_date(birth_date)
+                "birth_date": self._parse_date(birth_date),
+                "profile_fetched": player_soup is not None
             })
         
         return players
@@ -169,47 +214,64 @@ class TeamAndPlayersScraper(BaseScraper):
         """
         Összeszedi az összes csapatot és menti az adatbázisba.
         """
-        print("Csapatok letöltése...")
+        print(f"{self.competition.name}: csapatok letöltése...")
         teams_list = self.scrape_all_teams()
         
-        for team_info in teams_list:
-            print(f"\nFeldolgozás: {team_info['name']}")
-            
-            # Részletes adatok lekérése
-            team_details = self.scrape_team_details(team_info["url"])
-            
-            # Csapat mentése
-            team_id = get_team_by_name(team_details["name"])
+        units = [(team_info["url"], team_info) for team_info in teams_list]
+        self.run_checkpointed(f"teams:{self.competition.key}", units, self._save_team)
+        
+        print("\nMinden csapat és játékos mentve az adatbázisba!")
+
+    def _save_team(self, team_info: Dict):
+        """Egy csapat és játékosainak letöltése és mentése."""
+        print(f"\nFeldolgozás: {team_info['name']}")
+        
+        # Részletes adatok lekérése
+        team_details = self.scrape_team_details(team_info["url"])
+        
+        # Csapat és játékosok mentése egyetlen tranzakcióban
+        with get_db_session() as session:
+            team_id = self.identity.team_id(team_details["name"], session=session)
             if not team_id:
                 team_id = create_team(
                     name=team_details["name"],
                     address=team_details.get("address", ""),
-                    website=team_details.get("website", "")
+                    website=team_details.get("website", ""),
+                    session=session
                 )
                 print(f"Csapat létrehozva: {team_details['name']} (ID: {team_id})")
             else:
                 print(f"Csapat már létezik: {team_details['name']}")
             
-            # Játékosok mentése
+            # Új játékosok és kapcsolatok egy-egy batch-ben
+            known_players = get_known_players_by_team_name(team_details["name"], session=session)
+            new_players = {}
+            checked_profiles = []
             for player_info in team_details["players"]:
-                player_name = player_info["name"]
-                birth_date = player_info.get("birth_date")
-                
-                existing_player = get_player_by_name_and_team_name(player_name, team_details["name"])
-                
-                if not existing_player:
-                    player_id = create_player(
-                        name=player_name,
-                        birth_date=birth_date
-                    )
-                    print(f"Játékos létrehozva: {player_name}")
-                    # Kapcsolat létrehozása
-                    link_player_to_team(player_id, team_id)
-                else:
-                    print(f"Játékos már létezik: {player_name}")
-                
-        
-        print("\nMinden csapat és játékos mentve az adatbázisba!")
+                key = normalize_name(player_info["name"])
+                profile_checked_at = datetime.now(timezone.utc) if player_info.get("profile_fetched") else None
+                known = known_players.get(key)
+
+                if known is None:
+                    new_players.setdefault(key, {
+                        "name": player_info["name"],
+                        "birth_date": player_info.get("birth_date"),
+                        "profile_checked_at": profile_checked_at
+                    })
+                elif profile_checked_at:
+                    # Újraellenőrzött adatlap: születési dátum és ellenőrzési idő frissítése
+                    checked_profiles.append({"player_id": known["player_id"], "birth_date": player_info.get("birth_date")})
+
+            player_ids = bulk_create_players(list(new_players.values()), session=session)
+            bulk_link_players_to_team(team_id, player_ids, session=session)
+            bulk_update_player_profiles(checked_profiles, session=session)
+
+        # Az azonosító cache csak a commit után frissül
+        self.identity.register_team(team_details["name"], team_id)
+        for player, player_id in zip(new_players.values(), player_ids):
+            self.identity.register_player(player["name"], team_id, player_id)
+        print(f"Játékosok: {len(player_ids)} létrehozva, {len(known_players)} már ismert, "
+              f"{len(checked_profiles)} adatlap frissítve")
 
 
 # Használat
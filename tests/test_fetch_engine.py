@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from scrapers.fetch_engine import FetchEngine, FetchResponse, TokenBucket, _parse_host_rps
+from scrapers.http_cache import HttpCache
+
+
+def test_parse_host_rps_skips_invalid_items():
+    assert _parse_host_rps("adatbank.mlsz.hu=0.5, WWW.Nemzetisport.hu=0.25,hibas,x=abc") == {
+        "adatbank.mlsz.hu": 0.5,
+        "www.nemzetisport.hu": 0.25,
+    }
+
+
+def test_token_bucket_limits_rate():
+    async def take(n):
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # Az első token azonnal elérhető, utána 1/20 s-onként jön egy
+    elapsed = asyncio.run(take(5))
+    assert 0.18 <= elapsed < 0.5
+
+
+def test_token_bucket_burst_up_to_capacity():
+    async def take(n):
+        bucket = TokenBucket(rate=1, capacity=3)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(take(3)) < 0.05
+
+
+def test_fresh_fetch_bypasses_ttl_cache(tmp_path):
+    url = "https://adatbank.mlsz.hu/match/1/2/3/4/5.html"
+    cache = HttpCache(str(tmp_path / "cache.sqlite"))
+    cache.store(url, b"regi", {})
+    engine = FetchEngine(cache=cache)
+    requests = []
+
+    async def fake_fetch_with_retry(url, headers, max_retries, backoff):
+        requests.append(url)
+        return FetchResponse(url, 200, {}, b"uj")
+
+    engine._fetch_with_retry = fake_fetch_with_retry
+    try:
+        # TTL-en belül a cache szolgál ki, fresh=True esetén a hálózat
+        assert engine.fetch(url).body == b"regi"
+        assert requests == []
+        assert engine.fetch(url, fresh=True).body == b"uj"
+        assert requests == [url]
+        assert cache.get(url).body == b"uj"
+    finally:
+        engine.close()
+        cache.close()
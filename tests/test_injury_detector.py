@@ -0,0 +1,48 @@
+import requests
+
+from llm.injury_detector import LLMInjuryDetector
+from monitoring.metrics import LLM_DURATION
+
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.data = data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self, result):
+        self.result = result
+
+    def post(self, url, json, timeout):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def observed_count(model, status):
+    return sum(item["count"] for item in LLM_DURATION.snapshot()
+               if item["labels"]["model"] == model and item["labels"]["status"] == status)
+
+
+def test_latency_recorded_for_failed_queries():
+    cases = [
+        (requests.Timeout("lassú"), "timeout"),
+        (FakeResponse(500, {}), "500"),
+        (FakeResponse(200, {"response": "{}"}), "200"),
+    ]
+    for result, status in cases:
+        detector = LLMInjuryDetector(model_name="teszt-modell")
+        detector.session = FakeSession(result)
+        before = observed_count("teszt-modell", status)
+
+        detector.query_ollama("prompt")
+
+        assert observed_count("teszt-modell", status) == before + 1
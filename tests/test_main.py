@@ -0,0 +1,50 @@
+import argparse
+
+import pytest
+
+import main
+from main import parse_rounds, run_per_competition
+from monitoring.metrics import current_stage, stage
+from scrapers.competitions import Competition
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("12", [12]),
+    ("5-9", [5, 6, 7, 8, 9]),
+    ("1,3,5-7", [1, 3, 5, 6, 7]),
+    ("7,1-3,2", [1, 2, 3, 7]),
+])
+def test_parse_rounds(value, expected):
+    assert parse_rounds(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "a-b", "1,,2", "5-"])
+def test_parse_rounds_rejects_invalid(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_rounds(value)
+
+
+def test_run_per_competition_runs_all_and_raises_first_error():
+    competitions = [Competition(key=key, name=key, league_id=1, season_id=1, season_label="2025/26",
+                                rounds=10, matches_per_round=2)
+                    for key in ("a", "b", "c")]
+    seen = []
+
+    def work(competition):
+        seen.append((competition.key, current_stage()))
+        if competition.key == "b":
+            raise RuntimeError("hiba")
+
+    with stage("matches"), pytest.raises(RuntimeError, match="hiba"):
+        run_per_competition(competitions, work)
+
+    assert sorted(seen) == [("a", "matches"), ("b", "matches"), ("c", "matches")]
+
+
+def test_check_database_schema_refuses_outdated_schema(monkeypatch):
+    monkeypatch.setattr(main, "schema_revisions", lambda: ("0003_lookup_indexes", "0005_name_key_indexes"))
+    with pytest.raises(RuntimeError, match="--migrate"):
+        main.check_database_schema()
+
+    monkeypatch.setattr(main, "schema_revisions", lambda: ("0005_name_key_indexes", "0005_name_key_indexes"))
+    main.check_database_schema()
@@ -0,0 +1,100 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from scrapers.match_events import (
+    EXTRA_TIME_LENGTH,
+    MATCH_LENGTH,
+    extract_match_events,
+    match_length_for_events,
+    minutes_played,
+    parse_minute,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("67'", (67, 0)),
+    ("90+3'", (90, 3)),
+    ("45 + 2", (45, 2)),
+    ("105'", (105, 0)),
+    ("", None),
+    ("-", None),
+])
+def test_parse_minute(text, expected):
+    assert parse_minute(text) == expected
+
+
+def sub(minute, is_sub_in):
+    return {"type": "substitution", "minute": minute, "is_sub_in": is_sub_in}
+
+
+def red(minute):
+    return {"type": "red_card", "minute": minute}
+
+
+@pytest.mark.parametrize("events, is_starter, expected", [
+    ([], True, 90),
+    ([], False, 0),
+    ([sub(60, False)], True, 60),
+    ([sub(70, True)], False, 20),
+    ([sub(46, True), sub(80, False)], False, 34),
+    ([red(30)], True, 30),
+    ([sub(90, True)], False, 0),
+    ([sub(95, False)], True, 90),  # ráadás / perc a meccs hosszára vágva
+])
+def test_minutes_played(events, is_starter, expected):
+    assert minutes_played(events, is_starter) == expected
+
+
+def test_minutes_played_in_extra_time():
+    assert minutes_played([], True, EXTRA_TIME_LENGTH) == 120
+    assert minutes_played([sub(100, True)], False, EXTRA_TIME_LENGTH) == 20
+
+
+def test_match_length_for_events():
+    assert match_length_for_events([{"minute": 90, "added_time": 4}]) == MATCH_LENGTH
+    assert match_length_for_events([{"minute": 12}, {"minute": 113}]) == EXTRA_TIME_LENGTH
+    assert match_length_for_events([]) == MATCH_LENGTH
+
+
+def player_row(name, *events):
+    spans = "".join(f'<span style="background-image: url(/img/{icon})">{minute}</span>' for icon, minute in events)
+    return (f'<tr class="template-tr-selectable"><td class="match_players_name"><a href="#">{name}</a></td>'
+            f'<td class="match_players_cards">{spans}</td></tr>')
+
+
+def team_div(div_id, starters, substitutes):
+    return (f'<div id="{div_id}"><table>{"".join(starters)}</table>'
+            f'<table class="replacement">{"".join(substitutes)}</table></div>')
+
+
+def match_html(home_events=(), away_events=()):
+    home = team_div("left_team",
+                    [player_row("Kezdő Egy", *home_events), player_row("Kezdő Kettő", ("event_swap.png", "64'"))],
+                    [player_row("Csere Három", ("event_swap.png", "64'"), ("event_goal.png", "90+2'"))])
+    away = team_div("right_team", [player_row("Vendég Egy", *away_events)], [])
+    return BeautifulSoup(f'<div class="match_teams_players">{home}{away}</div>', "html.parser").div
+
+
+def test_extract_match_events_pairs_substitutions_and_counts_stats():
+    events, stats = extract_match_events(match_html(home_events=[("event_yellowcard.png", "12'")]))
+
+    assert [(e["minute"], e["added_time"], e["type"]) for e in events] == [
+        (12, 0, "yellow_card"), (64, 0, "substitution"), (64, 0, "substitution"), (90, 2, "goal")]
+    swaps = {e["player"]: e for e in events if e["type"] == "substitution"}
+    assert swaps["Csere Három"]["is_sub_in"] and swaps["Csere Három"]["partner"] == "Kezdő Kettő"
+    assert not swaps["Kezdő Kettő"]["is_sub_in"]
+
+    home = stats["home"]
+    assert home["Kezdő Egy"]["yellow_cards"] == 1
+    assert home["Csere Három"]["goals"] == 1
+    assert (home["Kezdő Egy"]["minutes_played"], home["Kezdő Kettő"]["minutes_played"],
+            home["Csere Három"]["minutes_played"]) == (90, 64, 26)
+    assert stats["away"]["Vendég Egy"]["minutes_played"] == 90
+
+
+def test_extra_time_event_of_either_team_extends_both_teams_minutes():
+    events, stats = extract_match_events(match_html(away_events=[("event_goal.png", "108'")]))
+
+    assert stats["away"]["Vendég Egy"]["minutes_played"] == 120
+    assert stats["home"]["Kezdő Egy"]["minutes_played"] == 120
+    assert stats["home"]["Csere Három"]["minutes_played"] == 56
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from scrapers.competitions import Competition
+from scrapers.match_scraper import MatchAndMatchEventScraper
+
+COMPETITION = Competition(key="teszt", name="Teszt liga", league_id=1, season_id=1, season_label="2025/26",
+                          rounds=10, matches_per_round=2)
+
+
+class FakeIdentity:
+    TEAMS = {"FTC": 1, "PAKS": 2, "DVSC": 3, "ETO": 4}
+
+    def team_id(self, name):
+        return self.TEAMS.get(name)
+
+
+def make_scraper(existing=None, match_counts=None, incremental=True):
+    """Scraper hálózat, frontier és adatbázis nélkül (csak a tervezési / osztályozási logikához)"""
+    scraper = MatchAndMatchEventScraper.__new__(MatchAndMatchEventScraper)
+    scraper.competition = COMPETITION
+    scraper.incremental = incremental
+    scraper.identity = FakeIdentity()
+    scraper._existing_matches = existing or {}
+    counts = match_counts or {}
+    scraper.first_incomplete_round = lambda: next(
+        (n for n in COMPETITION.round_numbers() if counts.get(n, 0) < COMPETITION.matches_per_round), None)
+    return scraper
+
+
+def listing(home, away, home_score, away_score, date="2025-08-01"):
+    return {"home_team": home, "away_team": away, "home_score": home_score, "away_score": away_score,
+            "date": date, "url": f"match/{home}-{away}.html"}
+
+
+def test_classify_matches():
+    existing = {
+        (1, 2, "2025-08-01", 1): {"match_id": 10, "home_score": 2, "away_score": 0, "has_stats": True},
+        (3, 4, "2025-08-01", 1): {"match_id": 11, "home_score": 1, "away_score": 1, "has_stats": True},
+        (2, 1, "2025-08-01", 1): {"match_id": 12, "home_score": 0, "away_score": 0, "has_stats": False},
+    }
+    matches = [
+        listing("FTC", "PAKS", 2, 0),
+        listing("DVSC", "ETO", 2, 1),
+        listing("PAKS", "FTC", 0, 0),
+        listing("FTC", "DVSC", 3, 0),
+        listing("FTC", "ISMERETLEN", 1, 0),
+    ]
+    make_scraper(existing).classify_matches(1, matches)
+
+    assert [m["status"] for m in matches] == ["unchanged", "changed", "changed", "new", "unknown_team"]
+    assert [m.get("match_id") for m in matches[:4]] == [10, 11, 12, None]
+
+
+@pytest.mark.parametrize("counts, since_round, incremental, expected", [
+    ({1: 2, 2: 2, 3: 1}, None, True, [3, 4, 5, 6, 7, 8, 9, 10]),
+    ({1: 2, 2: 2, 3: 1}, None, False, list(range(1, 11))),
+    ({}, 8, True, [8, 9, 10]),
+    ({n: 2 for n in range(1, 11)}, None, True, []),
+])
+def test_plan_rounds(counts, since_round, incremental, expected):
+    scraper = make_scraper(match_counts=counts, incremental=incremental)
+    assert scraper.plan_rounds(since_round=since_round) == expected
+
+
+def test_plan_rounds_explicit_rounds_ignore_database():
+    scraper = make_scraper(match_counts={n: 2 for n in range(1, 11)})
+    assert scraper.plan_rounds(rounds=[2, 5, 11]) == [2, 5]
+
+
+class FakeFrontier:
+    def __init__(self):
+        self.done, self.failed = [], []
+
+    def mark_done(self, stage, url):
+        self.done.append(url)
+
+    def mark_failed(self, stage, url):
+        self.failed.append(url)
+
+    def set_checkpoint(self, stage, key, value):
+        pass
+
+
+def make_pipeline_scraper(pending):
+    scraper = make_scraper()
+    scraper.frontier = FakeFrontier()
+    scraper._progress_lock = threading.Lock()
+    scraper._round_progress = {1: {"pending": pending, "failed": 0, "ready": []}}
+    scraper.persisted = []
+    scraper._persist_round = lambda round_number, matches: scraper.persisted.append(
+        (round_number, [m["home_team"] for m in matches])) or True
+    return scraper
+
+
+def detailed(home, away):
+    return {**listing(home, away, 1, 0), "round": 1, "details_fetched": True}
+
+
+def test_round_persisted_once_after_its_last_match():
+    scraper = make_pipeline_scraper(pending=2)
+
+    scraper._pipeline_persist(detailed("FTC", "PAKS"), None)
+    assert scraper.persisted == []
+
+    scraper._pipeline_persist(detailed("DVSC", "ETO"), None)
+    assert scraper.persisted == [(1, ["FTC", "DVSC"])]
+    assert scraper.frontier.done == [COMPETITION.round_url(1)]
+
+
+def test_round_with_failed_match_saves_the_rest_and_stays_open():
+    scraper = make_pipeline_scraper(pending=2)
+    failed = {**detailed("DVSC", "ETO"), "details_fetched": False}
+
+    scraper._pipeline_persist(detailed("FTC", "PAKS"), None)
+    with pytest.raises(RuntimeError):
+        scraper._pipeline_persist(failed, None)
+    scraper._match_failed(failed, RuntimeError("nincs részlet"))
+
+    assert scraper.persisted == [(1, ["FTC"])]
+    assert scraper.frontier.failed == [COMPETITION.round_url(1)]
+    assert scraper.frontier.done == []
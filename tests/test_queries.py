@@ -0,0 +1,120 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from database.models import InjuryArticle, Match, MatchEvent, Player, Standing, Team, TeamPlayer
+from database.queries import (
+    count_queries,
+    get_match_detail,
+    get_round_table,
+    get_team_squad,
+    list_injured_players,
+    list_matches,
+    list_teams,
+)
+
+SEASON = "2025/26"
+
+
+@pytest.fixture
+def seeded_engine(db_engine):
+    """Két csapat keretekkel, sérülésekkel, meccsekkel, eseményekkel és tabellával"""
+    session = sessionmaker(bind=db_engine)()
+    teams = [Team(team_id=1, name="Ferencvárosi TC"), Team(team_id=2, name="Paksi FC")]
+    session.add_all(teams)
+    player_id = 0
+    for team in teams:
+        for n in range(15):
+            player_id += 1
+            session.add(Player(player_id=player_id, name=f"Játékos {player_id:02d}", is_injured=n % 5 == 0))
+            session.add(TeamPlayer(team_id=team.team_id, player_id=player_id))
+            if n % 5 == 0:
+                for day in (1, 2):
+                    session.add(InjuryArticle(player_id=player_id, url=f"https://nso.hu/{player_id}/{day}",
+                                              injury_type="bokasérülés", published_date=date(2025, 9, day)))
+    for round_num in (1, 2, 3):
+        session.add(Match(match_id=round_num, season=SEASON, round=round_num, date=date(2025, 8, round_num),
+                          home_team_id=1, away_team_id=2, home_score=2, away_score=1))
+        for minute in range(10, 90, 10):
+            team_id = 1 if minute % 20 else 2
+            session.add(MatchEvent(match_id=round_num, event_type="goal" if minute < 40 else "yellow_card",
+                                   minute=minute, added_time=0, player_id=minute // 10 + (team_id - 1) * 15,
+                                   team_id=team_id))
+    for position, (team_id, points) in enumerate(((1, 9), (2, 0)), start=1):
+        session.add(Standing(season=SEASON, round=3, team_id=team_id, position=position, matches_played=3,
+                             wins=points // 3, draws=0, losses=3 - points // 3, goals_for=6, goals_against=3,
+                             goal_difference=3, points=points))
+    session.commit()
+    session.close()
+    return db_engine
+
+
+@pytest.fixture
+def read_session(seeded_engine):
+    """Friss session: az olvasásokat nem segíti a feltöltés identity map-je"""
+    session = sessionmaker(bind=seeded_engine)()
+    yield session
+    session.close()
+
+
+def test_match_detail_loads_events_with_names_in_two_queries(seeded_engine, read_session):
+    with count_queries(max_queries=2, bind=seeded_engine) as counter:
+        detail = get_match_detail(1, session=read_session)
+
+    assert counter.count == 2
+    assert detail.match.home_team == "Ferencvárosi TC"
+    assert detail.match.away_team == "Paksi FC"
+    assert len(detail.events) == 8
+    assert all(event.player_name and event.team_name for event in detail.events)
+    assert [scorer.minute for scorer in detail.scorers] == [10, 20, 30]
+
+
+def test_missing_match_detail_is_none(seeded_engine, read_session):
+    with count_queries(max_queries=1, bind=seeded_engine):
+        assert get_match_detail(999, session=read_session) is None
+
+
+def test_team_squad_query_count_does_not_grow_with_players(seeded_engine, read_session):
+    with count_queries(max_queries=2, bind=seeded_engine):
+        squad = get_team_squad(1, session=read_session)
+
+    assert len(squad) == 15
+    injured = [player for player in squad if player.is_injured]
+    assert len(injured) == 3
+    # A legfrissebb sérülés cikk kerül a rekordba
+    assert all(player.latest_injury.published_date == date(2025, 9, 2) for player in injured)
+
+
+def test_injured_players_page(seeded_engine, read_session):
+    with count_queries(max_queries=3, bind=seeded_engine):
+        page = list_injured_players(page=1, page_size=4, session=read_session)
+
+    assert page.total == 6
+    assert page.pages == 2
+    assert len(page.items) == 4
+
+
+def test_list_matches_and_teams_are_paginated_in_two_queries(seeded_engine, read_session):
+    with count_queries(max_queries=2, bind=seeded_engine):
+        matches = list_matches(SEASON, page=2, page_size=2, session=read_session)
+    assert matches.total == 3
+    assert [m.round for m in matches.items] == [3]
+    assert matches.items[0].home_team == "Ferencvárosi TC"
+
+    with count_queries(max_queries=2, bind=seeded_engine):
+        teams = list_teams(session=read_session)
+    assert [team.name for team in teams.items] == ["Ferencvárosi TC", "Paksi FC"]
+
+
+def test_round_table_single_query(seeded_engine, read_session):
+    with count_queries(max_queries=1, bind=seeded_engine):
+        table = get_round_table(SEASON, 3, session=read_session)
+
+    assert [(row.position, row.team_name, row.points) for row in table] == [(1, "Ferencvárosi TC", 9), (2, "Paksi FC", 0)]
+
+
+def test_count_queries_reports_statements_over_the_limit(seeded_engine, read_session):
+    with pytest.raises(AssertionError, match="expected at most 1"):
+        with count_queries(max_queries=1, bind=seeded_engine):
+            list_teams(session=read_session)
@@ -0,0 +1,123 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from scrapers import retry_policy
+from scrapers.fetch_engine import FetchEngine
+from scrapers.retry_policy import CircuitBreaker, RetryPolicy
+
+
+def response_error(status, headers=None):
+    return aiohttp.ClientResponseError(request_info=None, history=(), status=status, headers=headers)
+
+
+@pytest.mark.parametrize("exc, retryable", [
+    (response_error(503), True),
+    (response_error(429), True),
+    (response_error(404), False),
+    (response_error(400), False),
+    (asyncio.TimeoutError(), True),
+    (aiohttp.ClientConnectionError(), True),
+    (ValueError(), False),
+])
+def test_is_retryable(exc, retryable):
+    assert RetryPolicy().is_retryable(exc) is retryable
+
+
+def test_backoff_is_capped_full_jitter():
+    policy = RetryPolicy(max_delay=10)
+    delays = [policy.backoff(attempt, response_error(503), base_delay=4) for attempt in range(6) for _ in range(20)]
+    assert all(0 <= delay <= 10 for delay in delays)
+
+
+def test_retry_after_is_a_lower_bound():
+    policy = RetryPolicy(max_delay=1)
+    assert policy.backoff(0, response_error(429, {"Retry-After": "30"}), base_delay=1) == 30
+
+
+def test_too_long_retry_after_gives_up():
+    policy = RetryPolicy(max_retry_after=60)
+    assert policy.backoff(0, response_error(503, {"Retry-After": "3600"}), base_delay=1) is None
+
+
+def test_retry_after_http_date():
+    exc = response_error(503, {"Retry-After": "Thu, 01 Jan 1970 00:00:00 GMT"})
+    assert RetryPolicy().retry_after(exc) == 0.0
+    assert RetryPolicy().retry_after(response_error(503, {"Retry-After": "holnap"})) is None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(retry_policy.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock.now += 61
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 61
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_trial_released_after_unexpected_error(clock):
+    engine = FetchEngine()
+    breaker = engine._breaker("adatbank.mlsz.hu")
+    breaker.failure_threshold = 1
+    breaker.record_failure()
+    clock.now += breaker.reset_timeout + 1
+
+    async def broken_fetch_once(url, headers):
+        raise ValueError("váratlan")
+
+    engine._fetch_once = broken_fetch_once
+    try:
+        with pytest.raises(ValueError):
+            engine.fetch("https://adatbank.mlsz.hu/league/1.html")
+        # A próbakérés nem ragadt be: a következő kérés újra próbálkozhat
+        assert breaker.state == "half-open"
+        assert breaker.allow()
+    finally:
+        engine.close()
@@ -0,0 +1,91 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from scheduler.scheduler import CronSchedule, Job, Scheduler
+
+
+@pytest.mark.parametrize("expression, moment, expected", [
+    ("0 1 * * 0", datetime(2026, 10, 18, 1, 0), True),    # vasárnap 01:00
+    ("0 1 * * 7", datetime(2026, 10, 18, 1, 0), True),    # a 7 is vasárnap
+    ("0 1 * * 0", datetime(2026, 10, 19, 1, 0), False),   # hétfő
+    ("0 1 * * 0", datetime(2026, 10, 18, 1, 1), False),
+    ("0 3 */2 * *", datetime(2026, 10, 17, 3, 0), True),  # páratlan nap
+    ("0 3 */2 * *", datetime(2026, 10, 16, 3, 0), False),
+    ("*/15 8-10 * * 1-5", datetime(2026, 10, 16, 9, 45), True),
+    ("*/15 8-10 * * 1-5", datetime(2026, 10, 16, 11, 0), False),
+    ("0 0 1,15 * *", datetime(2026, 10, 15, 0, 0), True),
+])
+def test_matches(expression, moment, expected):
+    assert CronSchedule(expression).matches(moment) is expected
+
+
+def test_day_of_month_or_weekday_when_both_restricted():
+    schedule = CronSchedule("0 0 13 * 5")
+    assert schedule.matches(datetime(2026, 10, 13, 0, 0))  # kedd, 13-a
+    assert schedule.matches(datetime(2026, 10, 16, 0, 0))  # péntek
+
+
+@pytest.mark.parametrize("expression, moment, expected", [
+    ("0 1 * * 0", datetime(2026, 10, 16, 12, 0), datetime(2026, 10, 18, 1, 0)),
+    ("0 1 * * 0", datetime(2026, 10, 18, 1, 0), datetime(2026, 10, 25, 1, 0)),
+    ("0 3 */2 * *", datetime(2026, 10, 31, 4, 0), datetime(2026, 11, 1, 3, 0)),
+    ("30 2 29 2 *", datetime(2026, 3, 1), None),  # a következő február 29. több mint egy év múlva van
+])
+def test_next_after(expression, moment, expected):
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+@pytest.mark.parametrize("expression", ["0 1 * *", "60 * * * *", "0 25 * * *", "x * * * *", "5-1 * * * *"])
+def test_invalid_expression(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_waiting_job_starts_after_dependency_and_failures_are_recorded():
+    release = threading.Event()
+    order = []
+
+    def matches():
+        order.append("matches")
+        release.wait(2)
+
+    def standings():
+        order.append("standings")
+
+    def broken():
+        raise RuntimeError("hiba")
+
+    never = "0 0 1 1 *"
+    scheduler = Scheduler([
+        Job("matches", matches, never),
+        Job("standings", standings, never, waits_for=("matches",)),
+        Job("broken", broken, never),
+    ])
+    scheduler.start()
+    try:
+        assert scheduler._try_start(scheduler.jobs["matches"])
+        # Átfedés védelem: a futó feladat nem indul újra
+        assert not scheduler._try_start(scheduler.jobs["matches"])
+
+        scheduler.jobs["standings"].pending = True
+        assert not scheduler._try_start(scheduler.jobs["standings"])
+        scheduler._try_start(scheduler.jobs["broken"])
+
+        release.set()
+        deadline = time.monotonic() + 2
+        while (scheduler.jobs["standings"].runs == 0 or scheduler.jobs["broken"].runs == 0) \
+                and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        scheduler.stop()
+        scheduler.wait()
+
+    assert order == ["matches", "standings"]
+    status = scheduler.status()["jobs"]
+    assert status["standings"]["last_status"] == "ok"
+    assert status["broken"]["last_status"] == "failed"
+    assert status["broken"]["last_error"] == "hiba"
+    assert status["broken"]["failures"] == 1
@@ -0,0 +1,32 @@
+import pytest
+
+from scrapers import standing_scraper
+from scrapers.competitions import Competition
+from scrapers.standing_scraper import StandingScraper
+
+COMPETITION = Competition(key="teszt", name="Teszt liga", league_id=1, season_id=1, season_label="2025/26",
+                          rounds=5, matches_per_round=2)
+
+
+def make_scraper():
+    """Scraper hálózat és frontier nélkül: a run_checkpointed hívását rögzíti"""
+    scraper = StandingScraper.__new__(StandingScraper)
+    scraper.competition = COMPETITION
+    scraper._probed = {}
+    scraper.calls = []
+    scraper.run_checkpointed = lambda stage, units, process: scraper.calls.append(
+        (stage, [n for _, n in units]))
+    return scraper
+
+
+@pytest.mark.parametrize("last_saved, expected_rounds", [
+    (None, [1, 2, 3, 4, 5]),
+    (3, [4, 5]),
+])
+def test_save_new_standings_rounds(monkeypatch, last_saved, expected_rounds):
+    monkeypatch.setattr(standing_scraper, "get_max_standing_round", lambda season: last_saved)
+    scraper = make_scraper()
+
+    scraper.save_new_standings()
+
+    assert scraper.calls == [("new_standings:teszt", expected_rounds)]
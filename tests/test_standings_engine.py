@@ -0,0 +1,86 @@
+from database.standings_engine import compute_standings
+
+
+def positions(table, round_number):
+    return [row["team_id"] for row in table.round_rows(round_number)]
+
+
+def test_no_results_gives_no_table():
+    assert compute_standings([]) is None
+
+
+def test_cumulative_stats_per_round():
+    table = compute_standings([
+        (1, 1, 2, 3, 1),
+        (1, 3, 4, 0, 0),
+        (2, 2, 3, 2, 2),
+        (2, 4, 1, 1, 0),
+    ])
+
+    assert table.rounds == 2
+    after_round_2 = {row["team_id"]: row for row in table.round_rows(2)}
+    assert after_round_2[1]["matches_played"] == 2
+    assert (after_round_2[1]["wins"], after_round_2[1]["draws"], after_round_2[1]["losses"]) == (1, 0, 1)
+    assert (after_round_2[1]["goals_for"], after_round_2[1]["goals_against"]) == (3, 2)
+    assert after_round_2[1]["points"] == 3
+    assert after_round_2[4]["points"] == 4
+    assert after_round_2[2]["goal_difference"] == -2
+    assert positions(table, 1) == [1, 3, 4, 2]
+    assert positions(table, 2) == [4, 1, 3, 2]
+
+
+def test_goal_difference_then_goals_for_break_ties():
+    table = compute_standings([
+        (1, 1, 5, 3, 0),  # 1: 3 pont, +3, 3 lőtt
+        (1, 2, 6, 4, 1),  # 2: 3 pont, +3, 4 lőtt
+        (1, 3, 7, 1, 0),  # 3: 3 pont, +1
+    ])
+
+    assert positions(table, 1)[:3] == [2, 1, 3]
+
+
+def test_head_to_head_decides_full_tie():
+    # 1 és 2 pontban, gólkülönbségben, lőtt gólban és győzelmekben is egyezik;
+    # az egymás elleni meccset a 2 nyerte
+    table = compute_standings([
+        (1, 1, 3, 4, 1),
+        (1, 2, 4, 5, 1),
+        (2, 2, 1, 1, 0),
+        (2, 3, 4, 0, 0),
+        (3, 1, 4, 2, 1),
+        (3, 3, 2, 2, 0),
+    ])
+
+    rows = {row["team_id"]: row for row in table.round_rows(3)}
+    fields = ("points", "goal_difference", "goals_for", "wins")
+    assert tuple(rows[1][f] for f in fields) == tuple(rows[2][f] for f in fields)
+    assert positions(table, 3)[:2] == [2, 1]
+
+
+def test_circular_tie_falls_back_to_team_id():
+    # Körbeverés: mindenki 3 pont, azonos gólkülönbség, egymás ellen is egyformák
+    table = compute_standings([
+        (1, 1, 2, 1, 0),
+        (2, 2, 3, 1, 0),
+        (3, 3, 1, 1, 0),
+    ])
+
+    assert positions(table, 3) == [1, 2, 3]
+
+
+def test_teams_without_matches_get_zero_rows():
+    table = compute_standings([(1, 1, 2, 1, 0)], team_ids=[1, 2, 3, 4])
+
+    rows = table.round_rows(1)
+    assert [row["team_id"] for row in rows] == [1, 3, 4, 2]
+    assert rows[1]["matches_played"] == 0
+    assert rows[1]["points"] == 0
+
+
+def test_num_rounds_extends_table_and_all_rows_cover_every_round():
+    table = compute_standings([(1, 1, 2, 1, 0)], num_rounds=3)
+
+    assert table.rounds == 3
+    assert table.round_rows(3) == table.round_rows(1)
+    assert {row["round"] for row in table.all_rows()} == {1, 2, 3}
+    assert len(table.all_rows()) == 6